@@ -5,7 +5,9 @@ This module defines the Typer-based command-line interface used for
 running LLM evaluation workflows in local, CI/CD, and Docker environments.
 """
 
+import json
 from pathlib import Path
+from typing import List, Optional
 
 import typer
 from rich.console import Console
@@ -14,7 +16,10 @@ import llm_eval.metrics
 
 from llm_eval.version import __version__
 from llm_eval.config.loader import load_config, ConfigLoadError
-from llm_eval.data.dataset_loader import load_dataset
+from llm_eval.data.dataset_loader import DatasetLoadError, open_dataset, validate_dataset
+from llm_eval.data.sharding import Shard
+from llm_eval.evaluation.checkpoint import ResumeError
+from llm_eval.evaluation.merge import MergeError, merge_shards
 from llm_eval.evaluation.runner import EvaluationRunner
 
 app = typer.Typer(
@@ -48,6 +53,29 @@ def run(
         "-v",
         help="Enable verbose logging output.",
     ),
+    incremental: bool = typer.Option(
+        None,
+        "--incremental/--full",
+        help="Only rescore rows whose inputs changed since the last run "
+        "(default: execution.incremental).",
+    ),
+    raw_scores_json: bool = typer.Option(
+        None,
+        "--json-scores/--no-json-scores",
+        help="Also export raw scores as JSON (default: output.raw_scores_json).",
+    ),
+    shard: Optional[str] = typer.Option(
+        None,
+        "--shard",
+        help="Evaluate only shard i of N (0-based, e.g. 0/4), picked by a hash of "
+        "the row id. Combine shard outputs with `llm-eval merge`.",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue an interrupted run in the same output directory: rows already "
+        "checkpointed are kept, the rest are scored.",
+    ),
 ) -> None:
     """
     Run the full LLM evaluation pipeline.
@@ -58,6 +86,12 @@ def run(
     - Execute evaluation runner
     - Persist raw scores for reporting & visualization
     """
+    try:
+        selected_shard = Shard.parse(shard) if shard is not None else None
+    except ValueError as exc:
+        console.print(f"[bold red]Invalid --shard:[/bold red] {exc}", highlight=False)
+        raise typer.Exit(code=1)
+
     try:
         cfg = load_config(config)
 
@@ -68,18 +102,72 @@ def run(
         console.print(f"Dataset: {cfg.dataset.path}")
         console.print(f"Models: {[m.name for m in cfg.models]}")
         console.print(f"Output directory: [yellow]{output_dir}[/yellow]")
+        if selected_shard is not None:
+            console.print(f"Shard: {selected_shard}")
 
-        dataset = load_dataset(cfg.dataset.path)
+        # Rows are parsed and validated lazily as the runner consumes them
+        dataset = open_dataset(cfg.dataset.path)
 
         runner = EvaluationRunner(
             dataset=dataset,
             models=[m.model_dump() for m in cfg.models],
             metrics=cfg.metrics,
             output_dir=output_dir,
+            max_workers=cfg.execution.max_workers,
+            chunk_size=cfg.execution.chunk_size,
+            embedding_cache=cfg.embedding_cache,
+            executor=cfg.execution.executor.value,
+            max_processes=cfg.execution.max_processes,
+            incremental=cfg.execution.incremental if incremental is None else incremental,
+            raw_scores_json=(
+                cfg.output.raw_scores_json if raw_scores_json is None else raw_scores_json
+            ),
+            shard=selected_shard,
+            checkpoint=cfg.execution.checkpoint,
+            resume=resume,
         )
 
         runner.run()
 
+        cache = runner.summary["embedding_cache"]
+        if cache["hits"] + cache["misses"]:
+            console.print(
+                f"Embedding cache: {cache['hits']} hits / "
+                f"{cache['hits'] + cache['misses']} lookups "
+                f"({cache['hit_rate']:.1%})"
+            )
+
+        checkpoint = runner.summary.get("checkpoint")
+        if resume and checkpoint:
+            console.print(f"Resumed: {checkpoint['resumed']} row results from checkpoint")
+
+        reuse = runner.summary.get("incremental")
+        if reuse:
+            console.print(
+                f"Incremental: {reuse['reused']} row scores reused, "
+                f"{reuse['rescored']} rescored"
+            )
+
+        for model_name, metric_stats in runner.summary["metrics"].items():
+            for metric_name, stats in metric_stats.items():
+                judge_cache = stats.get("judge_cache")
+                if judge_cache:
+                    console.print(
+                        f"Judge cache ({model_name}/{metric_name}): "
+                        f"{judge_cache['hits']} hits, {judge_cache['misses']} misses"
+                    )
+
+        for model_name, report in runner.summary["predictions"].items():
+            if report["missing"] or report["unexpected"]:
+                console.print(
+                    f"[yellow]Predictions ({model_name}):[/yellow] "
+                    f"{report['missing']} dataset rows without a prediction "
+                    f"{report['missing_ids'][:5]}, "
+                    f"{report['unexpected']} predictions with unknown ids "
+                    f"{report['unexpected_ids'][:5]}",
+                    highlight=False,
+                )
+
         console.print("[bold blue]Evaluation completed successfully[/bold blue]")
         raise typer.Exit(code=0)
 
@@ -90,6 +178,20 @@ def run(
         )
         raise typer.Exit(code=1)
 
+    except DatasetLoadError as exc:
+        console.print(
+            f"[bold red]Dataset error:[/bold red]\n{exc}",
+            highlight=False,
+        )
+        raise typer.Exit(code=1)
+
+    except ResumeError as exc:
+        console.print(
+            f"[bold red]Resume error:[/bold red]\n{exc}",
+            highlight=False,
+        )
+        raise typer.Exit(code=1)
+
     except typer.Exit:
         # Allow Typer exits to propagate cleanly
         raise
@@ -102,6 +204,149 @@ def run(
         raise typer.Exit(code=2)
 
 
+@app.command()
+def merge(
+    shard_dirs: List[Path] = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=False,
+        help="Output directories of `llm-eval run --shard i/N`, one per shard.",
+    ),
+    output_dir: Path = typer.Option(
+        ...,
+        "--output-dir",
+        "-o",
+        help="Directory for the merged results.",
+    ),
+    raw_scores_json: bool = typer.Option(
+        False,
+        "--json-scores",
+        help="Also export the merged raw scores as JSON.",
+    ),
+) -> None:
+    """
+    Combine the outputs of a sharded run into single-run results.
+
+    Fails if a shard is missing or given twice.
+    """
+    try:
+        results = merge_shards(shard_dirs, output_dir, raw_scores_json=raw_scores_json)
+    except MergeError as exc:
+        console.print(f"[bold red]Merge error:[/bold red]\n{exc}", highlight=False)
+        raise typer.Exit(code=1)
+
+    console.print(
+        f"[bold blue]Merged {len(shard_dirs)} shards "
+        f"({len(results)} models) into {output_dir}[/bold blue]",
+        highlight=False,
+    )
+
+
+@app.command()
+def validate(
+    dataset: Path = typer.Argument(
+        ...,
+        exists=True,
+        readable=True,
+        help="Dataset to check (JSONL, CSV, Parquet or Arrow IPC).",
+    ),
+    show: int = typer.Option(20, "--show", help="How many issues to print."),
+    report_path: Path = typer.Option(
+        None,
+        "--report",
+        help="Write the full report (every issue, up to --max-issues) as JSON.",
+    ),
+    max_issues: int = typer.Option(
+        1000, "--max-issues", help="Issues kept in the report; the rest are only counted."
+    ),
+) -> None:
+    """
+    Check a dataset against the benchmark schema and report every problem.
+
+    Exits with code 1 if any row is invalid.
+    """
+    try:
+        report = validate_dataset(dataset, max_issues=max_issues)
+    except DatasetLoadError as exc:
+        console.print(f"[bold red]Dataset error:[/bold red]\n{exc}", highlight=False)
+        raise typer.Exit(code=1)
+
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+
+    if report.ok:
+        console.print(f"[bold green]{dataset}: {report.rows} rows, all valid[/bold green]")
+        raise typer.Exit(code=0)
+
+    console.print(
+        f"[bold red]{dataset}: {report.invalid_rows} of {report.rows} rows invalid "
+        f"({report.error_count} issues)[/bold red]",
+        highlight=False,
+    )
+    for reason, count in report.reasons.most_common():
+        console.print(f"  {count:>8}  {reason}", highlight=False)
+    for issue in report.issues[:show]:
+        console.print(f"  {issue}", highlight=False)
+    if report.error_count > show:
+        console.print(f"  ... {report.error_count - show} more", highlight=False)
+
+    raise typer.Exit(code=1)
+
+
+@app.command("mock-server")
+def mock_server(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind."),
+    port: int = typer.Option(8765, "--port", "-p", help="Port to listen on."),
+    latency_ms: float = typer.Option(50.0, "--latency-ms", help="Median response latency."),
+    latency_sigma: float = typer.Option(
+        0.0, "--latency-sigma", help="Lognormal latency spread (0 = fixed latency)."
+    ),
+    error_rate: float = typer.Option(0.0, "--error-rate", help="Fraction of HTTP 500 replies."),
+    rate_limit_rate: float = typer.Option(
+        0.0, "--rate-limit-rate", help="Fraction of HTTP 429 replies."
+    ),
+    malformed_rate: float = typer.Option(
+        0.0, "--malformed-rate", help="Fraction of replies that are not valid JSON."
+    ),
+    seed: int = typer.Option(None, "--seed", help="Random seed for reproducible runs."),
+) -> None:
+    """
+    Serve a local mock judge API for offline load testing.
+
+    Point judges at it with `provider: mock` and LLM_EVAL_MOCK_URL.
+    """
+    from llm_eval.llm_providers.mock_server import MockJudgeServer, MockServerConfig
+
+    try:
+        server = MockJudgeServer(
+            MockServerConfig(
+                latency_ms=latency_ms,
+                latency_sigma=latency_sigma,
+                error_rate=error_rate,
+                rate_limit_rate=rate_limit_rate,
+                malformed_rate=malformed_rate,
+                seed=seed,
+            ),
+            host=host,
+            port=port,
+        )
+    except (ValueError, OSError) as exc:
+        console.print(f"[bold red]Cannot start mock server:[/bold red] {exc}", highlight=False)
+        raise typer.Exit(code=1)
+
+    console.print(f"Mock judge server listening on [yellow]{server.url}[/yellow]")
+    console.print(f"export LLM_EVAL_MOCK_URL={server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        console.print(f"Served: {server.stats()}")
+
+
 @app.command()
 def version() -> None:
     """
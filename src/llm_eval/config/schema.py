@@ -7,10 +7,13 @@ Unknown fields are forbidden.
 
 from enum import Enum
 from pathlib import Path
+from glob import glob
 from typing import Dict, List, Any, Optional
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict, RootModel
 
+from llm_eval.data.columnar import ARROW_SUFFIXES
+
 
 # =========================
 # Enums
@@ -21,6 +24,22 @@ class JudgeProvider(str, Enum):
     anthropic = "anthropic"
 
 
+class ExecutorStrategy(str, Enum):
+    thread = "thread"
+    process = "process"
+    inline = "inline"
+
+
+class JoinStrategy(str, Enum):
+    id = "id"
+    position = "position"
+
+
+class EmbeddingStorageDtype(str, Enum):
+    float32 = "float32"
+    float16 = "float16"
+
+
 # =========================
 # Dataset
 # =========================
@@ -28,15 +47,20 @@ class JudgeProvider(str, Enum):
 class DatasetConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    path: Path = Field(..., description="Path to benchmark dataset (JSONL or CSV).")
+    path: Path = Field(
+        ...,
+        description="Path to benchmark dataset (JSONL, CSV, Parquet or Arrow IPC).",
+    )
 
     @field_validator("path")
     @classmethod
     def validate_dataset_path(cls, v: Path) -> Path:
         if not v.exists():
             raise ValueError(f"Dataset file does not exist: {v}")
-        if v.suffix.lower() not in {".jsonl", ".csv"}:
-            raise ValueError("Dataset must be .jsonl or .csv")
+        if v.suffix.lower() not in {".jsonl", ".csv"} | ARROW_SUFFIXES:
+            raise ValueError(
+                f"Dataset must be .jsonl, .csv or one of {sorted(ARROW_SUFFIXES)}"
+            )
         return v
 
 
@@ -48,15 +72,48 @@ class ModelConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     name: str = Field(..., min_length=1)
-    predictions: Path = Field(..., description="Model output file (JSONL).")
+    predictions: List[Path] = Field(
+        ...,
+        description=(
+            "Model output file(s) (JSONL, Parquet or Arrow IPC): "
+            "a path, a glob, or a list of shards."
+        ),
+    )
+    join: JoinStrategy = Field(
+        JoinStrategy.id,
+        description="Match predictions to dataset rows by 'id' or by line 'position'.",
+    )
+
+    @field_validator("predictions", mode="before")
+    @classmethod
+    def expand_predictions(cls, v: Any) -> Any:
+        entries = v if isinstance(v, list) else [v]
+        paths: List[Any] = []
+        for entry in entries:
+            pattern = str(entry)
+            if any(ch in pattern for ch in "*?["):
+                matches = sorted(glob(pattern))
+                if not matches:
+                    raise ValueError(f"No predictions files match: {pattern}")
+                paths.extend(matches)
+            else:
+                paths.append(entry)
+        return paths
 
     @field_validator("predictions")
     @classmethod
-    def validate_predictions_path(cls, v: Path) -> Path:
-        if not v.exists():
-            raise ValueError(f"Predictions file does not exist: {v}")
-        if v.suffix.lower() != ".jsonl":
-            raise ValueError("Predictions file must be .jsonl")
+    def validate_predictions_path(cls, v: List[Path]) -> List[Path]:
+        if not v:
+            raise ValueError("At least one predictions file is required")
+        for path in v:
+            if not path.exists():
+                raise ValueError(f"Predictions file does not exist: {path}")
+            if path.suffix.lower() not in {".jsonl"} | ARROW_SUFFIXES:
+                raise ValueError(
+                    f"Predictions file must be .jsonl or one of {sorted(ARROW_SUFFIXES)}"
+                )
+        if len({path.suffix.lower() == ".jsonl" for path in v}) > 1:
+            raise ValueError("Prediction shards must all be JSONL or all Arrow/Parquet")
         return v
 
 
@@ -69,6 +126,15 @@ class MetricConfig(BaseModel):
 
     name: str = Field(..., min_length=1)
     params: Dict[str, Any] = Field(default_factory=dict)
+    chunk_size: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Rows per compute_batch call (overrides execution.chunk_size).",
+    )
+    executor: Optional[ExecutorStrategy] = Field(
+        None,
+        description="Executor for this metric (overrides execution.executor).",
+    )
 
 
 class MetricsConfig(RootModel[List[MetricConfig]]):
@@ -102,6 +168,84 @@ class QualityGateConfig(BaseModel):
     )
 
 
+# =========================
+# Execution
+# =========================
+
+class ExecutionConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    max_workers: int = Field(4, ge=1, description="Worker pool size.")
+    chunk_size: int = Field(
+        64,
+        ge=1,
+        description="Rows handed to each metric's compute_batch call.",
+    )
+    executor: ExecutorStrategy = Field(
+        ExecutorStrategy.thread,
+        description="thread (I/O-bound metrics), process (CPU-bound) or inline.",
+    )
+    max_processes: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Process pool size for the process executor (default: CPU count).",
+    )
+    incremental: bool = Field(
+        False,
+        description="Reuse per-row scores stored in the output directory by earlier runs.",
+    )
+    checkpoint: bool = Field(
+        True,
+        description="Append per-row results to checkpoint.sqlite as chunks complete, "
+        "so an interrupted run can be resumed with --resume.",
+    )
+
+
+# =========================
+# Output
+# =========================
+
+class OutputConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    raw_scores_json: bool = Field(
+        False,
+        description="Also export raw scores as raw_scores.json "
+        "(raw_scores.npz is always written).",
+    )
+
+
+# =========================
+# Embedding Cache
+# =========================
+
+class EmbeddingCacheConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    path: Optional[Path] = Field(
+        None,
+        description="Directory of the persistent embedding store (disabled if unset).",
+    )
+    persist_predictions: bool = Field(
+        False,
+        description="Also persist answer/claim embeddings, not only dataset text.",
+    )
+    max_memory_bytes: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Byte bound for the run-scoped in-memory embedding store.",
+    )
+    max_memory_entries: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Entry bound for the run-scoped in-memory embedding store.",
+    )
+    memory_dtype: EmbeddingStorageDtype = Field(
+        EmbeddingStorageDtype.float32,
+        description="Storage dtype of in-memory embeddings (float16 halves memory).",
+    )
+
+
 # =========================
 # Root Config
 # =========================
@@ -113,6 +257,9 @@ class EvalConfig(BaseModel):
     models: List[ModelConfig]
     metrics: MetricsConfig
     quality_gates: Optional[QualityGateConfig] = None
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig)
+    embedding_cache: EmbeddingCacheConfig = Field(default_factory=EmbeddingCacheConfig)
+    output: OutputConfig = Field(default_factory=OutputConfig)
 
     @field_validator("models")
     @classmethod
@@ -0,0 +1,492 @@
+"""
+Columnar chunks and Arrow/Parquet input.
+
+``ColumnBatch`` is the chunk format handed to metrics: one list per
+field (``query``, ``expected_answer``, ``retrieved_contexts``,
+``answer``) instead of one dict per row. Metrics that only need a few
+fields read the columns directly via ``BaseMetric.compute_columns``.
+
+Datasets and predictions may also be stored as Parquet or Arrow IPC
+(``.arrow`` / ``.feather`` / ``.ipc``) files. They are read through
+memory maps, record batch by record batch, and turned straight into
+columns, so no per-row dicts are built on that path. pyarrow is an
+optional dependency and only imported when such a file is used.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from llm_eval.data.dataset_loader import DatasetLoadError
+from llm_eval.data.validators import (
+    ALLOWED_DIFFICULTY,
+    FIELD_ORDER,
+    MAX_REPORTED_ISSUES,
+    NON_EMPTY_STRING_FIELDS,
+    REQUIRED_FIELDS,
+    ValidationIssue,
+    ValidationReport,
+    format_issues,
+)
+
+ARROW_SUFFIXES = {".parquet", ".arrow", ".feather", ".ipc"}
+
+# Columns metrics read from the dataset
+DATASET_COLUMNS = ("id", "query", "expected_answer", "retrieved_contexts")
+
+
+def is_arrow_path(path: Path) -> bool:
+    return Path(path).suffix.lower() in ARROW_SUFFIXES
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "Reading Parquet/Arrow files requires pyarrow (pip install pyarrow)"
+        ) from exc
+    return pyarrow
+
+
+# =========================
+# Column batches
+# =========================
+
+
+@dataclass(slots=True)
+class ColumnBatch:
+    """
+    One chunk of aligned dataset rows and model answers, stored by column.
+
+    ``positions`` are the 0-based dataset row numbers of the chunk's
+    rows (empty when unknown). ``rows`` keeps the original dataset dicts
+    when the chunk was built from rows (JSONL/CSV); it is None for
+    chunks read from Arrow files.
+    """
+
+    ids: List[Any]
+    query: List[Any]
+    expected_answer: List[Any]
+    retrieved_contexts: List[Any]
+    answer: List[Any] = field(default_factory=list)
+    rows: Optional[List[Dict[str, Any]]] = None
+    positions: List[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(
+        cls,
+        examples: Sequence[Dict[str, Any]],
+        predictions: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> "ColumnBatch":
+        if predictions is not None and len(examples) != len(predictions):
+            raise ValueError(
+                f"compute_batch received {len(examples)} examples "
+                f"but {len(predictions)} predictions"
+            )
+
+        return cls(
+            ids=[example.get("id") for example in examples],
+            query=[example.get("query", "") for example in examples],
+            expected_answer=[example.get("expected_answer", "") for example in examples],
+            retrieved_contexts=[example.get("retrieved_contexts", []) for example in examples],
+            answer=[prediction.get("answer", "") for prediction in predictions or ()],
+            rows=list(examples),
+        )
+
+    def examples(self) -> List[Dict[str, Any]]:
+        """
+        Dataset rows as dicts, for metrics that only implement ``compute_batch``.
+        """
+        if self.rows is not None:
+            return self.rows
+        return [
+            {
+                "id": row_id,
+                "query": query,
+                "expected_answer": expected,
+                "retrieved_contexts": contexts,
+            }
+            for row_id, query, expected, contexts in zip(
+                self.ids, self.query, self.expected_answer, self.retrieved_contexts
+            )
+        ]
+
+    def predictions(self) -> List[Dict[str, Any]]:
+        return [{"answer": answer} for answer in self.answer]
+
+    def take(self, positions: Sequence[int]) -> "ColumnBatch":
+        """
+        The rows at ``positions``, in that order.
+        """
+        return ColumnBatch(
+            ids=[self.ids[i] for i in positions],
+            query=[self.query[i] for i in positions],
+            expected_answer=[self.expected_answer[i] for i in positions],
+            retrieved_contexts=[self.retrieved_contexts[i] for i in positions],
+            answer=[self.answer[i] for i in positions] if self.answer else [],
+            rows=[self.rows[i] for i in positions] if self.rows is not None else None,
+            positions=[self.positions[i] for i in positions] if self.positions else [],
+        )
+
+    def slice(self, start: int, stop: int) -> "ColumnBatch":
+        """
+        Rows ``start:stop``.
+        """
+        return ColumnBatch(
+            ids=self.ids[start:stop],
+            query=self.query[start:stop],
+            expected_answer=self.expected_answer[start:stop],
+            retrieved_contexts=self.retrieved_contexts[start:stop],
+            answer=self.answer[start:stop],
+            rows=self.rows[start:stop] if self.rows is not None else None,
+            positions=self.positions[start:stop],
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["ColumnBatch"]) -> "ColumnBatch":
+        """
+        The rows of ``batches``, one after the other.
+        """
+        def joined(column: str) -> List[Any]:
+            return [value for batch in batches for value in getattr(batch, column)]
+
+        return cls(
+            ids=joined("ids"),
+            query=joined("query"),
+            expected_answer=joined("expected_answer"),
+            retrieved_contexts=joined("retrieved_contexts"),
+            answer=joined("answer"),
+            rows=joined("rows") if all(b.rows is not None for b in batches) else None,
+            positions=joined("positions") if all(b.positions for b in batches) else [],
+        )
+
+    def with_answers(self, answers: List[Any]) -> "ColumnBatch":
+        """
+        Attach the model answers (aligned with ``ids``) in place.
+        """
+        if len(answers) != len(self.ids):
+            raise ValueError(f"Expected {len(self.ids)} answers, got {len(answers)}")
+        self.answer = answers
+        return self
+
+
+# =========================
+# Arrow / Parquet reading
+# =========================
+
+
+def _open_ipc(pa, source):
+    # Arrow IPC comes as the random-access file format (also used by
+    # Feather v2) or as a plain stream
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def read_schema(path: Path):
+    """
+    Schema of a Parquet or Arrow IPC file, without reading any data.
+    """
+    pa = import_pyarrow()
+    path = Path(path)
+
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path, memory_map=True)
+
+    with pa.memory_map(str(path), "r") as source:
+        return _open_ipc(pa, source).schema
+
+
+def iter_record_batches(
+    path: Path,
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = 65536,
+) -> Iterator[Any]:
+    """
+    Stream record batches of at most ``batch_size`` rows from a memory map.
+    """
+    pa = import_pyarrow()
+    path = Path(path)
+    columns = list(columns) if columns is not None else None
+
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path, memory_map=True)
+        try:
+            yield from parquet.iter_batches(batch_size=batch_size, columns=columns)
+        finally:
+            parquet.close()
+        return
+
+    with pa.memory_map(str(path), "r") as source:
+        reader = _open_ipc(pa, source)
+        if isinstance(reader, pa.ipc.RecordBatchFileReader):
+            batches: Iterable[Any] = (
+                reader.get_batch(i) for i in range(reader.num_record_batches)
+            )
+        else:
+            batches = reader
+
+        for batch in batches:
+            if columns is not None:
+                batch = batch.select(columns)
+            # Slices are zero-copy views into the mapped file
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def read_table(path: Path, columns: Optional[Sequence[str]] = None):
+    """
+    Whole-file table. Arrow IPC files stay memory mapped (zero copy);
+    Parquet columns are decoded once.
+    """
+    pa = import_pyarrow()
+    path = Path(path)
+    columns = list(columns) if columns is not None else None
+
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    # The table's buffers keep the mapping alive
+    source = pa.memory_map(str(path), "r")
+    reader = _open_ipc(pa, source)
+    table = reader.read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def _check_schema(schema) -> None:
+    pa = import_pyarrow()
+
+    missing = REQUIRED_FIELDS - set(schema.names)
+    if missing:
+        raise DatasetLoadError(f"Missing required columns: {sorted(missing)}")
+
+    for name in ("id", "query", "expected_answer", "difficulty", "category"):
+        column_type = schema.field(name).type
+        if not (pa.types.is_string(column_type) or pa.types.is_large_string(column_type)):
+            raise DatasetLoadError(f"Column '{name}' must be a string column, got {column_type}")
+
+    contexts_type = schema.field("retrieved_contexts").type
+    if not (
+        (pa.types.is_list(contexts_type) or pa.types.is_large_list(contexts_type))
+        and (
+            pa.types.is_string(contexts_type.value_type)
+            or pa.types.is_large_string(contexts_type.value_type)
+        )
+    ):
+        raise DatasetLoadError(
+            f"Column 'retrieved_contexts' must be a list of strings, got {contexts_type}"
+        )
+
+
+def validate_record_batch(batch: Any, first_row: int = 1) -> List[ValidationIssue]:
+    """
+    Value checks for one record batch, run as Arrow compute kernels.
+
+    Types are already guaranteed by the schema; this covers nulls, empty
+    strings, null contexts and the difficulty enum.
+    """
+    pa = import_pyarrow()
+    import pyarrow.compute as pc
+
+    def mask(array) -> Any:
+        return np.asarray(pc.fill_null(array, False).to_numpy(zero_copy_only=False), dtype=bool)
+
+    found: List[tuple] = []
+
+    def record(bad, order: int, name: str, code: str, reason: str) -> None:
+        for i in np.flatnonzero(bad):
+            found.append((int(i), order, name, code, reason))
+
+    for order, name in enumerate(FIELD_ORDER):
+        column = batch.column(name)
+        nulls = mask(pc.is_null(column))
+
+        if name in NON_EMPTY_STRING_FIELDS:
+            reason = f"Field '{name}' must be a non-empty string"
+            record(nulls, order, name, "not_string", reason)
+            record(mask(pc.equal(pc.utf8_length(column), 0)), order, name, "empty", reason)
+
+        elif name == "expected_answer":
+            record(nulls, order, name, "not_string", "Field 'expected_answer' must be a string")
+
+        elif name == "retrieved_contexts":
+            record(nulls, order, name, "not_list", "Field 'retrieved_contexts' must be a list")
+            flat = pc.list_flatten(column)
+            if flat.null_count:
+                parents = pc.list_parent_indices(column).to_numpy()
+                bad = np.zeros(len(column), dtype=bool)
+                bad[parents[mask(pc.is_null(flat))]] = True
+                record(bad, order, name, "not_string", "Each retrieved_context must be a string")
+
+        elif name == "difficulty":
+            allowed = mask(pc.is_in(column, value_set=pa.array(sorted(ALLOWED_DIFFICULTY))))
+            for i in np.flatnonzero(~allowed):
+                value = column[int(i)].as_py()
+                found.append(
+                    (
+                        int(i),
+                        order,
+                        name,
+                        "not_allowed",
+                        f"Invalid difficulty {value!r}. "
+                        f"Must be one of {sorted(ALLOWED_DIFFICULTY)}",
+                    )
+                )
+
+    if not found:
+        return []
+
+    found.sort(key=lambda item: (item[0], item[1]))
+    ids = batch.column("id").take(pa.array([i for i, *_ in found])).to_pylist()
+    return [
+        ValidationIssue(row=first_row + i, field=name, code=code, reason=reason, id=row_id)
+        for (i, _, name, code, reason), row_id in zip(found, ids)
+    ]
+
+
+class ArrowDataset:
+    """
+    Re-iterable dataset backed by a Parquet or Arrow IPC file.
+
+    ``iter_batches`` yields ColumnBatch chunks straight from the mapped
+    file (the runner's path); iterating the dataset yields row dicts for
+    callers that want them. Column presence and types are checked up
+    front; with ``validate`` every record batch is value-checked with
+    Arrow compute kernels before it is handed out.
+    """
+
+    def __init__(self, path: Path, *, validate: bool = True) -> None:
+        self.path = Path(path)
+        self.validate = validate
+
+        if not is_arrow_path(self.path):
+            raise DatasetLoadError(
+                f"Arrow dataset must be one of {sorted(ARROW_SUFFIXES)}"
+            )
+        if not self.path.exists():
+            raise DatasetLoadError(f"Dataset not found: {self.path}")
+
+        try:
+            self.schema = read_schema(self.path)
+        except ImportError as exc:
+            raise DatasetLoadError(str(exc)) from exc
+        except Exception as exc:
+            raise DatasetLoadError(f"Failed to read dataset: {exc}") from exc
+
+        _check_schema(self.schema)
+
+    def _record_batches(self, columns: Optional[Sequence[str]], batch_size: int) -> Iterator[Any]:
+        count = 0
+        try:
+            for batch in iter_record_batches(self.path, columns, batch_size):
+                if batch.num_rows:
+                    count += batch.num_rows
+                    yield batch
+        except DatasetLoadError:
+            raise
+        except Exception as exc:
+            raise DatasetLoadError(f"Failed to read dataset: {exc}") from exc
+
+        if count == 0:
+            raise DatasetLoadError("Dataset is empty")
+
+    def iter_batches(self, batch_size: int) -> Iterator[ColumnBatch]:
+        """
+        Column chunks of at most ``batch_size`` rows, without answers.
+        """
+        columns = FIELD_ORDER if self.validate else DATASET_COLUMNS
+        offset = 0
+        for batch in self._checked(self._record_batches(columns, batch_size)):
+            yield ColumnBatch(
+                ids=batch.column("id").to_pylist(),
+                query=batch.column("query").to_pylist(),
+                expected_answer=batch.column("expected_answer").to_pylist(),
+                retrieved_contexts=batch.column("retrieved_contexts").to_pylist(),
+                positions=list(range(offset, offset + batch.num_rows)),
+            )
+            offset += batch.num_rows
+
+    def _checked(self, batches: Iterable[Any]) -> Iterator[Any]:
+        rows = 0
+        for batch in batches:
+            if self.validate:
+                issues = validate_record_batch(batch, first_row=rows + 1)
+                if issues:
+                    raise DatasetLoadError(format_issues(issues))
+            rows += batch.num_rows
+            yield batch
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for batch in self._checked(self._record_batches(None, 65536)):
+            yield from batch.to_pylist()
+
+    def validate_all(
+        self,
+        *,
+        block_size: int = 65536,
+        max_issues: int = MAX_REPORTED_ISSUES,
+    ) -> ValidationReport:
+        """
+        Value-check every row and collect all issues.
+        """
+        report = ValidationReport(max_issues=max_issues)
+        for batch in self._record_batches(FIELD_ORDER, block_size):
+            report.add(validate_record_batch(batch, first_row=report.rows + 1))
+            report.rows += batch.num_rows
+        return report
+
+    def __repr__(self) -> str:
+        return f"ArrowDataset({str(self.path)!r})"
+
+
+def validate_arrow_dataset(
+    path: Path,
+    *,
+    block_size: int = 65536,
+    max_issues: int = MAX_REPORTED_ISSUES,
+) -> ValidationReport:
+    """
+    Full validation report for a Parquet / Arrow IPC dataset.
+    """
+    dataset = ArrowDataset(path, validate=False)
+    return dataset.validate_all(block_size=block_size, max_issues=max_issues)
+
+
+def iter_column_batches(
+    dataset: Iterable[Dict[str, Any]],
+    batch_size: int,
+) -> Iterator[ColumnBatch]:
+    """
+    Chunk any dataset into ColumnBatches; Arrow datasets skip row dicts.
+    """
+    if isinstance(dataset, ArrowDataset):
+        yield from dataset.iter_batches(batch_size)
+        return
+
+    rows = iter(dataset)
+    offset = 0
+    while True:
+        examples = list(islice(rows, batch_size))
+        if not examples:
+            return
+        batch = ColumnBatch.from_rows(examples)
+        batch.positions = list(range(offset, offset + len(examples)))
+        offset += len(examples)
+        yield batch
@@ -1,21 +1,156 @@
 """
 Benchmark dataset loader.
 
-Supports JSONL and CSV formats with strict validation.
+Supports JSONL and CSV formats with strict validation; Parquet and
+Arrow IPC files are handled by ``llm_eval.data.columnar``.
+
+Rows are parsed one line at a time and validated in small blocks as
+they are read (field by field, see ``validators.validate_rows``), so
+memory stays flat regardless of file size. ``StreamingDataset`` can be
+iterated any number of times (each pass re-opens the file);
+``load_dataset`` materializes the rows for callers that need a list.
 """
 
+import csv
+import json
+from dataclasses import replace
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from llm_eval.data.validators import (
+    MAX_REPORTED_ISSUES,
+    ValidationIssue,
+    ValidationReport,
+    format_issues,
+    validate_rows,
+)
 
-import pandas as pd
+SUPPORTED_SUFFIXES = {".jsonl", ".csv"}
 
-from llm_eval.data.validators import validate_row
+# Rows validated together while streaming
+VALIDATION_BLOCK = 1024
 
 
 class DatasetLoadError(RuntimeError):
     """Raised when dataset loading or validation fails."""
 
 
+# Stands in for a row that could not be parsed (report mode only)
+_UNPARSABLE = object()
+
+
+def _iter_jsonl(path: Path, errors: Optional[List[tuple]] = None) -> Iterator[tuple]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as exc:
+                if errors is None:
+                    raise DatasetLoadError(f"Line {line_no} is not valid JSON: {exc}") from exc
+                errors.append((line_no, exc))
+                yield line_no, _UNPARSABLE
+
+
+def _decode_csv_cell(key: str, value: Any) -> Any:
+    # List-valued columns are stored as JSON arrays in CSV cells
+    if key == "retrieved_contexts" and isinstance(value, str) and value.lstrip().startswith("["):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
+def _iter_csv(path: Path) -> Iterator[tuple]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, {
+                key: _decode_csv_cell(key, value) for key, value in row.items()
+            }
+
+
+def _iter_rows(path: Path, errors: Optional[List[tuple]] = None) -> Iterator[tuple]:
+    suffix = path.suffix.lower()
+    if suffix == ".jsonl":
+        return _iter_jsonl(path, errors)
+    if suffix == ".csv":
+        return _iter_csv(path)
+    raise DatasetLoadError("Dataset must be JSONL or CSV")
+
+
+def iter_dataset(path: Path, *, validate: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield dataset rows, validating them block by block.
+
+    Rows before the first invalid row of a block are still yielded; the
+    error then lists every issue found in that block.
+
+    :param path: Path to JSONL or CSV dataset
+    :param validate: Validate every row against the benchmark schema
+    :raises DatasetLoadError: on unreadable files, invalid rows or an empty dataset
+    """
+    path = Path(path)
+    rows = _iter_rows(path)
+
+    count = 0
+    try:
+        while True:
+            block = list(islice(rows, VALIDATION_BLOCK if validate else 1))
+            if not block:
+                break
+
+            issues: List[ValidationIssue] = []
+            if validate:
+                issues = validate_rows(
+                    [row for _, row in block],
+                    first_row=count + 1,
+                    lines=[line_no for line_no, _ in block],
+                )
+
+            valid = issues[0].row - count - 1 if issues else len(block)
+            for _, row in block[:valid]:
+                count += 1
+                yield row
+
+            if issues:
+                raise DatasetLoadError(format_issues(issues))
+
+    except DatasetLoadError:
+        raise
+    except Exception as exc:
+        raise DatasetLoadError(f"Failed to read dataset: {exc}") from exc
+
+    if count == 0:
+        raise DatasetLoadError("Dataset is empty")
+
+
+class StreamingDataset:
+    """
+    Re-iterable, lazily parsed dataset.
+
+    Every iteration streams the file from disk; nothing is cached.
+    """
+
+    def __init__(self, path: Path, *, validate: bool = True) -> None:
+        self.path = Path(path)
+        self.validate = validate
+
+        if self.path.suffix.lower() not in SUPPORTED_SUFFIXES:
+            raise DatasetLoadError("Dataset must be JSONL or CSV")
+        if not self.path.exists():
+            raise DatasetLoadError(f"Dataset not found: {self.path}")
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter_dataset(self.path, validate=self.validate)
+
+    def __repr__(self) -> str:
+        return f"StreamingDataset({str(self.path)!r})"
+
+
 def load_dataset(path: Path) -> List[Dict]:
     """
     Load and validate benchmark dataset.
@@ -23,28 +158,76 @@ def load_dataset(path: Path) -> List[Dict]:
     :param path: Path to JSONL or CSV dataset
     :return: List of validated dataset rows
     """
+    return list(iter_dataset(path))
+
+
+def validate_dataset(
+    path: Path,
+    *,
+    block_size: int = 8192,
+    max_issues: int = MAX_REPORTED_ISSUES,
+) -> ValidationReport:
+    """
+    Check a whole dataset and collect every issue instead of stopping at
+    the first one. Lines that are not valid JSON are reported too.
+
+    :raises DatasetLoadError: if the file cannot be read at all
+    """
+    path = Path(path)
+    if not path.exists():
+        raise DatasetLoadError(f"Dataset not found: {path}")
+
+    from llm_eval.data.columnar import is_arrow_path, validate_arrow_dataset
+
+    if is_arrow_path(path):
+        return validate_arrow_dataset(path, block_size=block_size, max_issues=max_issues)
+
+    report = ValidationReport(max_issues=max_issues)
+    json_errors: List[tuple] = []
+    rows = _iter_rows(path, json_errors)
+
     try:
-        if path.suffix.lower() == ".jsonl":
-            df = pd.read_json(path, lines=True)
-        elif path.suffix.lower() == ".csv":
-            df = pd.read_csv(path)
-        else:
-            raise DatasetLoadError("Dataset must be JSONL or CSV")
+        while True:
+            block = list(islice(rows, block_size))
+            if not block:
+                break
+
+            issues = validate_rows(
+                [row for _, row in block],
+                first_row=report.rows + 1,
+                lines=[line_no for line_no, _ in block],
+            )
 
+            # Unparsable lines show up as non-object rows; say why
+            bad_json = dict(json_errors)
+            json_errors.clear()
+            issues = [
+                replace(issue, code="invalid_json", reason=f"Not valid JSON: {bad_json[issue.line]}")
+                if issue.line in bad_json
+                else issue
+                for issue in issues
+            ]
+
+            report.rows += len(block)
+            report.add(issues)
+
+    except DatasetLoadError:
+        raise
     except Exception as exc:
         raise DatasetLoadError(f"Failed to read dataset: {exc}") from exc
 
-    records = df.to_dict(orient="records")
+    return report
 
-    if not records:
-        raise DatasetLoadError("Dataset is empty")
 
-    for idx, row in enumerate(records, start=1):
-        try:
-            validate_row(row)
-        except ValueError as exc:
-            raise DatasetLoadError(
-                f"Row {idx} failed validation: {exc}"
-            ) from exc
+def open_dataset(path: Path, *, validate: bool = True) -> Iterable[Dict[str, Any]]:
+    """
+    Re-iterable dataset for ``path``, picked by file suffix.
+
+    JSONL/CSV give a StreamingDataset; Parquet/Arrow IPC give an
+    ArrowDataset (requires pyarrow).
+    """
+    from llm_eval.data.columnar import ArrowDataset, is_arrow_path
 
-    return records
+    if is_arrow_path(path):
+        return ArrowDataset(path, validate=validate)
+    return StreamingDataset(path, validate=validate)
@@ -0,0 +1,483 @@
+"""
+Streaming, id-keyed access to model predictions.
+
+Prediction files (one or many shards, any row order) are scanned once
+to build a compact index: a sorted array of 64-bit id hashes plus the
+(file, byte offset) of each row, ~16 bytes per prediction. Rows are
+read back from disk chunk by chunk as the dataset streams past, so
+prediction files are never fully resident.
+
+Hash collisions cannot produce a wrong join: every row read back is
+checked against the requested id, and a mismatch counts as missing.
+
+Parquet / Arrow IPC prediction files (``id`` and ``prediction``
+columns) get the same index over row numbers; answers are taken from
+the memory-mapped columns.
+
+With a ``Shard``, only predictions whose id falls in that shard are
+indexed, and only that shard's dataset rows are joined.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from array import array
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from llm_eval.data.columnar import (
+    ColumnBatch,
+    is_arrow_path,
+    iter_column_batches,
+    iter_record_batches,
+    read_table,
+)
+from llm_eval.data.sharding import Shard
+
+# Location = file number in the top bits, byte offset in the rest
+_OFFSET_BITS = 48
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+# How many unmatched ids to list in reports
+REPORT_SAMPLE = 20
+
+class PredictionLoadError(RuntimeError):
+    """Raised when a predictions file cannot be read."""
+
+
+def _id_hash(row_id: Any) -> int:
+    # Python's str hash is salted per process, which is fine: the
+    # index never leaves the process that built it
+    return hash(str(row_id)) & _HASH_MASK
+
+
+def iter_predictions(paths: Sequence[Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream prediction rows from one or more JSONL shards, in file order.
+    """
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise PredictionLoadError(
+                        f"{path}:{line_no} is not valid JSON: {exc}"
+                    ) from exc
+
+
+def prediction_answer(value: Any) -> Any:
+    """
+    A present prediction row's answer: null (or no ``prediction`` key)
+    is an empty answer, not a missing prediction.
+    """
+    return "" if value is None else value
+
+
+def iter_prediction_answers(paths: Sequence[Path]) -> Iterator[Any]:
+    """
+    Stream the ``prediction`` value of every row, in file order.
+    """
+    for path in paths:
+        if not is_arrow_path(path):
+            for row in iter_predictions([path]):
+                yield prediction_answer(row.get("prediction"))
+            continue
+
+        try:
+            for batch in iter_record_batches(path, ["prediction"]):
+                yield from map(prediction_answer, batch.column("prediction").to_pylist())
+        except Exception as exc:
+            raise PredictionLoadError(f"Cannot read predictions file {path}: {exc}") from exc
+
+
+@dataclass
+class JoinReport:
+    """
+    Outcome of joining a dataset with a model's predictions.
+    """
+
+    matched: int = 0
+    missing: int = 0
+    missing_ids: List[str] = field(default_factory=list)
+    unexpected: int = 0
+    unexpected_ids: List[str] = field(default_factory=list)
+    duplicates: int = 0
+    without_id: int = 0
+
+    def record_missing(self, row_id: str) -> None:
+        self.missing += 1
+        if len(self.missing_ids) < REPORT_SAMPLE:
+            self.missing_ids.append(row_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "matched": self.matched,
+            "missing": self.missing,
+            "missing_ids": self.missing_ids,
+            "unexpected": self.unexpected,
+            "unexpected_ids": self.unexpected_ids,
+            "duplicates": self.duplicates,
+            "without_id": self.without_id,
+        }
+
+
+class _HashIndex:
+    """
+    Sorted 64-bit id hashes with one location per prediction.
+
+    Subclasses fill ``without_id`` and return (hashes, locations) from
+    ``_scan``, skipping ids outside ``shard``; duplicate ids keep their
+    first occurrence (in file order).
+    """
+
+    def __init__(self, paths: Sequence[Path], shard: Optional[Shard] = None) -> None:
+        self.paths = [Path(p) for p in paths]
+        if not self.paths:
+            raise PredictionLoadError("No prediction files given")
+        self.shard = shard
+
+        self.without_id = 0
+        self.duplicates = 0
+
+        hashes, locations = self._scan()
+
+        order = np.argsort(hashes, kind="stable")
+        hashes, locations = hashes[order], locations[order]
+
+        # Keep the first occurrence of every id
+        keep = np.ones(len(hashes), dtype=bool)
+        keep[1:] = hashes[1:] != hashes[:-1]
+        self.duplicates = int(len(hashes) - keep.sum())
+
+        self._hashes = hashes[keep]
+        self._locations = locations[keep]
+        self._used = np.zeros(len(self._hashes), dtype=bool)
+
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _scan(self) -> Tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+    def _in_shard(self, row_id: Any) -> bool:
+        return self.shard is None or self.shard.contains(row_id)
+
+    @property
+    def _counts_without_id(self) -> int:
+        # Rows without an id belong to no shard; shard 0 reports them, so
+        # merged shard reports add up to the unsharded numbers
+        return int(self.shard is None or self.shard.index == 0)
+
+    def _find(self, ids: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (positions in ``ids`` whose hash is indexed, their index slots).
+        """
+        if not len(ids) or not len(self._hashes):
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        wanted = np.fromiter((_id_hash(i) for i in ids), dtype=np.uint64, count=len(ids))
+        slots = np.searchsorted(self._hashes, wanted)
+        slots = np.minimum(slots, len(self._hashes) - 1)
+        hits = np.flatnonzero(self._hashes[slots] == wanted)
+        return hits, slots[hits]
+
+    def answers(self, ids: Sequence[Any]) -> List[Optional[Any]]:
+        """
+        The ``prediction`` value for each of ``ids``: None where no row
+        has that id, "" where the row's prediction is null.
+        """
+        raise NotImplementedError
+
+    def _ids_at(self, locations: np.ndarray) -> List[str]:
+        raise NotImplementedError
+
+    def unused_ids(self, limit: int = REPORT_SAMPLE) -> Tuple[int, List[str]]:
+        """
+        Count of indexed predictions never looked up, plus a sample of their ids.
+        """
+        unused = np.flatnonzero(~self._used)
+        with self._lock:
+            sample = self._ids_at(self._locations[unused[:limit]])
+        return len(unused), sorted(sample)
+
+    def close(self) -> None:
+        pass
+
+
+class PredictionIndex(_HashIndex):
+    """
+    Hash index over sharded, unordered JSONL prediction files.
+    """
+
+    def __init__(self, paths: Sequence[Path], shard: Optional[Shard] = None) -> None:
+        if len(paths) >= 1 << (64 - _OFFSET_BITS):
+            raise PredictionLoadError("Too many prediction shards")
+        self._files: Dict[int, BinaryIO] = {}
+        super().__init__(paths, shard)
+
+    def _scan(self) -> Tuple[np.ndarray, np.ndarray]:
+        hashes = array("Q")
+        locations = array("Q")
+
+        for file_no, path in enumerate(self.paths):
+            try:
+                f = open(path, "rb")
+            except OSError as exc:
+                raise PredictionLoadError(f"Cannot open predictions file {path}: {exc}") from exc
+
+            with f:
+                offset = 0
+                for line_no, line in enumerate(f, start=1):
+                    start, offset = offset, offset + len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as exc:
+                        raise PredictionLoadError(
+                            f"{path}:{line_no} is not valid JSON: {exc}"
+                        ) from exc
+
+                    row_id = row.get("id") if isinstance(row, dict) else None
+                    if row_id is None:
+                        self.without_id += self._counts_without_id
+                        continue
+                    if not self._in_shard(row_id):
+                        continue
+
+                    hashes.append(_id_hash(row_id))
+                    locations.append((file_no << _OFFSET_BITS) | start)
+
+        return (
+            np.frombuffer(hashes, dtype=np.uint64).copy(),
+            np.frombuffer(locations, dtype=np.uint64).copy(),
+        )
+
+    def _file(self, file_no: int) -> BinaryIO:
+        f = self._files.get(file_no)
+        if f is None:
+            f = self._files[file_no] = open(self.paths[file_no], "rb")
+        return f
+
+    def _read(self, location: int) -> Dict[str, Any]:
+        f = self._file(location >> _OFFSET_BITS)
+        f.seek(location & _OFFSET_MASK)
+        return json.loads(f.readline())
+
+    def lookup(self, ids: Sequence[Any]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Prediction rows for ``ids`` (None where missing), read from disk.
+        """
+        hits, slots = self._find(ids)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ids)
+
+        with self._lock:
+            # Read in file/offset order for sequential-ish disk access
+            for k in np.argsort(self._locations[slots], kind="stable"):
+                i, slot = hits[k], slots[k]
+                row = self._read(int(self._locations[slot]))
+
+                if str(row.get("id")) == str(ids[i]):
+                    results[i] = row
+                    self._used[slot] = True
+
+        return results
+
+    def answers(self, ids: Sequence[Any]) -> List[Optional[Any]]:
+        return [
+            prediction_answer(row.get("prediction")) if row is not None else None
+            for row in self.lookup(ids)
+        ]
+
+    def _ids_at(self, locations: np.ndarray) -> List[str]:
+        return [str(self._read(int(location)).get("id")) for location in locations]
+
+    def close(self) -> None:
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+
+
+class ArrowPredictionIndex(_HashIndex):
+    """
+    Hash index over Parquet / Arrow IPC prediction files.
+
+    Locations are row numbers into the concatenated ``id`` and
+    ``prediction`` columns; answers are gathered with ``take``.
+    """
+
+    def _scan(self) -> Tuple[np.ndarray, np.ndarray]:
+        tables = []
+        for path in self.paths:
+            try:
+                tables.append(read_table(path, ["id", "prediction"]))
+            except Exception as exc:
+                raise PredictionLoadError(
+                    f"Cannot read predictions file {path}: {exc}"
+                ) from exc
+
+        if len(tables) == 1:
+            self._table = tables[0]
+        else:
+            import pyarrow as pa
+
+            self._table = pa.concat_tables(tables, promote_options="permissive")
+
+        ids = self._table.column("id").to_pylist()
+        self.without_id = sum(row_id is None for row_id in ids) * self._counts_without_id
+
+        rows = np.fromiter(
+            (
+                row
+                for row, row_id in enumerate(ids)
+                if row_id is not None and self._in_shard(row_id)
+            ),
+            dtype=np.uint64,
+        )
+        hashes = np.fromiter(
+            (_id_hash(ids[row]) for row in rows.tolist()),
+            dtype=np.uint64,
+            count=len(rows),
+        )
+        return hashes, rows
+
+    def answers(self, ids: Sequence[Any]) -> List[Optional[Any]]:
+        hits, slots = self._find(ids)
+        results: List[Optional[Any]] = [None] * len(ids)
+        if not len(hits):
+            return results
+
+        rows = self._locations[slots].astype(np.int64)
+        found_ids = self._table.column("id").take(rows).to_pylist()
+        found = self._table.column("prediction").take(rows).to_pylist()
+
+        with self._lock:
+            for i, slot, row_id, answer in zip(hits, slots, found_ids, found):
+                if str(row_id) == str(ids[i]):
+                    results[i] = prediction_answer(answer)
+                    self._used[slot] = True
+
+        return results
+
+    def _ids_at(self, locations: np.ndarray) -> List[str]:
+        rows = locations.astype(np.int64)
+        return [str(row_id) for row_id in self._table.column("id").take(rows).to_pylist()]
+
+    def close(self) -> None:
+        self._table = None
+
+
+def open_prediction_index(paths: Sequence[Path], shard: Optional[Shard] = None) -> _HashIndex:
+    """
+    Index for ``paths``: all JSONL, or all Parquet / Arrow IPC.
+    """
+    arrow = {is_arrow_path(Path(p)) for p in paths}
+    if len(arrow) > 1:
+        raise PredictionLoadError("Prediction shards must all be JSONL or all Arrow/Parquet")
+    if arrow == {True}:
+        return ArrowPredictionIndex(paths, shard)
+    return PredictionIndex(paths, shard)
+
+
+def _dataset_batches(
+    dataset: Iterable[Dict[str, Any]],
+    chunk_size: int,
+    shard: Optional[Shard],
+) -> Iterator[ColumnBatch]:
+    if shard is None:
+        return iter_column_batches(dataset, chunk_size)
+    # Read N chunks' worth so chunks are still ~chunk_size after filtering
+    return shard.filter(iter_column_batches(dataset, chunk_size * shard.count))
+
+
+def join_by_id(
+    dataset: Iterable[Dict[str, Any]],
+    index: _HashIndex,
+    chunk_size: int,
+    report: Optional[JoinReport] = None,
+    shard: Optional[Shard] = None,
+) -> Iterator[ColumnBatch]:
+    """
+    Yield aligned column chunks, matching rows by ``id``.
+
+    Dataset rows without a prediction are skipped and, if ``report``
+    is given, recorded there. With ``shard``, rows of other shards are
+    skipped before the lookup.
+    """
+    for batch in _dataset_batches(dataset, chunk_size, shard):
+        answers = index.answers(batch.ids)
+
+        keep: List[int] = []
+        for i, answer in enumerate(answers):
+            if answer is None:
+                if report is not None:
+                    report.record_missing(str(batch.ids[i]))
+                continue
+            keep.append(i)
+
+        if report is not None:
+            report.matched += len(keep)
+
+        if len(keep) < len(batch):
+            batch = batch.take(keep)
+            answers = [answers[i] for i in keep]
+
+        if keep:
+            yield batch.with_answers(answers)
+
+    if report is not None:
+        report.unexpected, report.unexpected_ids = index.unused_ids()
+        report.duplicates = index.duplicates
+        report.without_id = index.without_id
+
+
+def join_by_position(
+    dataset: Iterable[Dict[str, Any]],
+    paths: Sequence[Path],
+    chunk_size: int,
+    report: Optional[JoinReport] = None,
+    shard: Optional[Shard] = None,
+) -> Iterator[ColumnBatch]:
+    """
+    Yield chunks pairing the n-th dataset row with the n-th prediction.
+
+    Legacy alignment; stops at the shorter of the two streams. Pairing
+    always runs over every row; ``shard`` then keeps its own rows.
+    """
+    if shard is not None:
+        batches = join_by_position(dataset, paths, chunk_size * shard.count)
+        for batch in shard.filter(batches):
+            if report is not None:
+                report.matched += len(batch)
+            yield batch
+        return
+
+    answers = iter_prediction_answers(paths)
+    for batch in iter_column_batches(dataset, chunk_size):
+        chunk_answers = list(islice(answers, len(batch)))
+        if not chunk_answers:
+            return
+
+        exhausted = len(chunk_answers) < len(batch)
+        if exhausted:
+            batch = batch.take(range(len(chunk_answers)))
+
+        if report is not None:
+            report.matched += len(chunk_answers)
+        yield batch.with_answers(chunk_answers)
+
+        if exhausted:
+            return
@@ -0,0 +1,73 @@
+"""
+Deterministic dataset sharding by row id.
+
+A row belongs to shard ``i`` of ``N`` when a stable hash of its id
+(blake2b, not Python's per-process salted ``hash``) is ``i`` modulo
+``N``. Every process, on any machine, assigns the same rows to the
+same shard, and shards are disjoint and cover the dataset, so their
+outputs can be merged with ``llm-eval merge``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from llm_eval.data.columnar import ColumnBatch
+
+
+def stable_id_hash(row_id: Any) -> int:
+    digest = hashlib.blake2b(str(row_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Shard ``index`` (0-based) of ``count``.
+    """
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if self.count < 1:
+            raise ValueError("Shard count must be >= 1")
+        if not 0 <= self.index < self.count:
+            raise ValueError(f"Shard index must be in [0, {self.count - 1}], got {self.index}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """
+        Parse ``"i/N"``, e.g. ``"0/4"`` for the first of four shards.
+        """
+        try:
+            index, count = (int(part) for part in spec.split("/"))
+        except ValueError:
+            raise ValueError(f"Invalid shard {spec!r}; expected i/N, e.g. 0/4") from None
+        return cls(index, count)
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def contains(self, row_id: Any) -> bool:
+        return self.count == 1 or stable_id_hash(row_id) % self.count == self.index
+
+    def mask(self, ids: Sequence[Any]) -> np.ndarray:
+        if self.count == 1:
+            return np.ones(len(ids), dtype=bool)
+        return np.fromiter(map(self.contains, ids), dtype=bool, count=len(ids))
+
+    def filter(self, batches: Iterable[ColumnBatch]) -> Iterator[ColumnBatch]:
+        """
+        Keep the rows of ``batches`` that belong to this shard.
+        """
+        for batch in batches:
+            keep = np.flatnonzero(self.mask(batch.ids))
+            if len(keep) == len(batch):
+                yield batch
+            elif len(keep):
+                yield batch.take(keep.tolist())
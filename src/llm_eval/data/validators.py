@@ -3,9 +3,26 @@ Dataset row validation utilities.
 
 These validators ensure benchmark datasets meet strict schema requirements
 expected by the evaluation pipeline.
+
+Validation is field by field: a block of rows is split into one column
+per field and every check runs over a whole column, producing boolean
+masks. All failures of a block are reported at once (row number, id,
+field and reason), so a broken file is diagnosed in a single pass.
+
+The checks here are per-value Python predicates, not vectorized: JSON
+and CSV values can be of any Python type, and converting a column to
+Arrow is no type check (it accepts bytes as strings and any sequence as
+a list). Arrow and Parquet batches, whose schema fixes the types, are
+checked with Arrow compute kernels instead (``validate_record_batch``).
 """
 
-from typing import Dict, List
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
 
 
 REQUIRED_FIELDS = {
@@ -17,41 +34,238 @@ REQUIRED_FIELDS = {
     "category",
 }
 
+# Check and report order
+FIELD_ORDER = (
+    "id",
+    "query",
+    "expected_answer",
+    "retrieved_contexts",
+    "difficulty",
+    "category",
+)
+
+NON_EMPTY_STRING_FIELDS = ("id", "query", "category")
+
 
 ALLOWED_DIFFICULTY = {"easy", "medium", "hard"}
 
+# Issues kept in a ValidationReport; further ones are only counted
+MAX_REPORTED_ISSUES = 1000
 
-def validate_row(row: Dict) -> None:
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """
+    One failed check: 1-based row number, field, a stable ``code``
+    (e.g. ``missing``, ``empty``) and a readable reason.
     """
-    Validate a single dataset row.
 
-    Raises ValueError on any schema violation.
+    row: int
+    field: str
+    code: str
+    reason: str
+    id: Optional[str] = None
+    line: Optional[int] = None
+
+    def __str__(self) -> str:
+        details = []
+        if self.line is not None:
+            details.append(f"line {self.line}")
+        if self.id is not None:
+            details.append(f"id {self.id!r}")
+        where = f"Row {self.row}" + (f" ({', '.join(details)})" if details else "")
+        return f"{where}: {self.reason}"
+
+
+@dataclass
+class ValidationReport:
     """
-    missing = REQUIRED_FIELDS - row.keys()
-    if missing:
-        raise ValueError(f"Missing required fields: {sorted(missing)}")
+    All validation failures of a dataset, collected in one pass.
+    """
+
+    rows: int = 0
+    error_count: int = 0
+    invalid_rows: int = 0
+    issues: List[ValidationIssue] = field(default_factory=list)
+    reasons: Counter = field(default_factory=Counter)
+    max_issues: int = MAX_REPORTED_ISSUES
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    def add(self, issues: Iterable[ValidationIssue]) -> None:
+        rows = set()
+        for issue in issues:
+            self.error_count += 1
+            self.reasons[f"{issue.field or 'row'}:{issue.code}"] += 1
+            rows.add(issue.row)
+            if len(self.issues) < self.max_issues:
+                self.issues.append(issue)
+        self.invalid_rows += len(rows)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "invalid_rows": self.invalid_rows,
+            "error_count": self.error_count,
+            "reasons": dict(self.reasons.most_common()),
+            "issues": [
+                {
+                    "row": issue.row,
+                    "line": issue.line,
+                    "id": issue.id,
+                    "field": issue.field,
+                    "code": issue.code,
+                    "reason": issue.reason,
+                }
+                for issue in self.issues
+            ],
+            "truncated": self.error_count > len(self.issues),
+        }
+
+
+def _mask(values: Sequence[Any], predicate) -> np.ndarray:
+    # One Python call per value; the mask only batches the reporting
+    return np.fromiter(map(predicate, values), dtype=bool, count=len(values))
+
+
+def _non_empty_string(value: Any) -> bool:
+    return type(value) is str and value != ""
+
 
-    if not isinstance(row["id"], str) or not row["id"]:
-        raise ValueError("Field 'id' must be a non-empty string")
+def _is_string(value: Any) -> bool:
+    return isinstance(value, str)
 
-    if not isinstance(row["query"], str) or not row["query"]:
-        raise ValueError("Field 'query' must be a non-empty string")
 
-    if not isinstance(row["expected_answer"], str):
-        raise ValueError("Field 'expected_answer' must be a string")
+def _is_string_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(ctx, str) for ctx in value)
 
-    if not isinstance(row["retrieved_contexts"], list):
-        raise ValueError("Field 'retrieved_contexts' must be a list")
 
-    for ctx in row["retrieved_contexts"]:
-        if not isinstance(ctx, str):
-            raise ValueError("Each retrieved_context must be a string")
+def _field_checks(name: str, values: Sequence[Any]) -> List[tuple]:
+    """
+    (bad mask, code, reason) for one column; missing values excluded.
+
+    ``{value}`` in a reason is filled with the offending value.
+    """
+    if name in NON_EMPTY_STRING_FIELDS:
+        is_string = _mask(values, _is_string)
+        non_empty = _mask(values, _non_empty_string)
+        reason = f"Field '{name}' must be a non-empty string"
+        return [
+            (~is_string, "not_string", reason),
+            (is_string & ~non_empty, "empty", reason),
+        ]
+
+    if name == "expected_answer":
+        return [
+            (~_mask(values, _is_string), "not_string", "Field 'expected_answer' must be a string")
+        ]
+
+    if name == "retrieved_contexts":
+        is_list = _mask(values, lambda v: isinstance(v, list))
+        all_strings = _mask(values, _is_string_list)
+        return [
+            (~is_list, "not_list", "Field 'retrieved_contexts' must be a list"),
+            (is_list & ~all_strings, "not_string", "Each retrieved_context must be a string"),
+        ]
+
+    if name == "difficulty":
+        allowed = _mask(values, lambda v: isinstance(v, str) and v in ALLOWED_DIFFICULTY)
+        return [
+            (
+                ~allowed,
+                "not_allowed",
+                "Invalid difficulty {value!r}. "
+                f"Must be one of {sorted(ALLOWED_DIFFICULTY)}",
+            )
+        ]
+
+    return []
+
+
+def validate_rows(
+    rows: Sequence[Any],
+    *,
+    first_row: int = 1,
+    lines: Optional[Sequence[int]] = None,
+) -> List[ValidationIssue]:
+    """
+    Validate a block of rows column by column.
+
+    :param rows: Parsed rows (dicts; anything else is reported as invalid)
+    :param first_row: 1-based row number of ``rows[0]``, for reporting
+    :param lines: Optional source line number per row, for reporting
+    :return: Every issue found, ordered by row then field
+    """
+    n = len(rows)
+    if n == 0:
+        return []
+
+    is_dict = _mask(rows, lambda r: isinstance(r, dict))
+    dicts = [row if ok else {} for row, ok in zip(rows, is_dict)]
+    ids = [row.get("id") for row in dicts]
+
+    found: List[tuple] = []
+    for i in np.flatnonzero(~is_dict):
+        found.append((int(i), -1, "", "not_object", "Row must be a JSON object"))
+
+    for order, name in enumerate(FIELD_ORDER):
+        values = [row.get(name, _MISSING) for row in dicts]
+        missing = _mask(values, lambda v: v is _MISSING) & is_dict
+
+        for i in np.flatnonzero(missing):
+            found.append((int(i), order, name, "missing", f"Missing required field '{name}'"))
 
-    if row["difficulty"] not in ALLOWED_DIFFICULTY:
-        raise ValueError(
-            f"Invalid difficulty '{row['difficulty']}'. "
-            f"Must be one of {sorted(ALLOWED_DIFFICULTY)}"
+        for bad, code, reason in _field_checks(name, values):
+            for i in np.flatnonzero(bad & ~missing & is_dict):
+                found.append((int(i), order, name, code, reason.format(value=values[i])))
+
+    found.sort(key=lambda item: (item[0], item[1]))
+    return [
+        ValidationIssue(
+            row=first_row + i,
+            field=name,
+            code=code,
+            reason=reason,
+            id=str(ids[i]) if ids[i] is not None else None,
+            line=lines[i] if lines is not None else None,
         )
+        for i, _, name, code, reason in found
+    ]
+
+
+def format_issues(issues: Sequence[ValidationIssue], limit: int = 20) -> str:
+    """
+    Human-readable summary of ``issues`` (first ``limit`` listed).
+    """
+    if len(issues) == 1:
+        (issue,) = issues
+        where = f"Row {issue.row}" + (f" (line {issue.line})" if issue.line is not None else "")
+        return f"{where} failed validation: {issue.reason}"
+
+    rows = sorted({issue.row for issue in issues})
+    lines = [f"{len(issues)} validation errors in {len(rows)} rows (first: Row {rows[0]}):"]
+    lines.extend(f"  {issue}" for issue in issues[:limit])
+    if len(issues) > limit:
+        lines.append(f"  ... {len(issues) - limit} more (run `llm-eval validate` for a full report)")
+    return "\n".join(lines)
+
+
+def validate_row(row: Dict) -> None:
+    """
+    Validate a single dataset row.
+
+    Raises ValueError on any schema violation.
+    """
+    issues = validate_rows([row])
+    if not issues:
+        return
+
+    missing = sorted(issue.field for issue in issues if issue.code == "missing")
+    if missing:
+        raise ValueError(f"Missing required fields: {missing}")
 
-    if not isinstance(row["category"], str) or not row["category"]:
-        raise ValueError("Field 'category' must be a non-empty string")
+    raise ValueError(issues[0].reason)
@@ -0,0 +1,3 @@
+"""
+Embedding utilities shared by embedding-based metrics.
+"""
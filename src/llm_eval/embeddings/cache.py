@@ -0,0 +1,229 @@
+"""
+Run-scoped embedding store shared across metrics.
+
+The same strings are embedded by several metrics (the query by answer
+and context relevancy, the answer by BERTScore, answer relevancy and
+faithfulness, ...). The runner activates one EmbeddingStore per run;
+every embedding metric looks texts up there before calling its model,
+so each (model, text) pair is encoded at most once per run. The model
+part of a key is (model_name, device, dtype): the same weights loaded
+in float16 and float32 produce different vectors and never share one.
+
+When a PersistentEmbeddingStore is attached, in-memory misses are looked
+up on disk before encoding, and newly encoded dataset-side texts
+(queries, references, contexts) are written back for future runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from llm_eval.embeddings.disk_store import PersistentEmbeddingStore
+from llm_eval.embeddings.encoding import DEFAULT_BATCH_SIZE, encode_texts
+from llm_eval.embeddings.lru import EmbeddingLRUCache
+
+# (model_name, device, dtype), as in EmbeddingModelPool
+ModelKey = Tuple[str, Optional[str], Optional[str]]
+StoreKey = Tuple[ModelKey, bytes]
+
+
+def text_hash(text: str) -> bytes:
+    """
+    Stable content hash used as the text part of a store key.
+    """
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def model_id(model_key: ModelKey) -> str:
+    """
+    Name of a model key in the persistent store; just the model name
+    for the default device and dtype.
+    """
+    model_name, device, dtype = model_key
+    qualifiers = [f"{k}={v}" for k, v in (("device", device), ("dtype", dtype)) if v]
+    return f"{model_name}[{','.join(qualifiers)}]" if qualifiers else model_name
+
+
+class EmbeddingStore:
+    """
+    Thread-safe ((model_name, device, dtype), text hash) → embedding store.
+
+    Backed by an EmbeddingLRUCache (unbounded unless ``max_bytes`` or
+    ``max_entries`` is set, vectors kept as ``dtype``), which also tracks
+    the hits and misses reported at the end of a run.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        dtype: str = "float32",
+        persistent: Optional[PersistentEmbeddingStore] = None,
+        persist_predictions: bool = False,
+    ) -> None:
+        self._cache = EmbeddingLRUCache(max_bytes=max_bytes, max_entries=max_entries, dtype=dtype)
+        self.persistent = persistent
+        self.persist_predictions = persist_predictions
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    def embed(
+        self,
+        model_name: str,
+        dataset_texts: Sequence[str],
+        prediction_texts: Sequence[str] = (),
+        *,
+        model_loader: Callable[[], Any],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Return embeddings for dataset_texts + prediction_texts, in order.
+
+        Only texts found neither in memory nor on disk are encoded, all
+        in one batch. ``model_loader`` is only called when there is at
+        least one such text.
+        """
+        texts = list(dataset_texts) + list(prediction_texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        unique = list(dict.fromkeys(texts))
+        digests = [text_hash(text) for text in unique]
+        model_key = (model_name, device, dtype)
+        keys = [(model_key, digest) for digest in digests]
+        found = self._cache.get_many(keys)
+
+        missing = [i for i, vector in enumerate(found) if vector is None]
+
+        if missing and self.persistent is not None:
+            on_disk = self.persistent.get_many(
+                model_id(model_key), [digests[i] for i in missing]
+            )
+            loaded = [(i, vector) for i, vector in zip(missing, on_disk) if vector is not None]
+            if loaded:
+                self._cache.put_many([keys[i] for i, _ in loaded], [v for _, v in loaded])
+                for i, vector in loaded:
+                    found[i] = vector
+                missing = [i for i in missing if found[i] is None]
+
+        if missing:
+            encoded = encode_texts(
+                model_loader(),
+                [unique[i] for i in missing],
+                batch_size=batch_size,
+            )
+            self._cache.put_many([keys[i] for i in missing], encoded)
+            for i, vector in zip(missing, encoded):
+                found[i] = vector
+
+            if self.persistent is not None:
+                self._persist(
+                    model_id(model_key), unique, digests, missing, encoded, set(dataset_texts)
+                )
+
+        position = {text: i for i, text in enumerate(unique)}
+        return np.stack([found[position[text]] for text in texts])
+
+    def _persist(
+        self,
+        model_name: str,
+        unique: Sequence[str],
+        digests: Sequence[bytes],
+        missing: Sequence[int],
+        encoded: np.ndarray,
+        dataset_side: Set[str],
+    ) -> None:
+        keep = [
+            j for j, i in enumerate(missing)
+            if self.persist_predictions or unique[i] in dataset_side
+        ]
+        if keep:
+            self.persistent.put_many(
+                model_name,
+                [digests[missing[j]] for j in keep],
+                encoded[keep],
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return size and hit/miss counters.
+        """
+        stats = self._cache.stats()
+        if self.persistent is not None:
+            stats["persistent"] = self.persistent.stats()
+        return stats
+
+
+_active_store: Optional[EmbeddingStore] = None
+
+
+def get_active_store() -> Optional[EmbeddingStore]:
+    """
+    Return the store of the current run, if any.
+    """
+    return _active_store
+
+
+@contextmanager
+def activate_store(store: EmbeddingStore) -> Iterator[EmbeddingStore]:
+    """
+    Make ``store`` visible to all metrics (in all threads) for a run.
+    """
+    global _active_store
+
+    previous = _active_store
+    _active_store = store
+    try:
+        yield store
+    finally:
+        _active_store = previous
+
+
+def embed_texts(
+    model_name: str,
+    dataset_texts: Sequence[str],
+    prediction_texts: Sequence[str] = (),
+    *,
+    model_loader: Callable[[], Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    device: Optional[str] = None,
+    dtype: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Embed dataset_texts + prediction_texts (in that order) through the
+    active run store, or directly when none is active.
+
+    Dataset-side texts (queries, references, contexts) are stable across
+    runs and eligible for the persistent store; prediction-side texts
+    (answers, claims) change with every model checkpoint.
+    """
+    store = get_active_store()
+    if store is None:
+        texts = list(dataset_texts) + list(prediction_texts)
+        return encode_texts(model_loader(), texts, batch_size=batch_size)
+
+    return store.embed(
+        model_name,
+        dataset_texts,
+        prediction_texts,
+        model_loader=model_loader,
+        batch_size=batch_size,
+        device=device,
+        dtype=dtype,
+    )
@@ -0,0 +1,238 @@
+"""
+Persistent, memory-mapped embedding store.
+
+Layout (one directory per embedding model):
+
+    <root>/<model-slug>/
+        meta.json     {"model_name": ..., "dim": ...}
+        keys.bin      append-only sha256 digests, 32 bytes per row
+        vectors.f32   append-only float32 rows, dim * 4 bytes per row
+
+Row i of keys.bin describes row i of vectors.f32. Vectors are written
+before their keys, so a reader never indexes a half-written row.
+Existing rows are never modified, which makes concurrent readers safe;
+writers serialize on a per-model lock file.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:  # POSIX advisory locks; other platforms fall back to in-process locking
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+DIGEST_SIZE = 32
+
+
+class _ModelShard:
+    """
+    On-disk vectors of a single embedding model.
+    """
+
+    def __init__(self, directory: Path, model_name: str) -> None:
+        self.directory = directory
+        self.model_name = model_name
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.meta_path = directory / "meta.json"
+        self.keys_path = directory / "keys.bin"
+        self.vectors_path = directory / "vectors.f32"
+        self.lock_path = directory / ".lock"
+
+        self.dim: Optional[int] = None
+        self.index: Dict[bytes, int] = {}
+        self.rows = 0
+
+        self._mmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        self._load_meta()
+        self._refresh()
+
+    def _load_meta(self) -> None:
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            self.dim = int(meta["dim"])
+
+    def _complete_rows(self) -> int:
+        if self.dim is None or not self.keys_path.exists() or not self.vectors_path.exists():
+            return 0
+        key_rows = self.keys_path.stat().st_size // DIGEST_SIZE
+        vector_rows = self.vectors_path.stat().st_size // (self.dim * 4)
+        return min(key_rows, vector_rows)
+
+    def _refresh(self) -> None:
+        """
+        Index rows appended since the last refresh (by any process).
+        """
+        if self.dim is None:
+            self._load_meta()
+
+        rows = self._complete_rows()
+        if rows <= self.rows:
+            return
+
+        with self.keys_path.open("rb") as f:
+            f.seek(self.rows * DIGEST_SIZE)
+            blob = f.read((rows - self.rows) * DIGEST_SIZE)
+
+        for row, offset in enumerate(range(0, len(blob), DIGEST_SIZE), start=self.rows):
+            self.index.setdefault(blob[offset:offset + DIGEST_SIZE], row)
+
+        self.rows = rows
+        self._mmap = None
+
+    def _vectors(self) -> np.memmap:
+        if self._mmap is None:
+            self._mmap = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self.rows, self.dim),
+            )
+        return self._mmap
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        with self.lock_path.open("a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def get_many(self, digests: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            if any(d not in self.index for d in digests):
+                self._refresh()
+
+            rows = [self.index.get(d) for d in digests]
+            if self.rows == 0 or all(row is None for row in rows):
+                return [None] * len(digests)
+
+            # One gather from the memory map for all hits
+            hit_rows = [row for row in rows if row is not None]
+            block = iter(np.asarray(self._vectors()[hit_rows]))
+            return [None if row is None else next(block) for row in rows]
+
+    def put_many(self, digests: Sequence[bytes], vectors: np.ndarray) -> int:
+        """
+        Append vectors not yet on disk. Returns the number of rows written.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(digests):
+            raise ValueError("put_many expects one 2-D vector row per digest")
+
+        with self._lock, self._write_lock():
+            self._refresh()
+
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self.meta_path.write_text(
+                    json.dumps({"model_name": self.model_name, "dim": self.dim}),
+                    encoding="utf-8",
+                )
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dim {vectors.shape[1]} does not match "
+                    f"stored dim {self.dim} for model '{self.model_name}'"
+                )
+
+            fresh: Dict[bytes, int] = {}
+            for i, digest in enumerate(digests):
+                if digest not in self.index and digest not in fresh:
+                    fresh[digest] = i
+
+            if not fresh:
+                return 0
+
+            # Drop any torn tail left by a crashed writer before appending
+            for path, row_size in (
+                (self.vectors_path, self.dim * 4),
+                (self.keys_path, DIGEST_SIZE),
+            ):
+                if path.exists() and path.stat().st_size != self.rows * row_size:
+                    with path.open("r+b") as f:
+                        f.truncate(self.rows * row_size)
+
+            with self.vectors_path.open("ab") as f:
+                f.write(vectors[list(fresh.values())].tobytes())
+            with self.keys_path.open("ab") as f:
+                f.write(b"".join(fresh))
+
+            for offset, digest in enumerate(fresh):
+                self.index[digest] = self.rows + offset
+            self.rows += len(fresh)
+            self._mmap = None
+
+            return len(fresh)
+
+
+class PersistentEmbeddingStore:
+    """
+    Cross-run (model_name, sha256(text)) → embedding store on disk.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._shards: Dict[str, _ModelShard] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.writes = 0
+
+    @staticmethod
+    def _slug(model_name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+
+    def _shard(self, model_name: str) -> _ModelShard:
+        with self._lock:
+            shard = self._shards.get(model_name)
+            if shard is None:
+                shard = _ModelShard(self.root / self._slug(model_name), model_name)
+                self._shards[model_name] = shard
+            return shard
+
+    def get_many(
+        self,
+        model_name: str,
+        digests: Sequence[bytes],
+    ) -> List[Optional[np.ndarray]]:
+        found = self._shard(model_name).get_many(digests)
+        hits = sum(vector is not None for vector in found)
+        with self._lock:
+            self.hits += hits
+        return found
+
+    def put_many(
+        self,
+        model_name: str,
+        digests: Sequence[bytes],
+        vectors: np.ndarray,
+    ) -> None:
+        if not digests:
+            return
+        written = self._shard(model_name).put_many(digests, vectors)
+        with self._lock:
+            self.writes += written
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "writes": self.writes,
+                "rows": sum(shard.rows for shard in self._shards.values()),
+            }
@@ -0,0 +1,70 @@
+"""
+Batched text encoding and vectorized cosine similarity.
+
+Embedding metrics gather every text they need for a chunk of rows,
+encode them in a single padded batch, and score the whole chunk with
+NumPy matrix operations instead of one encode call per string.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 64
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def encode_texts(
+    model: Any,
+    texts: Sequence[str],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Encode texts with one model call.
+
+    Duplicate strings are encoded once and fanned back out.
+
+    Returns:
+        float32 array of shape (len(texts), dim), L2-normalized
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    unique = list(dict.fromkeys(texts))
+    embeddings = model.encode(
+        unique,
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    )
+    embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+
+    if len(unique) == len(texts):
+        return _l2_normalize(embeddings)
+
+    position = {text: i for i, text in enumerate(unique)}
+    return _l2_normalize(embeddings[[position[text] for text in texts]])
+
+
+def paired_cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Row-wise cosine similarity: out[i] = cos(a[i], b[i]).
+    """
+    return np.einsum("ij,ij->i", _l2_normalize(a), _l2_normalize(b))
+
+
+def segment_ids(lengths: Sequence[int]) -> np.ndarray:
+    """
+    Map flattened items back to their owning row.
+
+    Example: lengths [2, 1, 3] -> [0, 0, 1, 2, 2, 2]
+    """
+    return np.repeat(np.arange(len(lengths)), lengths)
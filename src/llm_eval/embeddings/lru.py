@@ -0,0 +1,132 @@
+"""
+Bounded, thread-safe LRU cache for embedding vectors.
+
+Eviction is driven by entry count and/or total bytes held, so long
+sweeps cannot turn an embedding cache into the dominant RSS consumer.
+Vectors can optionally be stored as float16 to halve the footprint;
+they are always returned as float32.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+SUPPORTED_STORAGE_DTYPES = {"float32", "float16"}
+
+
+class EmbeddingLRUCache:
+    """
+    Least-recently-used key → vector cache with size and byte limits.
+
+    Counters:
+        hits, misses: lookups served / not served
+        evictions: entries dropped to respect the limits
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        dtype: str = "float32",
+    ) -> None:
+        if dtype not in SUPPORTED_STORAGE_DTYPES:
+            raise ValueError(
+                f"Unsupported cache dtype '{dtype}'. "
+                f"Must be one of {sorted(SUPPORTED_STORAGE_DTYPES)}"
+            )
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_size(key: Hashable, vector: np.ndarray) -> int:
+        return vector.nbytes + sys.getsizeof(key)
+
+    def get_many(self, keys: Sequence[Hashable]) -> List[Optional[np.ndarray]]:
+        """
+        Look up keys, returning None for misses.
+        """
+        found: List[Optional[np.ndarray]] = []
+
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                found.append(vector)
+
+        return [
+            None if vector is None else vector.astype(np.float32, copy=False)
+            for vector in found
+        ]
+
+    def put_many(self, keys: Sequence[Hashable], vectors: Sequence[np.ndarray]) -> None:
+        """
+        Insert vectors, evicting least-recently-used entries over the limits.
+        """
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                stored = np.asarray(vector, dtype=self.dtype)
+
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.nbytes -= self._entry_size(key, previous)
+
+                self._entries[key] = stored
+                self.nbytes += self._entry_size(key, stored)
+
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            key, vector = self._entries.popitem(last=False)
+            self.nbytes -= self._entry_size(key, vector)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return size and hit/miss/eviction counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
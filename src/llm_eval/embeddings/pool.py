@@ -0,0 +1,93 @@
+"""
+Process-wide embedding model pool.
+
+Embedding metrics share one loaded SentenceTransformer per
+(model_name, device, dtype) instead of each metric class (or instance)
+loading its own copy of the same weights.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sentence_transformers import SentenceTransformer
+
+ModelKey = Tuple[str, Optional[str], Optional[str]]
+
+SUPPORTED_DTYPES = {"float32", "float16", "bfloat16"}
+
+
+class EmbeddingModelPool:
+    """
+    Global, thread-safe embedding model registry.
+
+    Maps (model_name, device, dtype) → loaded model.
+    """
+
+    _models: Dict[ModelKey, SentenceTransformer] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(
+        cls,
+        model_name: str,
+        *,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None,
+    ) -> SentenceTransformer:
+        """
+        Return the shared model for this key, loading it on first use.
+
+        Concurrent first calls for the same key load the weights once.
+        """
+        key = (model_name, device, dtype)
+
+        model = cls._models.get(key)
+        if model is not None:
+            return model
+
+        with cls._lock:
+            model = cls._models.get(key)
+            if model is None:
+                model = cls._load(model_name, device=device, dtype=dtype)
+                cls._models[key] = model
+
+        return model
+
+    @staticmethod
+    def _load(
+        model_name: str,
+        *,
+        device: Optional[str],
+        dtype: Optional[str],
+    ) -> SentenceTransformer:
+        if dtype is not None and dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding dtype '{dtype}'. "
+                f"Must be one of {sorted(SUPPORTED_DTYPES)}"
+            )
+
+        model = SentenceTransformer(model_name, device=device)
+
+        if dtype is not None:
+            import torch
+
+            model = model.to(dtype=getattr(torch, dtype))
+
+        return model
+
+    @classmethod
+    def loaded(cls) -> List[ModelKey]:
+        """
+        Return the keys of all currently loaded models.
+        """
+        return list(cls._models)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop all loaded models (mainly for tests and long-lived processes).
+        """
+        with cls._lock:
+            cls._models.clear()
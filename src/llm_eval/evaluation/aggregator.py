@@ -1,28 +1,343 @@
-from typing import Dict, List
-import statistics
+"""
+Streaming, mergeable score aggregation.
+
+An Aggregator is updated chunk by chunk and never holds the score list:
+
+- count, mean and variance: Welford/Chan updates (one numpy pass per
+  chunk, exact pairwise merge)
+- min / max
+- median, p5, p95 from a QuantileSketch
+- fixed-bin histogram counts over [0, 1]
+
+Aggregators built over disjoint parts of the data (threads, processes,
+shards) merge into the same state as one pass over everything: moments
+up to float rounding, everything else exactly.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Mergeable per-(model, metric) Aggregator state of a run, see to_dict
+AGGREGATE_STATE_FILE = "aggregate_state.json"
+
+
+# =========================
+# Quantile sketch
+# =========================
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch.
+
+    Up to ``capacity`` values are kept as-is and quantiles are exact
+    (linear interpolation, so the median matches ``statistics.median``).
+    Beyond that, values collapse into logarithmic buckets (DDSketch):
+    every quantile is then within ``relative_accuracy`` of the true
+    value. Bucket counts add up on merge, so merging is exact and does
+    not depend on order.
+    """
+
+    def __init__(self, capacity: int = 2048, relative_accuracy: float = 0.01) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.capacity = capacity
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self.count = 0
+        self._values: Optional[List[np.ndarray]] = []
+        self._positive: Counter = Counter()
+        self._negative: Counter = Counter()
+        self._zeros = 0
+
+    @property
+    def exact(self) -> bool:
+        return self._values is not None
+
+    def update(self, values: Sequence[float]) -> "QuantileSketch":
+        values = np.asarray(values, dtype=float).ravel()
+        if not len(values):
+            return self
+
+        self.count += len(values)
+        if self.exact:
+            self._values.append(values)
+            if self.count > self.capacity:
+                self._collapse()
+        else:
+            self._add_buckets(values)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative_accuracy")
+
+        self.count += other.count
+        if self.exact and other.exact:
+            self._values.extend(other._values)
+            if self.count > self.capacity:
+                self._collapse()
+            return self
+
+        if self.exact:
+            self._collapse()
+        if other.exact:
+            for values in other._values:
+                self._add_buckets(values)
+        else:
+            self._positive.update(other._positive)
+            self._negative.update(other._negative)
+            self._zeros += other._zeros
+        return self
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        if self.exact:
+            return float(np.quantile(np.concatenate(self._values), q))
+
+        # Walk buckets from the most negative value to the largest
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._estimate(index)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._estimate(index)
+        return self._estimate(max(self._positive))
+
+    def _estimate(self, index: int) -> float:
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def _add_buckets(self, values: np.ndarray) -> None:
+        magnitude = np.abs(values)
+        zero = magnitude < 1e-12
+        self._zeros += int(zero.sum())
+
+        for store, selected in (
+            (self._positive, magnitude[(values > 0) & ~zero]),
+            (self._negative, magnitude[(values < 0) & ~zero]),
+        ):
+            if not len(selected):
+                continue
+            indices = np.ceil(np.log(selected) / self._log_gamma).astype(np.int64)
+            unique, counts = np.unique(indices, return_counts=True)
+            store.update(dict(zip(unique.tolist(), counts.tolist())))
+
+    def _collapse(self) -> None:
+        values, self._values = self._values, None
+        for chunk in values:
+            self._add_buckets(chunk)
+
+    def to_dict(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {
+            "capacity": self.capacity,
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+        }
+        if self.exact:
+            state["values"] = np.concatenate(self._values).tolist() if self._values else []
+        else:
+            state["positive"] = [[int(i), int(c)] for i, c in sorted(self._positive.items())]
+            state["negative"] = [[int(i), int(c)] for i, c in sorted(self._negative.items())]
+            state["zeros"] = self._zeros
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(capacity=state["capacity"], relative_accuracy=state["relative_accuracy"])
+        sketch.count = state["count"]
+        if "values" in state:
+            sketch._values = [np.asarray(state["values"], dtype=float)] if state["values"] else []
+        else:
+            sketch._values = None
+            sketch._positive = Counter(dict(map(tuple, state["positive"])))
+            sketch._negative = Counter(dict(map(tuple, state["negative"])))
+            sketch._zeros = state["zeros"]
+        return sketch
+
+
+# =========================
+# Aggregator
+# =========================
 
 
 class Aggregator:
     """
     Aggregates metric scores across dataset.
     Computes standard statistics per metric.
+
+    Usage:
+        agg = Aggregator()
+        for chunk in chunks:
+            agg.update(chunk)
+        agg.summary()
     """
 
-    @staticmethod
-    def aggregate(scores: List[float]) -> Dict[str, float]:
-        if not scores:
+    #: Histogram range; scores outside it land in the edge bins
+    HISTOGRAM_RANGE: Tuple[float, float] = (0.0, 1.0)
+
+    def __init__(
+        self,
+        bins: int = 20,
+        sketch: Optional[QuantileSketch] = None,
+    ) -> None:
+        self.bins = bins
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram = np.zeros(bins, dtype=np.int64)
+        self.sketch = sketch if sketch is not None else QuantileSketch()
+
+    def update(self, scores: Iterable[float]) -> "Aggregator":
+        """
+        Fold one chunk of scores into the aggregate.
+        """
+        values = np.asarray(
+            scores if isinstance(scores, (np.ndarray, list, tuple)) else list(scores),
+            dtype=float,
+        ).ravel()
+        if not len(values):
+            return self
+
+        n = len(values)
+        mean = float(values.mean())
+        self._combine(n, mean, float(np.square(values - mean).sum()))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        low, high = self.HISTOGRAM_RANGE
+        counts, _ = np.histogram(np.clip(values, low, high), bins=self.bins, range=(low, high))
+        self.histogram += counts
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other: "Aggregator") -> "Aggregator":
+        """
+        Fold another partial aggregate (same bins) into this one.
+        """
+        if other.bins != self.bins:
+            raise ValueError("Cannot merge aggregators with different bins")
+        if not other.count:
+            return self
+
+        self._combine(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram += other.histogram
+        self.sketch.merge(other.sketch)
+        return self
+
+    def _combine(self, n: int, mean: float, m2: float) -> None:
+        # Chan et al. pairwise update of (count, mean, M2)
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        # The sketch may round; never report outside the observed range
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+    def histogram_edges(self) -> np.ndarray:
+        return np.linspace(*self.HISTOGRAM_RANGE, self.bins + 1)
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
             return {
                 "mean": 0.0,
                 "median": 0.0,
                 "std": 0.0,
                 "min": 0.0,
                 "max": 0.0,
+                "count": 0,
+                "p5": 0.0,
+                "p95": 0.0,
             }
 
         return {
-            "mean": float(statistics.mean(scores)),
-            "median": float(statistics.median(scores)),
-            "std": float(statistics.pstdev(scores)),
-            "min": float(min(scores)),
-            "max": float(max(scores)),
+            "mean": self.mean,
+            "median": self.quantile(0.5),
+            "std": math.sqrt(max(self.m2, 0.0) / self.count),
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+            "p5": self.quantile(0.05),
+            "p95": self.quantile(0.95),
         }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Full mergeable state (JSON-serializable).
+        """
+        return {
+            "bins": self.bins,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "histogram": self.histogram.tolist(),
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "Aggregator":
+        aggregator = cls(bins=state["bins"], sketch=QuantileSketch.from_dict(state["sketch"]))
+        aggregator.count = state["count"]
+        aggregator.mean = state["mean"]
+        aggregator.m2 = state["m2"]
+        if state["count"]:
+            aggregator.min = state["min"]
+            aggregator.max = state["max"]
+        aggregator.histogram = np.asarray(state["histogram"], dtype=np.int64)
+        return aggregator
+
+    @staticmethod
+    def aggregate(scores: Iterable[float]) -> Dict[str, float]:
+        return Aggregator().update(scores).summary()
+
+
+def save_aggregate_state(
+    path: Path,
+    aggregators: Dict[str, Dict[str, Aggregator]],
+    shard: str = "0/1",
+    corpus: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+) -> None:
+    """
+    Write ``{model: {metric: Aggregator}}`` state plus the shard it covers
+    and the metrics' corpus states (``{model: {metric: {"state",
+    "reused_rows"}}}``, see ``BaseMetric.corpus_state``).
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "shard": shard,
+                "aggregates": {
+                    model: {metric: agg.to_dict() for metric, agg in metrics.items()}
+                    for model, metrics in aggregators.items()
+                },
+                "corpus": corpus or {},
+            },
+            f,
+        )
@@ -0,0 +1,346 @@
+"""
+Crash-safe checkpointing and resume.
+
+As chunks complete, their per-row results (score, error code, message,
+metadata) are appended to ``<output_dir>/checkpoint.sqlite`` and
+committed, one transaction per chunk. A run that dies keeps every chunk
+finished before the crash. Once a run completes, its outputs hold every
+row and the checkpoint is deleted.
+
+``manifest.json`` records what the run evaluates: fingerprints of the
+config (models, prediction paths, metrics with params and version,
+shard), the dataset and each model's prediction files. A resumed run
+(``llm-eval run --resume``) must match the manifest; it then takes the
+completed (model, metric, row) results from the checkpoint and only
+scores the rest. Rows that failed are retried, as in incremental mode.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.evaluation.results import ErrorCode, ScoredChunk
+from llm_eval.version import __version__
+
+CHECKPOINT_FILE = "checkpoint.sqlite"
+MANIFEST_FILE = "manifest.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    model       TEXT NOT NULL,
+    metric      TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    row_id      TEXT,
+    score       REAL NOT NULL,
+    error       INTEGER NOT NULL,
+    message     TEXT,
+    metadata    TEXT,
+    PRIMARY KEY (model, metric, position)
+) WITHOUT ROWID;
+"""
+
+_DIGEST_SIZE = 16
+
+
+class ResumeError(RuntimeError):
+    """Raised when a run cannot be resumed from its output directory."""
+
+
+# =========================
+# Manifest
+# =========================
+
+
+def file_fingerprint(path: Path) -> str:
+    """
+    Digest of a file's content (streamed, 1 MiB at a time).
+    """
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(dataset: Iterable[Dict[str, Any]]) -> str:
+    """
+    File digest for file-backed datasets, else a digest of the rows.
+    """
+    path = getattr(dataset, "path", None)
+    if path is not None:
+        return file_fingerprint(Path(path))
+
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    for row in dataset:
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def value_fingerprint(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+@dataclass
+class RunManifest:
+    """
+    What a run evaluates, and whether it finished.
+    """
+
+    fingerprints: Dict[str, Any]
+    status: str = "running"
+    version: str = __version__
+    created_at: float = 0.0
+    finished_at: Optional[float] = None
+
+    def changes(self, other: "RunManifest") -> List[str]:
+        """
+        Fingerprint keys that differ from ``other`` (e.g. ``predictions.m``).
+        """
+        changed = []
+        for key in sorted(set(self.fingerprints) | set(other.fingerprints)):
+            mine, theirs = self.fingerprints.get(key), other.fingerprints.get(key)
+            if isinstance(mine, dict) and isinstance(theirs, dict):
+                changed.extend(
+                    f"{key}.{name}"
+                    for name in sorted(set(mine) | set(theirs))
+                    if mine.get(name) != theirs.get(name)
+                )
+            elif mine != theirs:
+                changed.append(key)
+        return changed
+
+    def save(self, path: Path) -> None:
+        # Write-then-rename so a crash never leaves a truncated manifest
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "version": self.version,
+                    "status": self.status,
+                    "created_at": self.created_at,
+                    "finished_at": self.finished_at,
+                    "fingerprints": self.fingerprints,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "RunManifest":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            fingerprints=data["fingerprints"],
+            status=data.get("status", "running"),
+            version=data.get("version", __version__),
+            created_at=data.get("created_at", 0.0),
+            finished_at=data.get("finished_at"),
+        )
+
+
+# =========================
+# Checkpoint store
+# =========================
+
+
+class RunCheckpoint:
+    """
+    SQLite-backed, append-as-you-go per-row results of a run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL: no fsync per chunk; under WAL a committed chunk still
+        # survives a process crash (a power loss may drop the last few)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        self.resumed = 0
+        self.written = 0
+
+    @staticmethod
+    def remove(path: Path) -> None:
+        """
+        Delete a checkpoint database and its WAL side files.
+        """
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    def completed(
+        self,
+        model: str,
+        metric: str,
+        positions: Sequence[int],
+    ) -> Dict[int, tuple]:
+        """
+        (score, metadata) of the rows at ``positions`` that finished
+        without error, keyed by position.
+        """
+        found: Dict[int, tuple] = {}
+        if not positions:
+            return found
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(positions), 500):
+                batch = list(positions[start : start + 500])
+                rows = self._conn.execute(
+                    "SELECT position, score, metadata FROM rows "
+                    "WHERE model = ? AND metric = ? AND error = ? "
+                    f"AND position IN ({','.join('?' * len(batch))})",
+                    [model, metric, int(ErrorCode.OK), *batch],
+                ).fetchall()
+                for position, score, metadata in rows:
+                    found[int(position)] = (
+                        float(score),
+                        json.loads(metadata) if metadata else None,
+                    )
+            self.resumed += len(found)
+        return found
+
+    def append(
+        self,
+        model: str,
+        metric: str,
+        positions: Sequence[int],
+        ids: Sequence[Any],
+        scored: ScoredChunk,
+    ) -> None:
+        """
+        Durably record ``scored`` (one entry per position); one transaction.
+        """
+        if not len(positions):
+            return
+
+        messages = scored.messages or [None] * len(scored)
+        metadata = scored.metadata or [None] * len(scored)
+        rows = [
+            (
+                model,
+                metric,
+                int(position),
+                None if row_id is None else str(row_id),
+                float(score),
+                int(error),
+                message,
+                json.dumps(meta, default=str) if meta else None,
+            )
+            for position, row_id, score, error, message, meta in zip(
+                positions,
+                ids,
+                scored.scores.tolist(),
+                scored.errors.tolist(),
+                messages,
+                metadata,
+            )
+        ]
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rows "
+                    "(model, metric, position, row_id, score, error, message, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self.written += len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": str(self.path), "resumed": self.resumed, "written": self.written}
+
+
+# =========================
+# Per-unit view
+# =========================
+
+
+@dataclass
+class ResumePlan:
+    """
+    Rows of a chunk taken from the checkpoint, and the ones left to score.
+    """
+
+    done: ScoredChunk
+    dirty: np.ndarray
+    positions: List[int]
+    ids: List[Any]
+
+
+class CheckpointedRows:
+    """
+    Per-(model, metric) view of a RunCheckpoint, used by the chunk scheduler.
+    """
+
+    def __init__(self, checkpoint: RunCheckpoint, model: str, metric: str, resume: bool) -> None:
+        self.checkpoint = checkpoint
+        self.model = model
+        self.metric = metric
+        self.resume = resume
+
+    def plan(self, batch: ColumnBatch) -> ResumePlan:
+        n = len(batch)
+        positions = list(batch.positions)
+        done = ScoredChunk.cached(np.zeros(n))
+
+        completed: Dict[int, tuple] = {}
+        if self.resume and positions:
+            completed = self.checkpoint.completed(self.model, self.metric, positions)
+
+        dirty = []
+        for i, position in enumerate(positions or range(n)):
+            found = completed.get(position)
+            if found is None:
+                dirty.append(i)
+                continue
+            done.scores[i], metadata = found
+            if metadata:
+                done.metadata = done.metadata or [None] * n
+                done.metadata[i] = metadata
+
+        return ResumePlan(
+            done=done,
+            dirty=np.asarray(dirty, dtype=np.intp),
+            positions=positions,
+            ids=list(batch.ids),
+        )
+
+    def merge(self, plan: ResumePlan, fresh: Optional[ScoredChunk]) -> ScoredChunk:
+        """
+        Checkpointed rows with the freshly scored dirty rows filled in;
+        the fresh rows are appended to the checkpoint first.
+        """
+        if fresh is None or not len(plan.dirty):
+            return plan.done
+
+        # Chunks without dataset positions cannot be matched on resume
+        if plan.positions:
+            self.checkpoint.append(
+                self.model,
+                self.metric,
+                [plan.positions[i] for i in plan.dirty],
+                [plan.ids[i] for i in plan.dirty],
+                fresh,
+            )
+        return plan.done.fill(plan.dirty, fresh)
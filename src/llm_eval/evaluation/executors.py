@@ -0,0 +1,119 @@
+"""
+Chunk scoring shared by all executor strategies.
+
+- thread: chunks run on a thread pool inside the runner process
+- process: chunks are shipped to worker processes; each worker builds a
+  metric once and reuses it for every chunk it receives
+- inline: chunks run sequentially in the calling thread
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+from multiprocessing.context import BaseContext
+from multiprocessing.util import Finalize
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.evaluation.results import ErrorCode, ScoredChunk
+from llm_eval.metrics.base import BaseMetric, MetricResult, add_corpus_states
+from llm_eval.metrics.registry import MetricRegistry
+
+EXECUTOR_STRATEGIES = ("thread", "process", "inline")
+
+
+Row = Tuple[float, int, Optional[str], Optional[Dict[str, Any]]]
+
+
+def _score_row(
+    metric: BaseMetric,
+    example: Dict[str, Any],
+    prediction: Dict[str, Any],
+) -> Row:
+    try:
+        result = metric.compute(example=example, prediction=prediction)
+    except Exception as exc:
+        return 0.0, ErrorCode.EXCEPTION, str(exc), None
+    return _row(result)
+
+
+def _row(result: MetricResult) -> Row:
+    code = ErrorCode.OK if result.error is None else ErrorCode.METRIC_ERROR
+    return float(result.score), code, result.error, result.metadata or None
+
+
+def score_columns(metric: BaseMetric, batch: ColumnBatch) -> ScoredChunk:
+    try:
+        results = metric.compute_columns(batch)
+        if len(results) != len(batch):
+            raise ValueError("compute_columns returned wrong number of results")
+        return ScoredChunk.from_rows([_row(result) for result in results])
+    except Exception:
+        # A broken batch must not zero out its healthy neighbours
+        return ScoredChunk.from_rows(
+            [
+                _score_row(metric, example, prediction)
+                for example, prediction in zip(batch.examples(), batch.predictions())
+            ]
+        )
+
+
+def worker_context() -> BaseContext:
+    """
+    Start method for process-pool workers; never ``fork``.
+
+    The pool is created lazily while runner threads and the provider
+    event loop thread are live. A forked child would inherit the locks
+    they hold (e.g. EmbeddingModelPool's) but none of the threads, and
+    deadlock or hang on its first judge call. Forkserver workers fork
+    from a clean, single-threaded server that has imported the metrics
+    once; spawn is the fallback where forkserver is unavailable.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["llm_eval.metrics"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+# Per-process metric instances, keyed by (name, params)
+_WORKER_METRICS: Dict[str, BaseMetric] = {}
+
+
+def _worker_metric(name: str, params: Dict[str, Any]) -> BaseMetric:
+    key = json.dumps([name, params], sort_keys=True, default=str)
+
+    metric = _WORKER_METRICS.get(key)
+    if metric is None:
+        # Spawned workers start with an empty registry
+        import llm_eval.metrics  # noqa: F401
+
+        metric = MetricRegistry.create(name, **params)
+        _WORKER_METRICS[key] = metric
+        # Pool workers exit through multiprocessing's finalizers, not atexit
+        Finalize(metric, metric.close, exitpriority=0)
+
+    return metric
+
+
+def score_chunk_in_worker(
+    name: str,
+    params: Dict[str, Any],
+    batch: ColumnBatch,
+) -> ScoredChunk:
+    """
+    Process-pool entry point: score a chunk, return compact float32 scores
+    and the corpus state the chunk added to the worker's metric.
+    """
+    metric = _worker_metric(name, params)
+    # The worker's metric serves every model; only this chunk's share goes back
+    before = metric.corpus_state()
+    scored = score_columns(metric, batch)
+    after = metric.corpus_state()
+    if after:
+        scored.corpus = add_corpus_states(after, before, sign=-1) if before else after
+    scored.scores = scored.scores.astype(np.float32)
+    return scored
@@ -0,0 +1,207 @@
+"""
+Incremental re-evaluation.
+
+Every scored row is stored under a fingerprint of everything that can
+change its score:
+
+    (row content, prediction, metric name, metric params, metric version)
+
+Row content is what metrics read (id, query, expected_answer,
+retrieved_contexts). On the next run, rows whose fingerprint is known
+reuse the stored score; only dirty rows are sent to the metric.
+Aggregates are then computed over the merged scores as usual.
+
+Scores live in ``<output_dir>/score_cache.sqlite``. Rows that failed
+(``MetricResult.error``) are never stored, so they are retried; reused
+rows come back without metadata.
+Bump ``BaseMetric.version`` when a metric's scoring logic changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.evaluation.results import ScoredChunk
+
+SCORE_CACHE_FILE = "score_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    key         BLOB PRIMARY KEY,
+    score       REAL NOT NULL,
+    metric      TEXT NOT NULL,
+    created_at  REAL NOT NULL
+);
+"""
+
+_DIGEST_SIZE = 16
+
+
+def metric_fingerprint(name: str, params: Dict[str, Any], version: str) -> bytes:
+    """
+    Digest of a metric's identity: name, params and scoring version.
+    """
+    identity = json.dumps([name, params, str(version)], sort_keys=True, default=str)
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=_DIGEST_SIZE).digest()
+
+
+def row_fingerprints(batch: ColumnBatch, salt: bytes = b"") -> List[bytes]:
+    """
+    One digest per row of ``batch`` over its content and answer.
+    """
+    keys: List[bytes] = []
+    for row in zip(
+        batch.ids,
+        batch.query,
+        batch.expected_answer,
+        batch.retrieved_contexts,
+        batch.answer,
+    ):
+        payload = json.dumps(row, ensure_ascii=False, separators=(",", ":"), default=str)
+        digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=_DIGEST_SIZE, key=salt)
+        keys.append(digest.digest())
+    return keys
+
+
+class ScoreStore:
+    """
+    SQLite-backed per-row score cache shared by all metrics of a run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[float]]:
+        """
+        Stored scores for ``keys``; None where unknown.
+        """
+        if not keys:
+            return []
+
+        with self._lock:
+            found: Dict[bytes, float] = {}
+            unique = list(dict.fromkeys(keys))
+
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, score FROM scores WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                found.update((bytes(key), float(score)) for key, score in rows)
+
+            results = [found.get(key) for key in keys]
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+            return results
+
+    def put_many(self, keys: Sequence[bytes], scores: Sequence[float], metric: str) -> None:
+        if not keys:
+            return
+
+        with self._lock:
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scores (key, score, metric, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, float(score), metric, now) for key, score in zip(keys, scores)],
+            )
+            self._conn.commit()
+            self.writes += len(keys)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "reused": self.hits,
+            "rescored": self.misses,
+            "writes": self.writes,
+            "reuse_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@dataclass
+class ChunkPlan:
+    """
+    Which rows of a chunk are cached and which must be scored.
+    """
+
+    metric: str
+    keys: List[bytes]
+    scores: np.ndarray
+    dirty: np.ndarray
+
+    def merge(self, store: ScoreStore, fresh: Optional[ScoredChunk]) -> ScoredChunk:
+        """
+        Cached scores with the freshly scored dirty rows filled in; the
+        fresh rows that did not fail are stored for the next run.
+        """
+        merged = ScoredChunk.cached(self.scores.copy())
+        if fresh is not None and len(self.dirty):
+            merged.fill(self.dirty, fresh)
+            ok = ~fresh.failed
+            store.put_many(
+                [self.keys[i] for i in self.dirty[ok]],
+                np.asarray(fresh.scores)[ok],
+                self.metric,
+            )
+        return merged
+
+
+class IncrementalScores:
+    """
+    Per-metric view of a ScoreStore, used by the chunk scheduler.
+    """
+
+    def __init__(
+        self,
+        store: ScoreStore,
+        metric_name: str,
+        params: Dict[str, Any],
+        version: str,
+    ) -> None:
+        self.store = store
+        self.metric_name = metric_name
+        self._salt = metric_fingerprint(metric_name, params, version)
+
+    def plan(self, batch: ColumnBatch) -> ChunkPlan:
+        keys = row_fingerprints(batch, salt=self._salt)
+        cached = self.store.get_many(keys)
+
+        dirty = np.fromiter(
+            (i for i, score in enumerate(cached) if score is None), dtype=np.intp
+        )
+        scores = np.asarray(
+            [0.0 if score is None else score for score in cached], dtype=float
+        )
+        return ChunkPlan(metric=self.metric_name, keys=keys, scores=scores, dirty=dirty)
+
+    def merge(self, plan: ChunkPlan, fresh: Optional[ScoredChunk]) -> ScoredChunk:
+        return plan.merge(self.store, fresh)
@@ -0,0 +1,214 @@
+"""
+Merging of sharded runs.
+
+``llm-eval run --shard i/N`` evaluates the rows whose id hashes to shard
+``i`` and writes, next to its partial aggregates, the per-row result
+table (``results.npz``) and the mergeable Aggregator state
+(``aggregate_state.json``). ``merge_shards`` checks that the shard
+directories form a complete set and combines them into the outputs a
+single unsharded run would have written: aggregates.json, raw scores,
+results.npz and a run summary.
+
+Aggregates are merged from the Aggregator states, not from the scores:
+count, min, max, median/percentiles and histograms are identical to a
+single run; mean and std agree up to float rounding. Corpus-level metric
+stats (e.g. corpus BLEU) are recomputed from the summed corpus states of
+the shards, as long as every shard scored all of its rows itself.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from llm_eval.data.predictions import REPORT_SAMPLE
+from llm_eval.data.sharding import Shard
+from llm_eval.evaluation.aggregator import (
+    AGGREGATE_STATE_FILE,
+    Aggregator,
+    save_aggregate_state,
+)
+from llm_eval.evaluation.results import RESULTS_FILE, ResultTable, write_raw_scores
+from llm_eval.metrics.base import add_corpus_states
+from llm_eval.metrics.registry import MetricRegistry
+
+
+class MergeError(ValueError):
+    """Raised when shard outputs cannot be merged."""
+
+
+def _load_shard(path: Path) -> Tuple[Shard, Dict[str, Any]]:
+    state_path = path / AGGREGATE_STATE_FILE
+    if not state_path.exists() or not (path / RESULTS_FILE).exists():
+        raise MergeError(
+            f"{path} is not a run output directory "
+            f"({AGGREGATE_STATE_FILE} or {RESULTS_FILE} missing)"
+        )
+    with open(state_path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    return Shard.parse(state["shard"]), state
+
+
+def _check_complete(shards: Sequence[Tuple[Shard, Path]]) -> None:
+    counts = sorted({shard.count for shard, _ in shards})
+    if len(counts) > 1:
+        raise MergeError(f"Shards come from runs with different shard counts: {counts}")
+
+    (count,) = counts
+    seen: Dict[int, Path] = {}
+    for shard, path in shards:
+        if shard.index in seen:
+            raise MergeError(f"Shard {shard} given twice: {seen[shard.index]} and {path}")
+        seen[shard.index] = path
+
+    missing = sorted(set(range(count)) - set(seen))
+    if missing:
+        raise MergeError(f"Missing shards: {[str(Shard(i, count)) for i in missing]}")
+
+
+def _merge_reports(reports: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for report in reports:
+        for key, value in report.items():
+            if isinstance(value, list):
+                merged[key] = (merged.get(key, []) + value)[:REPORT_SAMPLE]
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _merge_corpus(
+    states: Sequence[Dict[str, Any]],
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Sum the per-(model, metric) corpus states of the shards.
+
+    A state missing from some shard is dropped: it cannot cover every row.
+    """
+    merged: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    seen: Dict[Tuple[str, str], int] = {}
+    for state in states:
+        for model, metrics in state.get("corpus", {}).items():
+            for metric, entry in metrics.items():
+                seen[model, metric] = seen.get((model, metric), 0) + 1
+                current = merged.setdefault(model, {}).get(metric)
+                merged[model][metric] = entry if current is None else {
+                    "state": add_corpus_states(current["state"], entry["state"]),
+                    "reused_rows": current["reused_rows"] + entry["reused_rows"],
+                }
+
+    for (model, metric), count in seen.items():
+        if count < len(states):
+            del merged[model][metric]
+    return {model: metrics for model, metrics in merged.items() if metrics}
+
+
+def _corpus_stats(corpus: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    stats: Dict[str, Dict[str, Any]] = {}
+    for model, metrics in corpus.items():
+        for metric, entry in metrics.items():
+            if entry["reused_rows"]:
+                # Same rule as a single run: a partial state gives no corpus stats
+                stats.setdefault(model, {})[metric] = {
+                    "corpus_skipped": {"reused_rows": entry["reused_rows"]}
+                }
+                continue
+            try:
+                metric_cls = MetricRegistry.get(metric)
+            except KeyError as exc:
+                raise MergeError(f"Cannot merge corpus stats: {exc}") from exc
+            stats.setdefault(model, {})[metric] = metric_cls.corpus_stats(entry["state"])
+    return stats
+
+
+def merge_shards(
+    shard_dirs: Sequence[Path],
+    output_dir: Path,
+    raw_scores_json: bool = False,
+) -> Dict[str, Any]:
+    """
+    Combine the output directories of a complete set of shards.
+
+    :return: The merged aggregates (as written to aggregates.json)
+    """
+    if not shard_dirs:
+        raise MergeError("No shard directories given")
+
+    loaded = [(*_load_shard(Path(path)), Path(path)) for path in shard_dirs]
+    _check_complete([(shard, path) for shard, _, path in loaded])
+    loaded.sort(key=lambda item: item[0].index)
+
+    # Fold shards in index order so the result does not depend on argument order
+    aggregators: Dict[str, Dict[str, Aggregator]] = {}
+    for _, state, _ in loaded:
+        for model, metrics in state["aggregates"].items():
+            for metric, metric_state in metrics.items():
+                partial = Aggregator.from_dict(metric_state)
+                merged = aggregators.setdefault(model, {}).get(metric)
+                if merged is None:
+                    aggregators[model][metric] = partial
+                else:
+                    merged.merge(partial)
+
+    final_results = {
+        model: {metric: agg.summary() for metric, agg in metrics.items()}
+        for model, metrics in aggregators.items()
+    }
+
+    try:
+        table = ResultTable.concat(
+            [ResultTable.load(path / RESULTS_FILE) for _, _, path in loaded]
+        )
+    except ValueError as exc:
+        raise MergeError(f"Shards overlap: {exc}") from exc
+
+    corpus = _merge_corpus([state for _, state, _ in loaded])
+
+    summaries: List[Dict[str, Any]] = []
+    shard_metrics: Dict[str, Any] = {}
+    for shard, _, path in loaded:
+        summary_path = path / "run_summary.json"
+        if summary_path.exists():
+            with open(summary_path, "r", encoding="utf-8") as f:
+                summaries.append(json.load(f))
+            # Runtime counters (cache hits, ...) are per process and do not add up
+            if summaries[-1].get("metrics"):
+                shard_metrics[str(shard)] = summaries[-1]["metrics"]
+
+    models = list(final_results)
+    summary = {
+        "merged_from": [str(path) for _, _, path in loaded],
+        "shards": len(loaded),
+        "metrics": _corpus_stats(corpus),
+        "shard_metrics": shard_metrics,
+        "predictions": {
+            model: _merge_reports(
+                [s["predictions"][model] for s in summaries if model in s.get("predictions", {})]
+            )
+            for model in models
+        },
+    }
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    write_raw_scores(
+        output_dir,
+        {
+            model: {metric: table.scores(model, metric) for metric in metrics}
+            for model, metrics in final_results.items()
+        },
+        json_export=raw_scores_json,
+    )
+
+    with open(output_dir / "aggregates.json", "w", encoding="utf-8") as f:
+        json.dump(final_results, f, indent=2)
+
+    save_aggregate_state(output_dir / AGGREGATE_STATE_FILE, aggregators, corpus=corpus)
+
+    table.save(output_dir / RESULTS_FILE)
+
+    with open(output_dir / "run_summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    return final_results
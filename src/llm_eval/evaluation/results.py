@@ -0,0 +1,508 @@
+"""
+Per-row evaluation results.
+
+``ScoredChunk`` is what executors return for one chunk: scores and
+error codes as typed arrays, plus error messages and metadata only
+when a metric produced any.
+
+``ResultTable`` is the run-level table: one row per (model, metric,
+dataset row), ordered by model and metric (config order) and then by
+dataset position. Columns are contiguous numpy arrays; strings (model
+and metric names, row ids, error messages) are stored once and
+referenced by integer codes. The order does not depend on scheduling,
+so two runs over the same inputs give identical tables that can be
+joined or diffed position by position.
+
+Raw scores (what the visualizations read) are stored separately as one
+float32 array per (model, metric) in an uncompressed ``.npz``;
+``load_raw_scores`` memory-maps the arrays instead of reading them.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zipfile
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RESULTS_FILE = "results.npz"
+RAW_SCORES_FILE = "raw_scores.npz"
+RAW_SCORES_JSON = "raw_scores.json"
+
+
+class ErrorCode(IntEnum):
+    OK = 0
+    #: The metric returned ``MetricResult.error``
+    METRIC_ERROR = 1
+    #: The metric raised
+    EXCEPTION = 2
+
+
+# =========================
+# Chunk results
+# =========================
+
+
+@dataclass
+class ScoredChunk:
+    """
+    Results of one chunk, aligned with its rows.
+
+    ``positions`` and ``ids`` are filled in by the scheduler; ``corpus``
+    is the metric's corpus state for the rows a worker process scored.
+    """
+
+    scores: np.ndarray
+    errors: np.ndarray
+    messages: Optional[List[Optional[str]]] = None
+    metadata: Optional[List[Optional[Dict[str, Any]]]] = None
+    positions: Optional[np.ndarray] = None
+    ids: Optional[List[Any]] = None
+    corpus: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def failed(self) -> np.ndarray:
+        return self.errors != ErrorCode.OK
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Tuple[float, int, Optional[str], Optional[Dict[str, Any]]]],
+    ) -> "ScoredChunk":
+        """
+        Build from (score, error code, message, metadata) tuples.
+        """
+        n = len(rows)
+        messages = [row[2] for row in rows]
+        metadata = [row[3] or None for row in rows]
+        return cls(
+            scores=np.fromiter((row[0] for row in rows), dtype=float, count=n),
+            errors=np.fromiter((row[1] for row in rows), dtype=np.int8, count=n),
+            messages=messages if any(m is not None for m in messages) else None,
+            metadata=metadata if any(m is not None for m in metadata) else None,
+        )
+
+    @classmethod
+    def cached(cls, scores: np.ndarray) -> "ScoredChunk":
+        return cls(scores=np.asarray(scores, dtype=float), errors=np.zeros(len(scores), np.int8))
+
+    def fill(self, at: np.ndarray, other: "ScoredChunk") -> "ScoredChunk":
+        """
+        Write ``other`` (one entry per index in ``at``) into this chunk.
+        """
+        self.scores[at] = other.scores
+        self.errors[at] = other.errors
+        if other.messages is not None:
+            self.messages = self.messages or [None] * len(self)
+            for i, message in zip(at, other.messages):
+                self.messages[i] = message
+        if other.metadata is not None:
+            self.metadata = self.metadata or [None] * len(self)
+            for i, metadata in zip(at, other.metadata):
+                self.metadata[i] = metadata
+        return self
+
+
+# =========================
+# Run-level table
+# =========================
+
+_COLUMN_DTYPES = {
+    "row": np.int64,
+    "model": np.int16,
+    "metric": np.int16,
+    "score": np.float64,
+    "error": np.int8,
+    "error_message": np.int32,
+}
+
+
+def _concat_columns(columns: Dict[str, List[np.ndarray]]) -> Dict[str, np.ndarray]:
+    return {
+        name: np.concatenate(parts) if parts else np.zeros(0, dtype=_COLUMN_DTYPES[name])
+        for name, parts in columns.items()
+    }
+
+
+@dataclass
+class ResultTable:
+    """
+    Columnar per-row results of a run.
+    """
+
+    models: List[str]
+    metrics: List[str]
+    row_ids: List[Optional[str]]
+    row: np.ndarray
+    model: np.ndarray
+    metric: np.ndarray
+    score: np.ndarray
+    error: np.ndarray
+    error_message: np.ndarray
+    error_messages: List[str] = field(default_factory=list)
+    metadata: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.row)
+
+    @classmethod
+    def from_blocks(
+        cls,
+        blocks: Iterable[Tuple[str, str, Sequence[ScoredChunk]]],
+    ) -> "ResultTable":
+        """
+        Build from (model, metric, chunks in dataset order) blocks, taken
+        in the order given (the runner passes config order).
+        """
+        models: List[str] = []
+        metrics: List[str] = []
+        row_ids: Dict[int, Optional[str]] = {}
+        messages: Dict[str, int] = {}
+        metadata: Dict[int, Dict[str, Any]] = {}
+        columns: Dict[str, List[np.ndarray]] = {name: [] for name in _COLUMN_DTYPES}
+
+        offset = 0
+        for model_name, metric_name, chunks in blocks:
+            if model_name not in models:
+                models.append(model_name)
+            if metric_name not in metrics:
+                metrics.append(metric_name)
+            model_code = models.index(model_name)
+            metric_code = metrics.index(metric_name)
+
+            for chunk in chunks:
+                n = len(chunk)
+                positions = (
+                    np.asarray(chunk.positions, dtype=np.int64)
+                    if chunk.positions is not None
+                    else np.arange(offset, offset + n, dtype=np.int64)
+                )
+                if chunk.ids is not None:
+                    for position, row_id in zip(positions.tolist(), chunk.ids):
+                        row_ids.setdefault(position, None if row_id is None else str(row_id))
+
+                message_codes = np.full(n, -1, dtype=np.int32)
+                if chunk.messages is not None:
+                    for i, message in enumerate(chunk.messages):
+                        if message is not None:
+                            message_codes[i] = messages.setdefault(message, len(messages))
+
+                if chunk.metadata is not None:
+                    for i, row_metadata in enumerate(chunk.metadata):
+                        if row_metadata:
+                            metadata[offset + i] = row_metadata
+
+                columns["row"].append(positions)
+                columns["model"].append(np.full(n, model_code, dtype=np.int16))
+                columns["metric"].append(np.full(n, metric_code, dtype=np.int16))
+                columns["score"].append(np.asarray(chunk.scores, dtype=np.float64))
+                columns["error"].append(np.asarray(chunk.errors, dtype=np.int8))
+                columns["error_message"].append(message_codes)
+                offset += n
+
+        arrays = _concat_columns(columns)
+
+        size = max(row_ids) + 1 if row_ids else 0
+        return cls(
+            models=models,
+            metrics=metrics,
+            row_ids=[row_ids.get(position) for position in range(size)],
+            error_messages=list(messages),
+            metadata=metadata,
+            **arrays,
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence["ResultTable"]) -> "ResultTable":
+        """
+        Combine tables over disjoint rows (e.g. shards) into the table a
+        single run would have produced: sorted by model, metric (order of
+        first appearance) and dataset position.
+
+        Raises ValueError if a (model, metric, row) appears twice.
+        """
+        models: List[str] = []
+        metrics: List[str] = []
+        row_ids: Dict[int, Optional[str]] = {}
+        messages: Dict[str, int] = {}
+        metadata: Dict[int, Dict[str, Any]] = {}
+        columns: Dict[str, List[np.ndarray]] = {name: [] for name in _COLUMN_DTYPES}
+
+        offset = 0
+        for table in tables:
+            for name in table.models:
+                if name not in models:
+                    models.append(name)
+            for name in table.metrics:
+                if name not in metrics:
+                    metrics.append(name)
+            model_codes = np.asarray([models.index(m) for m in table.models], dtype=np.int16)
+            metric_codes = np.asarray([metrics.index(m) for m in table.metrics], dtype=np.int16)
+            message_codes = np.asarray(
+                [messages.setdefault(m, len(messages)) for m in table.error_messages] + [-1],
+                dtype=np.int32,
+            )
+
+            for position, row_id in enumerate(table.row_ids):
+                if row_id is not None:
+                    row_ids.setdefault(position, row_id)
+            for i, row_metadata in table.metadata.items():
+                metadata[offset + int(i)] = row_metadata
+
+            columns["row"].append(np.asarray(table.row, dtype=np.int64))
+            columns["model"].append(model_codes[table.model])
+            columns["metric"].append(metric_codes[table.metric])
+            columns["score"].append(np.asarray(table.score, dtype=np.float64))
+            columns["error"].append(np.asarray(table.error, dtype=np.int8))
+            # -1 (no message) indexes the trailing -1
+            columns["error_message"].append(message_codes[table.error_message])
+            offset += len(table)
+
+        arrays = _concat_columns(columns)
+        order = np.lexsort((arrays["row"], arrays["metric"], arrays["model"]))
+        arrays = {name: values[order] for name, values in arrays.items()}
+
+        same = (
+            (np.diff(arrays["row"]) == 0)
+            & (np.diff(arrays["metric"]) == 0)
+            & (np.diff(arrays["model"]) == 0)
+        )
+        if same.any():
+            i = int(np.flatnonzero(same)[0])
+            raise ValueError(
+                f"Row {int(arrays['row'][i])} of {models[arrays['model'][i]]}/"
+                f"{metrics[arrays['metric'][i]]} appears in more than one table"
+            )
+
+        new_index = np.empty(len(order), dtype=np.int64)
+        new_index[order] = np.arange(len(order))
+
+        size = max(row_ids) + 1 if row_ids else 0
+        return cls(
+            models=models,
+            metrics=metrics,
+            row_ids=[row_ids.get(position) for position in range(size)],
+            error_messages=list(messages),
+            metadata={int(new_index[i]): value for i, value in sorted(metadata.items())},
+            **arrays,
+        )
+
+    def mask(self, model: Optional[str] = None, metric: Optional[str] = None) -> np.ndarray:
+        """
+        Rows of ``model`` and/or ``metric``; names not in the table select nothing.
+        """
+        selected = np.ones(len(self), dtype=bool)
+        for names, codes, name in (
+            (self.models, self.model, model),
+            (self.metrics, self.metric, metric),
+        ):
+            if name is not None:
+                selected &= codes == (names.index(name) if name in names else -1)
+        return selected
+
+    def scores(self, model: str, metric: str) -> np.ndarray:
+        """
+        Scores of one (model, metric) pair, in dataset order.
+        """
+        return self.score[self.mask(model, metric)]
+
+    def records(self, selected: Optional[np.ndarray] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Rows as dicts, for drill-down and reports (not for bulk work).
+        """
+        indices = np.flatnonzero(selected) if selected is not None else range(len(self))
+        for i in indices:
+            i = int(i)
+            code = int(self.error_message[i])
+            yield {
+                "row": int(self.row[i]),
+                "id": self.row_ids[int(self.row[i])],
+                "model": self.models[int(self.model[i])],
+                "metric": self.metrics[int(self.metric[i])],
+                "score": float(self.score[i]),
+                "error": ErrorCode(int(self.error[i])).name.lower(),
+                "error_message": self.error_messages[code] if code >= 0 else None,
+                "metadata": self.metadata.get(i),
+            }
+
+    def save(self, path: Path) -> None:
+        """
+        Write the table as an uncompressed ``.npz`` (no pickled objects).
+        """
+        metadata_rows = np.asarray(sorted(self.metadata), dtype=np.int64)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                models=np.asarray(self.models, dtype=str),
+                metrics=np.asarray(self.metrics, dtype=str),
+                row_ids=np.asarray([i if i is not None else "" for i in self.row_ids], dtype=str),
+                row_known=np.asarray([i is not None for i in self.row_ids], dtype=bool),
+                row=self.row,
+                model=self.model,
+                metric=self.metric,
+                score=self.score,
+                error=self.error,
+                error_message=self.error_message,
+                error_messages=np.asarray(self.error_messages, dtype=str),
+                metadata_rows=metadata_rows,
+                metadata_json=np.asarray(
+                    [json.dumps(self.metadata[int(i)], default=str) for i in metadata_rows],
+                    dtype=str,
+                ),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "ResultTable":
+        with np.load(path, allow_pickle=False) as data:
+            metadata_rows = data["metadata_rows"].tolist()
+            metadata_json = data["metadata_json"].tolist()
+            return cls(
+                models=data["models"].tolist(),
+                metrics=data["metrics"].tolist(),
+                row_ids=[
+                    row_id if known else None
+                    for row_id, known in zip(data["row_ids"].tolist(), data["row_known"])
+                ],
+                row=data["row"],
+                model=data["model"],
+                metric=data["metric"],
+                score=data["score"],
+                error=data["error"],
+                error_message=data["error_message"],
+                error_messages=data["error_messages"].tolist(),
+                metadata={row: json.loads(raw) for row, raw in zip(metadata_rows, metadata_json)},
+            )
+
+
+# =========================
+# Raw scores
+# =========================
+
+RawScores = Dict[str, Dict[str, np.ndarray]]
+
+# Fixed part of a zip local file header, see the zip APPNOTE (4.3.7)
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def save_raw_scores(path: Path, raw_scores: Dict[str, Dict[str, Sequence[float]]]) -> None:
+    """
+    Write ``{model: {metric: scores}}`` as float32 arrays.
+
+    Array ``s<i>`` holds the scores of pair ``i`` of the ``pairs``
+    (model, metric) array, so names need no escaping.
+    """
+    pairs = [(model, metric) for model, metrics in raw_scores.items() for metric in metrics]
+    arrays = {
+        f"s{i}": np.asarray(raw_scores[model][metric], dtype=np.float32)
+        for i, (model, metric) in enumerate(pairs)
+    }
+    with open(path, "wb") as f:
+        np.savez(f, pairs=np.asarray(pairs, dtype=str).reshape(len(pairs), 2), **arrays)
+
+
+def write_raw_scores(
+    output_dir: Path,
+    raw_scores: Dict[str, Dict[str, np.ndarray]],
+    json_export: bool = False,
+) -> None:
+    """
+    Write raw_scores.npz and, with ``json_export``, raw_scores.json.
+    """
+    save_raw_scores(output_dir / RAW_SCORES_FILE, raw_scores)
+
+    if json_export:
+        with open(output_dir / RAW_SCORES_JSON, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    model: {
+                        metric: np.asarray(scores).tolist() for metric, scores in metrics.items()
+                    }
+                    for model, metrics in raw_scores.items()
+                },
+                f,
+            )
+
+
+def _memmap_member(path: Path, info: zipfile.ZipInfo) -> np.ndarray:
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        header = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+        name_length, extra_length = header[-2:]
+        f.seek(name_length + extra_length, 1)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if not int(np.prod(shape)):
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def load_raw_scores(path: Path, mmap: bool = True) -> RawScores:
+    """
+    Read a raw-scores ``.npz`` as ``{model: {metric: float32 array}}``.
+
+    With ``mmap`` (default), arrays stored uncompressed are memory-mapped
+    read-only; compressed ones are read into memory.
+    """
+    path = Path(path)
+    with np.load(path, allow_pickle=False) as data:
+        pairs = data["pairs"].tolist()
+        members = {}
+        if mmap:
+            with zipfile.ZipFile(path) as zf:
+                members = {
+                    info.filename[: -len(".npy")]: info
+                    for info in zf.infolist()
+                    if info.compress_type == zipfile.ZIP_STORED
+                }
+
+        raw_scores: RawScores = {}
+        for i, (model, metric) in enumerate(pairs):
+            key = f"s{i}"
+            scores = _memmap_member(path, members[key]) if key in members else data[key]
+            raw_scores.setdefault(model, {})[metric] = scores
+        return raw_scores
+
+
+def load_raw_scores_json(path: Path) -> RawScores:
+    with open(path, "r", encoding="utf-8") as f:
+        raw_scores = json.load(f)
+    return {
+        model: {metric: np.asarray(scores, dtype=np.float32) for metric, scores in metrics.items()}
+        for model, metrics in raw_scores.items()
+    }
+
+
+def find_raw_scores(results_dir: Path) -> RawScores:
+    """
+    Raw scores of a results directory: the binary file if present, else
+    the JSON export (older runs).
+    """
+    results_dir = Path(results_dir)
+    if (results_dir / RAW_SCORES_FILE).exists():
+        return load_raw_scores(results_dir / RAW_SCORES_FILE)
+    if (results_dir / RAW_SCORES_JSON).exists():
+        return load_raw_scores_json(results_dir / RAW_SCORES_JSON)
+    raise FileNotFoundError(
+        f"{RAW_SCORES_FILE} not found in {results_dir}. Run evaluation first."
+    )
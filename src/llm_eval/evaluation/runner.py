@@ -1,10 +1,44 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 from pathlib import Path
 import json
+import os
+import time
 
+import numpy as np
+
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.data.sharding import Shard
+from llm_eval.data.predictions import (
+    JoinReport,
+    join_by_id,
+    join_by_position,
+    open_prediction_index,
+)
+from llm_eval.embeddings.cache import EmbeddingStore, activate_store
+from llm_eval.embeddings.disk_store import PersistentEmbeddingStore
+from llm_eval.llm_providers.factory import ProviderFactory
 from llm_eval.metrics.registry import MetricRegistry
-from llm_eval.evaluation.aggregator import Aggregator
+from llm_eval.evaluation.aggregator import (
+    AGGREGATE_STATE_FILE,
+    Aggregator,
+    save_aggregate_state,
+)
+from llm_eval.evaluation.checkpoint import (
+    CHECKPOINT_FILE,
+    MANIFEST_FILE,
+    CheckpointedRows,
+    ResumeError,
+    RunCheckpoint,
+    RunManifest,
+    dataset_fingerprint,
+    file_fingerprint,
+    value_fingerprint,
+)
+from llm_eval.evaluation.incremental import SCORE_CACHE_FILE, IncrementalScores, ScoreStore
+from llm_eval.evaluation.results import RESULTS_FILE, ResultTable, write_raw_scores
+from llm_eval.evaluation.executors import EXECUTOR_STRATEGIES, worker_context
+from llm_eval.evaluation.scheduler import ChunkFanout, ChunkScheduler, WorkUnit
 
 
 class EvaluationRunner:
@@ -14,97 +48,419 @@ class EvaluationRunner:
     Responsibilities:
     - Load model predictions
     - Loop over models and metrics
-    - Align dataset ↔ predictions safely
-    - Parallel execution
-    - Aggregate results
-    - Persist raw scores for visualization
+    - Align dataset ↔ predictions safely: join by id (sharded,
+      out-of-order prediction files; unmatched ids are reported)
+    - Stream the dataset chunk by chunk (any re-iterable works,
+      e.g. a list, a StreamingDataset or a memory-mapped ArrowDataset)
+    - Parallel, chunked execution via BaseMetric.compute_columns
+      (chunks are ColumnBatches: one list per field, not per row)
+      (thread, process or inline executor, globally or per metric)
+    - Interleave chunks of all (model, metric) pairs on one
+      long-lived pool, so slow metrics overlap with fast ones
+    - Aggregate results (streaming Aggregator, one per model/metric,
+      updated as chunks complete in dataset order); the scored chunks
+      are still kept until the run ends, since the per-row result
+      table and the raw scores are built from all of them
+    - Persist raw scores for visualization (float32 arrays in
+      raw_scores.npz; raw_scores.json only on request), plus a per-row result
+      table (row id, model, metric, score, error code, metadata) in
+      deterministic config/dataset order
+    - Share one embedding store across all metrics of a run
+    - Optionally evaluate one shard (rows picked by a stable hash of
+      their id); shard outputs are combined by `llm-eval merge`
+    - Checkpoint per-row results as chunks complete, with a manifest
+      of what is evaluated, so a crashed run can be resumed
+    - Optionally reuse per-row scores of earlier runs (incremental
+      mode): only rows whose inputs, metric params or metric version
+      changed are rescored
     - (Quality gates intentionally disabled for local runs)
     """
 
     def __init__(
         self,
         *,
-        dataset: List[Dict[str, Any]],
+        dataset: Iterable[Dict[str, Any]],
         models: List[Dict[str, Any]],
         metrics,  # List[MetricConfig]
         output_dir: Path,
         max_workers: int = 4,
+        chunk_size: int = 64,
+        embedding_cache=None,  # Optional[EmbeddingCacheConfig]
+        executor: str = "thread",
+        max_processes: Optional[int] = None,
+        incremental: bool = False,
+        raw_scores_json: bool = False,
+        shard: Optional[Shard] = None,
+        checkpoint: bool = True,
+        resume: bool = False,
     ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        if executor not in EXECUTOR_STRATEGIES:
+            raise ValueError(
+                f"Unknown executor '{executor}'. "
+                f"Must be one of {list(EXECUTOR_STRATEGIES)}"
+            )
+
         self.dataset = dataset
         self.models = models
         self.metrics = metrics
         self.output_dir = output_dir
         self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.embedding_cache = embedding_cache
+        self.executor = executor
+        self.max_processes = max_processes
+        self.incremental = incremental
+        self.raw_scores_json = raw_scores_json
+        self.shard = shard
+        self.checkpoint = checkpoint or resume
+        self.resume = resume
 
-    def _load_predictions(self, path: Path) -> List[Dict[str, Any]]:
-        """Load model predictions from JSONL"""
-        predictions: List[Dict[str, Any]] = []
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                predictions.append(json.loads(line))
-        return predictions
+        self._score_store: Optional[ScoreStore] = None
+        self._checkpoint: Optional[RunCheckpoint] = None
+        self.results_table: Optional[ResultTable] = None
+        self.aggregators: Dict[str, Dict[str, Aggregator]] = {}
+        # {model: {metric: {"state": ..., "reused_rows": n}}}, see _metric_stats
+        self.corpus_states: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._indexes: Dict[str, Any] = {}
+        self._units: List[WorkUnit] = []
+        self.join_reports: Dict[str, JoinReport] = {}
 
-    def _evaluate_single(
+    @staticmethod
+    def _prediction_paths(model_cfg: Dict[str, Any]) -> List[Path]:
+        paths = model_cfg["predictions"]
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        return [Path(p) for p in paths]
+
+    def _chunks(
         self,
-        metric,
-        example: Dict[str, Any],
-        prediction: Dict[str, Any],
-    ) -> float:
-        try:
-            result = metric.compute(example=example, prediction=prediction)
-            return float(result.score)
-        except Exception:
-            return 0.0
+        model_cfg: Dict[str, Any],
+        chunk_size: int,
+        report: Optional[JoinReport] = None,
+    ) -> Iterator[ColumnBatch]:
+        """
+        Stream aligned column chunks for one model.
+        """
+        join = getattr(model_cfg.get("join"), "value", model_cfg.get("join")) or "id"
 
-    def run(self) -> Dict[str, Any]:
-        final_results: Dict[str, Any] = {}
-        raw_scores: Dict[str, Dict[str, List[float]]] = {}
+        if join == "position":
+            return join_by_position(
+                self.dataset, self._prediction_paths(model_cfg), chunk_size, report, self.shard
+            )
 
-        for model_cfg in self.models:
-            model_name = model_cfg["name"]
-            predictions = self._load_predictions(model_cfg["predictions"])
+        # SAFETY: align dataset & predictions by id; one index per model
+        index = self._indexes.get(model_cfg["name"])
+        if index is None:
+            index = self._indexes[model_cfg["name"]] = open_prediction_index(
+                self._prediction_paths(model_cfg), self.shard
+            )
+        return join_by_id(self.dataset, index, chunk_size, report, self.shard)
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        # Created once per run: worker start-up and metric set-up are paid once
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_processes,
+                mp_context=worker_context(),
+            )
+        return self._process_pool
+
+    def _shutdown_process_pool(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def _strategy_for(self, metric_cfg) -> str:
+        strategy = getattr(metric_cfg, "executor", None)
+        if strategy is None:
+            return self.executor
+        return getattr(strategy, "value", strategy)
+
+    def _build_embedding_store(self) -> EmbeddingStore:
+        cfg = self.embedding_cache
+        if cfg is None:
+            return EmbeddingStore()
+
+        persistent = PersistentEmbeddingStore(cfg.path) if cfg.path else None
+        return EmbeddingStore(
+            max_bytes=cfg.max_memory_bytes,
+            max_entries=cfg.max_memory_entries,
+            dtype=getattr(cfg.memory_dtype, "value", cfg.memory_dtype),
+            persistent=persistent,
+            persist_predictions=cfg.persist_predictions,
+        )
 
-            final_results[model_name] = {}
-            raw_scores[model_name] = {}
+    def _work_units(self) -> List[WorkUnit]:
+        units: List[WorkUnit] = []
 
-            # SAFETY: align dataset & predictions
-            max_len = min(len(self.dataset), len(predictions))
+        for model_cfg in self.models:
+            model_name = model_cfg["name"]
+            report = self.join_reports[model_name] = JoinReport()
+            # Join dataset and predictions once; every metric reads this stream
+            fanout = ChunkFanout(self._chunks(model_cfg, self.chunk_size, report))
 
             for metric_cfg in self.metrics:
                 metric_cls = MetricRegistry.get(metric_cfg.name)
-                metric = metric_cls(**metric_cfg.params)
-
-                scores: List[float] = []
-
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    futures = [
-                        executor.submit(
-                            self._evaluate_single,
-                            metric,
-                            self.dataset[idx],
-                            {
-                                # normalized prediction format for all metrics
-                                "answer": predictions[idx].get("prediction", "")
-                            },
-                        )
-                        for idx in range(max_len)
-                    ]
-
-                    for future in as_completed(futures):
-                        scores.append(future.result())
-
-                raw_scores[model_name][metric_cfg.name] = scores
-                final_results[model_name][metric_cfg.name] = Aggregator.aggregate(scores)
+                chunk_size = getattr(metric_cfg, "chunk_size", None) or self.chunk_size
+
+                cache = None
+                if self._score_store is not None:
+                    cache = IncrementalScores(
+                        self._score_store,
+                        metric_cfg.name,
+                        metric_cfg.params,
+                        getattr(metric_cls, "version", "1"),
+                    )
+
+                checkpoint = None
+                if self._checkpoint is not None:
+                    checkpoint = CheckpointedRows(
+                        self._checkpoint, model_name, metric_cfg.name, resume=self.resume
+                    )
+
+                units.append(
+                    WorkUnit(
+                        model_name=model_name,
+                        metric_name=metric_cfg.name,
+                        params=metric_cfg.params,
+                        metric=metric_cls(**metric_cfg.params),
+                        strategy=self._strategy_for(metric_cfg),
+                        chunks=fanout.reader(chunk_size),
+                        cache=cache,
+                        checkpoint=checkpoint,
+                    )
+                )
+
+        return units
+
+    def _max_in_flight(self) -> int:
+        # Enough queued chunks to keep every worker busy, but bounded so
+        # chunk payloads are materialized lazily
+        workers = max(self.max_workers, self.max_processes or os.cpu_count() or 1)
+        return 4 * workers
+
+    def _run_models(
+        self,
+        final_results: Dict[str, Any],
+        raw_scores: Dict[str, Dict[str, np.ndarray]],
+        metric_stats: Dict[str, Dict[str, Any]],
+    ) -> None:
+        units = self._units = self._work_units()
+        self.aggregators = {}
+        self.corpus_states = {}
+
+        # Keep output key order stable (config order), whatever finishes first
+        for unit in units:
+            final_results.setdefault(unit.model_name, {})[unit.metric_name] = None
+            raw_scores.setdefault(unit.model_name, {})[unit.metric_name] = np.zeros(0)
+            self.aggregators.setdefault(unit.model_name, {})[unit.metric_name] = Aggregator()
+
+        def fold(unit: WorkUnit) -> None:
+            # Chunks are folded as soon as every chunk before them is done:
+            # dataset order keeps summaries reproducible
+            aggregator = self.aggregators[unit.model_name][unit.metric_name]
+            for chunk in unit.completed_in_order():
+                aggregator.update(chunk.scores)
+
+        def finish(unit: WorkUnit) -> None:
+            fold(unit)
+            aggregator = self.aggregators[unit.model_name][unit.metric_name]
+            chunks = unit.chunks_in_order()
+
+            final_results[unit.model_name][unit.metric_name] = aggregator.summary()
+            raw_scores[unit.model_name][unit.metric_name] = (
+                np.concatenate([chunk.scores for chunk in chunks]) if chunks else np.zeros(0)
+            )
+
+            stats = self._metric_stats(unit)
+            if stats:
+                metric_stats.setdefault(unit.model_name, {})[unit.metric_name] = stats
+
+        # One pool for the whole run, shared by every (model, metric) pair
+        with ThreadPoolExecutor(max_workers=self.max_workers) as thread_pool:
+            scheduler = ChunkScheduler(
+                thread_pool=thread_pool,
+                process_pool=self._get_process_pool,
+                max_in_flight=self._max_in_flight(),
+            )
+            with activate_store(self.embedding_store):
+                scheduler.run(units, on_unit_done=finish, on_chunk_done=fold)
+
+        self.results_table = ResultTable.from_blocks(
+            (unit.model_name, unit.metric_name, unit.chunks_in_order()) for unit in units
+        )
+
+    def _metric_stats(self, unit: WorkUnit) -> Dict[str, Any]:
+        """
+        Runtime stats of a unit's metric, plus its corpus-level stats if
+        the metric scored every row itself. With rows reused from the
+        score cache or checkpoint the corpus state is partial, so the
+        corpus stats are left out and the reason recorded instead.
+
+        The corpus state is kept in ``corpus_states`` for the shard state
+        that ``llm-eval merge`` sums.
+        """
+        if unit.strategy == "process":
+            # Workers keep their own metric instances (and runtime stats);
+            # their corpus state came back with each chunk
+            stats: Dict[str, Any] = {}
+            state = unit.corpus
+        else:
+            stats = dict(unit.metric.stats())
+            state = unit.metric.corpus_state()
+        if not state:
+            return stats
+
+        self.corpus_states.setdefault(unit.model_name, {})[unit.metric_name] = {
+            "state": state,
+            "reused_rows": unit.reused,
+        }
+        if unit.reused:
+            stats["corpus_skipped"] = {"reused_rows": unit.reused}
+        else:
+            stats.update(type(unit.metric).corpus_stats(state))
+        return stats
+
+    def _fingerprints(self) -> Dict[str, Any]:
+        """
+        What the run evaluates; a resumed run must match it exactly.
+        """
+        config = {
+            "models": [
+                {
+                    "name": model_cfg["name"],
+                    "predictions": [str(p) for p in self._prediction_paths(model_cfg)],
+                    "join": str(getattr(model_cfg.get("join"), "value", model_cfg.get("join"))),
+                }
+                for model_cfg in self.models
+            ],
+            "metrics": [
+                {
+                    "name": metric_cfg.name,
+                    "params": metric_cfg.params,
+                    "version": str(getattr(MetricRegistry.get(metric_cfg.name), "version", "1")),
+                }
+                for metric_cfg in self.metrics
+            ],
+            "shard": str(self.shard or Shard(0, 1)),
+        }
+        return {
+            "config": value_fingerprint(config),
+            "dataset": dataset_fingerprint(self.dataset),
+            "predictions": {
+                model_cfg["name"]: value_fingerprint(
+                    [file_fingerprint(p) for p in self._prediction_paths(model_cfg)]
+                )
+                for model_cfg in self.models
+            },
+        }
+
+    def _open_checkpoint(self) -> RunManifest:
+        """
+        Check (on resume) or write the manifest and open the checkpoint.
+
+        Without resume, any earlier checkpoint in the output directory
+        is discarded.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.output_dir / MANIFEST_FILE
+        checkpoint_path = self.output_dir / CHECKPOINT_FILE
+        manifest = RunManifest(fingerprints=self._fingerprints(), created_at=time.time())
+
+        if self.resume and manifest_path.exists():
+            previous = RunManifest.load(manifest_path)
+            changed = manifest.changes(previous)
+            if changed:
+                raise ResumeError(
+                    f"Cannot resume {self.output_dir}: {', '.join(changed)} changed "
+                    "since the checkpointed run. Rerun without --resume to start over."
+                )
+            manifest.created_at = previous.created_at
+        elif not self.resume:
+            RunCheckpoint.remove(checkpoint_path)
+
+        manifest.save(manifest_path)
+        self._checkpoint = RunCheckpoint(checkpoint_path)
+        return manifest
+
+    def run(self) -> Dict[str, Any]:
+        final_results: Dict[str, Any] = {}
+        raw_scores: Dict[str, Dict[str, np.ndarray]] = {}
+        metric_stats: Dict[str, Dict[str, Any]] = {}
+
+        # One embedding store per run, shared by every embedding metric
+        self.embedding_store = self._build_embedding_store()
+
+        manifest = None
+        if self.checkpoint:
+            manifest = self._open_checkpoint()
+
+        if self.incremental:
+            self._score_store = ScoreStore(self.output_dir / SCORE_CACHE_FILE)
+
+        try:
+            self._run_models(final_results, raw_scores, metric_stats)
+        finally:
+            self._shutdown_process_pool()
+            # Provider clients (and their keep-alive pools) live for one run
+            ProviderFactory.clear()
+            for index in self._indexes.values():
+                index.close()
+            self._indexes.clear()
+            for unit in self._units:
+                unit.metric.close()
+            self._units = []
+            if self._score_store is not None:
+                self._score_store.close()
+            if self._checkpoint is not None:
+                self._checkpoint.close()
+
+        self.summary: Dict[str, Any] = {
+            "embedding_cache": self.embedding_store.stats(),
+            "metrics": metric_stats,
+            "predictions": {
+                model_name: report.to_dict()
+                for model_name, report in self.join_reports.items()
+            },
+        }
+        if self._score_store is not None:
+            self.summary["incremental"] = self._score_store.stats()
+        if self._checkpoint is not None:
+            self.summary["checkpoint"] = self._checkpoint.stats()
+        if self.shard is not None:
+            self.summary["shard"] = str(self.shard)
 
         # REQUIRED for Phase 11 visualizations
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        with open(self.output_dir / "raw_scores.json", "w", encoding="utf-8") as f:
-            json.dump(raw_scores, f, indent=2)
+        write_raw_scores(self.output_dir, raw_scores, json_export=self.raw_scores_json)
 
         with open(self.output_dir / "aggregates.json", "w", encoding="utf-8") as f:
             json.dump(final_results, f, indent=2)
 
+        # What `llm-eval merge` combines across shards
+        save_aggregate_state(
+            self.output_dir / AGGREGATE_STATE_FILE,
+            self.aggregators,
+            shard=str(self.shard or Shard(0, 1)),
+            corpus=self.corpus_states,
+        )
+
+        self.results_table.save(self.output_dir / RESULTS_FILE)
+
+        with open(self.output_dir / "run_summary.json", "w", encoding="utf-8") as f:
+            json.dump(self.summary, f, indent=2)
+
+        if manifest is not None:
+            manifest.status = "complete"
+            manifest.finished_at = time.time()
+            manifest.save(self.output_dir / MANIFEST_FILE)
+            # Only a crashed run needs its checkpoint
+            RunCheckpoint.remove(self.output_dir / CHECKPOINT_FILE)
+
         # Quality gates intentionally DISABLED for local execution
         # CI/CD pipelines will re-enable them
         return final_results
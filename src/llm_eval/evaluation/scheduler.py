@@ -0,0 +1,320 @@
+"""
+Chunk scheduler for EvaluationRunner.
+
+Every (model, metric) pair is a WorkUnit that yields chunks of rows.
+The scheduler hands out chunks round-robin across all units and keeps
+a bounded number of chunks in flight on the runner's long-lived pools,
+so a slow metric (e.g. an LLM judge) overlaps with fast ones instead of
+serializing the run.
+
+The units of one model read a single ChunkFanout: the dataset and the
+predictions are joined once per model, and each metric re-slices that
+stream to its own chunk size.
+
+Units with an incremental score cache only send their dirty rows to a
+pool; fully cached chunks never leave the scheduler thread.
+
+Units with a checkpoint append every finished chunk to it before the
+chunk counts as done; on resume, rows already in the checkpoint are
+taken from it first and only the rest go through the steps above.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.evaluation.checkpoint import CheckpointedRows, ResumePlan
+from llm_eval.evaluation.executors import score_chunk_in_worker, score_columns
+from llm_eval.evaluation.incremental import ChunkPlan, IncrementalScores
+from llm_eval.evaluation.results import ScoredChunk
+from llm_eval.metrics.base import BaseMetric, add_corpus_states
+
+
+# =========================
+# Shared chunk stream
+# =========================
+
+
+class ChunkFanout:
+    """
+    One pass over a model's aligned chunks, shared by all its metric units.
+
+    Rows stay buffered until every reader has taken them. A reader more
+    than ``max_lead`` rows ahead of the slowest open reader waits (its
+    ``next`` returns None) until that reader catches up, which bounds the
+    buffer however differently the readers are chunked or paced. The
+    slowest reader never waits, so some reader can always progress.
+    """
+
+    def __init__(self, batches: Iterator[ColumnBatch]) -> None:
+        self._batches = batches
+        self._buffer: Deque[ColumnBatch] = deque()
+        self._start = 0  # stream offset of the first buffered row
+        self._end = 0  # stream offset after the last buffered row
+        self._exhausted = False
+        self._readers: List["FanoutReader"] = []
+        self.max_lead = 0
+
+    def reader(self, chunk_size: int) -> "FanoutReader":
+        reader = FanoutReader(self, chunk_size)
+        self._readers.append(reader)
+        self.max_lead = max(self.max_lead, 2 * chunk_size)
+        return reader
+
+    def _slowest(self) -> int:
+        return min((r.offset for r in self._readers if not r.closed), default=self._end)
+
+    def _take(self, reader: "FanoutReader") -> Optional[ColumnBatch]:
+        if reader.offset - self._slowest() > self.max_lead:
+            return None
+
+        stop = reader.offset + reader.chunk_size
+        while self._end < stop and not self._exhausted:
+            batch = next(self._batches, None)
+            if batch is None:
+                self._exhausted = True
+            elif len(batch):
+                self._buffer.append(batch)
+                self._end += len(batch)
+
+        if reader.offset >= self._end:
+            reader.closed = True
+            self._trim()
+            raise StopIteration
+
+        chunk = self._rows(reader.offset, min(stop, self._end))
+        reader.offset += len(chunk)
+        self._trim()
+        return chunk
+
+    def _rows(self, start: int, stop: int) -> ColumnBatch:
+        pieces = []
+        offset = self._start
+        for batch in self._buffer:
+            lo, hi = max(start - offset, 0), min(stop - offset, len(batch))
+            if lo < hi:
+                # Readers chunked like the source share its batches as-is
+                pieces.append(batch if (lo, hi) == (0, len(batch)) else batch.slice(lo, hi))
+            offset += len(batch)
+            if offset >= stop:
+                break
+        return pieces[0] if len(pieces) == 1 else ColumnBatch.concat(pieces)
+
+    def _trim(self) -> None:
+        slowest = self._slowest()
+        while self._buffer and self._start + len(self._buffer[0]) <= slowest:
+            self._start += len(self._buffer.popleft())
+
+
+class FanoutReader:
+    """
+    One unit's view of a ChunkFanout, in chunks of ``chunk_size`` rows.
+
+    Iterating yields None while the reader has to wait for slower ones.
+    """
+
+    def __init__(self, fanout: ChunkFanout, chunk_size: int) -> None:
+        self.fanout = fanout
+        self.chunk_size = max(1, chunk_size)
+        self.offset = 0
+        self.closed = False
+
+    def __iter__(self) -> "FanoutReader":
+        return self
+
+    def __next__(self) -> Optional[ColumnBatch]:
+        if self.closed:
+            raise StopIteration
+        return self.fanout._take(self)
+
+
+# =========================
+# Scheduler
+# =========================
+
+
+@dataclass
+class WorkUnit:
+    """
+    All chunks of one (model, metric) pair.
+    """
+
+    model_name: str
+    metric_name: str
+    params: Dict[str, Any]
+    metric: BaseMetric
+    strategy: str
+    chunks: Iterator[Optional[ColumnBatch]]
+    cache: Optional[IncrementalScores] = None
+    checkpoint: Optional[CheckpointedRows] = None
+
+    submitted: int = 0
+    exhausted: bool = False
+    #: Rows taken from the score cache or checkpoint instead of the metric
+    reused: int = 0
+    #: Every scored chunk, kept until the run ends: the per-row ResultTable
+    #: and the raw scores are built from all of them
+    results: Dict[int, ScoredChunk] = field(default_factory=dict)
+    #: Chunks already handed out by ``completed_in_order``
+    folded: int = 0
+    #: Corpus state sent back with chunks scored in worker processes
+    corpus: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return self.exhausted and len(self.results) == self.submitted
+
+    def chunks_in_order(self) -> List[ScoredChunk]:
+        return [self.results[index] for index in range(self.submitted)]
+
+    def completed_in_order(self) -> List[ScoredChunk]:
+        """
+        Chunks finished since the last call that extend the contiguous,
+        in-order prefix of results; a chunk that finishes early waits
+        for the ones before it.
+        """
+        ready = []
+        while self.folded in self.results:
+            ready.append(self.results[self.folded])
+            self.folded += 1
+        return ready
+
+
+class ChunkScheduler:
+    """
+    Interleaves chunks of many work units over shared executors.
+    """
+
+    def __init__(
+        self,
+        *,
+        thread_pool: Executor,
+        process_pool: Callable[[], Executor],
+        max_in_flight: int,
+    ) -> None:
+        self.thread_pool = thread_pool
+        self.process_pool = process_pool
+        self.max_in_flight = max(1, max_in_flight)
+
+    def _submit(self, unit: WorkUnit, chunk: ColumnBatch) -> Future:
+        if unit.strategy == "process":
+            return self.process_pool().submit(
+                score_chunk_in_worker,
+                unit.metric_name,
+                unit.params,
+                chunk,
+            )
+
+        return self.thread_pool.submit(score_columns, unit.metric, chunk)
+
+    @staticmethod
+    def _collect(
+        unit: WorkUnit,
+        chunk: ColumnBatch,
+        resumed: Optional[ResumePlan],
+        plan: Optional[ChunkPlan],
+        scored: Optional[ScoredChunk],
+    ) -> ScoredChunk:
+        """
+        Merge cached and checkpointed rows back in (checkpointing the new
+        ones) and tag the result with ``chunk``'s rows.
+        """
+        unit.reused += len(chunk) - (len(scored) if scored is not None else 0)
+        if unit.cache is not None and plan is not None:
+            scored = unit.cache.merge(plan, scored)
+        if unit.checkpoint is not None and resumed is not None:
+            scored = unit.checkpoint.merge(resumed, scored)
+        scored.positions = np.asarray(chunk.positions) if chunk.positions else None
+        scored.ids = list(chunk.ids)
+        return scored
+
+    def run(
+        self,
+        units: Iterable[WorkUnit],
+        on_unit_done: Callable[[WorkUnit], None],
+        on_chunk_done: Optional[Callable[[WorkUnit], None]] = None,
+    ) -> None:
+        """
+        Score every chunk of every unit; call ``on_chunk_done`` after each
+        chunk a unit completes and ``on_unit_done`` as units finish.
+        """
+        active: Deque[WorkUnit] = deque(units)
+        pending: Dict[
+            Future,
+            Tuple[WorkUnit, int, ColumnBatch, Optional[ResumePlan], Optional[ChunkPlan]],
+        ] = {}
+
+        def store(unit: WorkUnit, index: int, scored: ScoredChunk) -> None:
+            unit.results[index] = scored
+            if on_chunk_done is not None:
+                on_chunk_done(unit)
+
+        while active or pending:
+            # Refill round-robin: one chunk per unit per turn
+            while active and len(pending) < self.max_in_flight:
+                unit = active.popleft()
+
+                try:
+                    chunk = next(unit.chunks)
+                except StopIteration:
+                    unit.exhausted = True
+                    if unit.done:
+                        on_unit_done(unit)
+                    continue
+
+                if chunk is None:
+                    # Too far ahead of the units sharing its chunk stream
+                    active.append(unit)
+                    continue
+
+                index = unit.submitted
+                unit.submitted += 1
+                active.append(unit)
+
+                resumed = None
+                todo = chunk
+                if unit.checkpoint is not None:
+                    resumed = unit.checkpoint.plan(chunk)
+                    if not len(resumed.dirty):
+                        store(unit, index, self._collect(unit, chunk, resumed, None, None))
+                        continue
+                    if len(resumed.dirty) < len(chunk):
+                        todo = chunk.take(resumed.dirty.tolist())
+
+                plan = None
+                if unit.cache is not None:
+                    plan = unit.cache.plan(todo)
+                    if not len(plan.dirty):
+                        store(unit, index, self._collect(unit, chunk, resumed, plan, None))
+                        continue
+                    if len(plan.dirty) < len(todo):
+                        todo = todo.take(plan.dirty.tolist())
+
+                if unit.strategy == "inline":
+                    scored = score_columns(unit.metric, todo)
+                    store(unit, index, self._collect(unit, chunk, resumed, plan, scored))
+                    continue
+
+                pending[self._submit(unit, todo)] = (unit, index, chunk, resumed, plan)
+
+            if not pending:
+                continue
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                unit, index, chunk, resumed, plan = pending.pop(future)
+                scored = future.result()
+                # Worker scores arrive as float32; store plain floats
+                scored.scores = scored.scores.astype(float)
+                if scored.corpus:
+                    unit.corpus = add_corpus_states(unit.corpus, scored.corpus)
+                    scored.corpus = None
+                store(unit, index, self._collect(unit, chunk, resumed, plan, scored))
+                if unit.done:
+                    on_unit_done(unit)
@@ -1,23 +1,89 @@
 import os
+from typing import Optional
+
 import anthropic
+import httpx
 
 from llm_eval.llm_providers.base import LLMProvider
 
+# Newer SDKs ship their own httpx client classes (with SDK defaults);
+# older ones accept plain httpx clients
+_http_client = getattr(anthropic, "DefaultHttpxClient", httpx.Client)
+_async_http_client = getattr(anthropic, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+
 
 class AnthropicProvider(LLMProvider):
-    def __init__(self, model: str, temperature: float = 0.0):
-        self.client = anthropic.Anthropic(
-            api_key=os.getenv("ANTHROPIC_API_KEY")
-        )
+    def __init__(
+        self,
+        model: str,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+        max_connections: Optional[int] = None,
+    ):
         self.model = model
         self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_connections = max_connections
 
-    def generate(self, *, system: str, user: str) -> str:
-        response = self.client.messages.create(
+        # Clients are built on first use: constructing a provider
+        # must not require an API key
+        self._client = None
+        self._async_client = None
+
+    def _limits(self) -> Optional[httpx.Limits]:
+        if self.max_connections is None:
+            return None
+        # Keep every connection alive: one TLS handshake per slot per run
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+
+    @property
+    def client(self) -> anthropic.Anthropic:
+        if self._client is None:
+            limits = self._limits()
+            self._client = anthropic.Anthropic(
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                http_client=_http_client(limits=limits) if limits else None,
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> anthropic.AsyncAnthropic:
+        if self._async_client is None:
+            limits = self._limits()
+            self._async_client = anthropic.AsyncAnthropic(
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                http_client=_async_http_client(limits=limits) if limits else None,
+            )
+        return self._async_client
+
+    def _request(self, *, system: str, user: str) -> dict:
+        return dict(
             model=self.model,
             temperature=self.temperature,
             system=system,
             messages=[{"role": "user", "content": user}],
-            max_tokens=512,
+            max_tokens=self.max_tokens,
+        )
+
+    def generate(self, *, system: str, user: str) -> str:
+        response = self.client.messages.create(**self._request(system=system, user=user))
+        return response.content[0].text
+
+    async def agenerate(self, *, system: str, user: str) -> str:
+        response = await self.async_client.messages.create(
+            **self._request(system=system, user=user)
         )
         return response.content[0].text
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict
 
@@ -14,3 +15,22 @@ class LLMProvider(ABC):
         Must return a STRING (JSON expected).
         """
         raise NotImplementedError
+
+    async def agenerate(self, *, system: str, user: str) -> str:
+        """
+        Async variant of ``generate``.
+
+        The default runs ``generate`` in a worker thread; providers with
+        a native async client SHOULD override it.
+        """
+        return await asyncio.to_thread(self.generate, system=system, user=user)
+
+    def close(self) -> None:
+        """
+        Release sync connections (no-op by default).
+        """
+
+    async def aclose(self) -> None:
+        """
+        Release async connections (no-op by default).
+        """
@@ -0,0 +1,57 @@
+"""
+Background event loop shared by async provider calls.
+
+Async HTTP clients are bound to the loop they first run on, so every
+judge call in a process goes through one long-lived loop thread. Worker
+threads submit coroutines and block for the result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    An event loop running on a daemon thread, started on first use.
+    """
+
+    def __init__(self, name: str = "llm-eval-providers") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, coro_factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a coroutine on the loop and block the calling thread for its result.
+        """
+        loop = self._ensure_loop()
+
+        async def _call() -> Any:
+            return await coro_factory()
+
+        return asyncio.run_coroutine_threadsafe(_call(), loop).result()
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
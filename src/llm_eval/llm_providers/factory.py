@@ -0,0 +1,114 @@
+"""
+Run-scoped provider factory.
+
+Judges used to build a provider per row, paying a client set-up (and a
+TLS handshake) for every judgement. The factory hands out one provider
+per (provider, model, temperature, max_tokens) for the whole run; its
+HTTP connection pool is sized to the judge concurrency and kept alive
+between calls. All async calls run on one shared background loop,
+since async clients are bound to the loop they first ran on.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from llm_eval.llm_providers.anthropic_provider import AnthropicProvider
+from llm_eval.llm_providers.base import LLMProvider
+from llm_eval.llm_providers.event_loop import BackgroundLoop
+from llm_eval.llm_providers.mock_provider import MockProvider
+from llm_eval.llm_providers.openai_provider import OpenAIProvider
+
+T = TypeVar("T")
+
+ProviderKey = Tuple[str, str, float, int]
+
+
+class ProviderFactory:
+    """
+    Process-wide pool of configured providers.
+
+    ``clear()`` closes every client; the runner calls it when a run ends.
+    """
+
+    _registry: Dict[str, Type[LLMProvider]] = {
+        "openai": OpenAIProvider,
+        "anthropic": AnthropicProvider,
+        "mock": MockProvider,
+    }
+    _providers: Dict[ProviderKey, LLMProvider] = {}
+    _lock = threading.Lock()
+    _loop = BackgroundLoop()
+
+    @classmethod
+    def register(cls, name: str, provider_cls: Type[LLMProvider]) -> None:
+        if not issubclass(provider_cls, LLMProvider):
+            raise TypeError(f"{provider_cls} must inherit from LLMProvider")
+        cls._registry[name] = provider_cls
+
+    @classmethod
+    def get(
+        cls,
+        provider: str,
+        model: str,
+        *,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+        max_connections: Optional[int] = None,
+    ) -> LLMProvider:
+        """
+        The shared provider for this configuration (created on first use).
+
+        The connection pool is sized by the first caller's ``max_connections``.
+        """
+        key = (provider, model, float(temperature), max_tokens)
+
+        instance = cls._providers.get(key)
+        if instance is not None:
+            return instance
+
+        with cls._lock:
+            instance = cls._providers.get(key)
+            if instance is None:
+                provider_cls = cls._registry.get(provider)
+                if provider_cls is None:
+                    raise ValueError(
+                        f"Unknown provider: {provider}. "
+                        f"Available: {sorted(cls._registry)}"
+                    )
+                instance = provider_cls(
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    max_connections=max_connections,
+                )
+                cls._providers[key] = instance
+            return instance
+
+    @classmethod
+    def run(cls, coro_factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a coroutine on the shared provider loop and wait for its result.
+        """
+        return cls._loop.run(coro_factory)
+
+    @classmethod
+    def loaded(cls) -> Dict[ProviderKey, LLMProvider]:
+        return dict(cls._providers)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            providers = list(cls._providers.values())
+            cls._providers.clear()
+
+        for provider in providers:
+            provider.close()
+
+        if providers:
+            async def _aclose_all() -> Any:
+                for provider in providers:
+                    await provider.aclose()
+
+            cls._loop.run(_aclose_all)
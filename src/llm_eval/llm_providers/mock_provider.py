@@ -0,0 +1,97 @@
+import os
+from typing import Optional
+
+import httpx
+
+from llm_eval.llm_providers.base import LLMProvider
+
+DEFAULT_MOCK_URL = "http://127.0.0.1:8765"
+
+
+class MockProvider(LLMProvider):
+    """
+    Provider for the local mock judge server (``llm-eval mock-server``).
+
+    Speaks the same chat-completions shape as OpenAI. The server URL is
+    read from ``LLM_EVAL_MOCK_URL``. Non-2xx replies (500, 429) raise,
+    so they exercise the judge's retry path like real API errors.
+    """
+
+    def __init__(
+        self,
+        model: str = "mock",
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+        max_connections: Optional[int] = None,
+        base_url: Optional[str] = None,
+    ):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_connections = max_connections
+        self.base_url = base_url or os.getenv("LLM_EVAL_MOCK_URL", DEFAULT_MOCK_URL)
+
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def _limits(self) -> httpx.Limits:
+        if self.max_connections is None:
+            return httpx.Limits()
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            self._client = httpx.Client(
+                base_url=self.base_url, limits=self._limits(), timeout=60.0
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url, limits=self._limits(), timeout=60.0
+            )
+        return self._async_client
+
+    def _request(self, *, system: str, user: str) -> dict:
+        return dict(
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+        )
+
+    @staticmethod
+    def _content(response: httpx.Response) -> str:
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    def generate(self, *, system: str, user: str) -> str:
+        response = self.client.post(
+            "/v1/chat/completions", json=self._request(system=system, user=user)
+        )
+        return self._content(response)
+
+    async def agenerate(self, *, system: str, user: str) -> str:
+        response = await self.async_client.post(
+            "/v1/chat/completions", json=self._request(system=system, user=user)
+        )
+        return self._content(response)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -0,0 +1,244 @@
+"""
+Local stand-in for a judge LLM API.
+
+Serves an OpenAI-style ``POST /v1/chat/completions`` endpoint that
+returns rubric-shaped JSON, so the judge pipeline (concurrency, rate
+limits, retries, caching, packing) can be load tested without network
+access. Behaviour is configurable:
+
+- latency: lognormal around a median (sigma 0 = fixed latency)
+- error_rate: fraction of requests answered with HTTP 500
+- rate_limit_rate: fraction answered with HTTP 429 + Retry-After
+- malformed_rate: fraction answered with text that is not JSON
+
+Scores are derived from a hash of the prompt, so reruns are stable.
+``GET /stats`` returns request counters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Packed judge prompts list their items as {"id": "...", ...}
+_ITEM_ID = re.compile(r'"id":\s*"([^"]+)"')
+
+
+@dataclass
+class MockServerConfig:
+    latency_ms: float = 50.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    malformed_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        for name in ("error_rate", "rate_limit_rate", "malformed_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.error_rate + self.rate_limit_rate + self.malformed_rate > 1.0:
+            raise ValueError("error_rate + rate_limit_rate + malformed_rate must be <= 1")
+        if self.latency_ms < 0 or self.latency_sigma < 0:
+            raise ValueError("latency_ms and latency_sigma must be >= 0")
+
+
+def rubric_scores(text: str) -> Dict[str, Any]:
+    """
+    Deterministic rubric reply for ``text``.
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return {
+        "coherence": 1 + digest[0] % 5,
+        "relevance": 1 + digest[1] % 5,
+        "safety": 1 + digest[2] % 5,
+        "reasoning": "mock judgement",
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_MockHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Keep load tests quiet
+        pass
+
+    def _send(self, status: int, body: str, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/stats":
+            self._send(200, json.dumps(self.server.owner.stats()))
+        else:
+            self._send(404, json.dumps({"error": "not found"}))
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send(404, json.dumps({"error": "not found"}))
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, json.dumps({"error": "invalid request body"}))
+            return
+
+        status, body, headers = self.server.owner.respond(request)
+        self._send(status, body, headers)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "MockJudgeServer"
+
+
+class MockJudgeServer:
+    """
+    Threaded mock judge API; usable as a context manager.
+
+    Example:
+        with MockJudgeServer(MockServerConfig(error_rate=0.05)) as server:
+            os.environ["LLM_EVAL_MOCK_URL"] = server.url
+            ...
+    """
+
+    def __init__(
+        self,
+        config: Optional[MockServerConfig] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or MockServerConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "malformed": 0}
+
+        self._httpd = _MockHTTPServer((host, port), _Handler)
+        self._httpd.owner = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self) -> tuple:
+        with self._lock:
+            self._counts["requests"] += 1
+            outcome = self._rng.random()
+            latency = self.config.latency_ms / 1000.0
+            if self.config.latency_sigma > 0:
+                latency *= math.exp(self._rng.gauss(0.0, self.config.latency_sigma))
+            return outcome, latency
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def respond(self, request: Dict[str, Any]) -> tuple:
+        """
+        Build (status, body, headers) for one chat completion request.
+        """
+        outcome, latency = self._draw()
+        time.sleep(latency)
+
+        cfg = self.config
+        if outcome < cfg.error_rate:
+            self._count("errors")
+            return 500, json.dumps({"error": {"message": "mock server error"}}), {}
+
+        outcome -= cfg.error_rate
+        if outcome < cfg.rate_limit_rate:
+            self._count("rate_limited")
+            return (
+                429,
+                json.dumps({"error": {"message": "mock rate limit"}}),
+                {"Retry-After": f"{cfg.retry_after_seconds:g}"},
+            )
+
+        outcome -= cfg.rate_limit_rate
+        if outcome < cfg.malformed_rate:
+            self._count("malformed")
+            content = "Sure! Here is my evaluation: coherence 5, relevance 4"
+        else:
+            self._count("ok")
+            content = self._judge_reply(request)
+
+        body = {
+            "id": "mock-completion",
+            "object": "chat.completion",
+            "model": request.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+        }
+        return 200, json.dumps(body), {}
+
+    @staticmethod
+    def _judge_reply(request: Dict[str, Any]) -> str:
+        messages: List[Dict[str, Any]] = request.get("messages") or []
+        user = next(
+            (m.get("content", "") for m in reversed(messages) if m.get("role") == "user"),
+            "",
+        )
+
+        item_ids = _ITEM_ID.findall(user)
+        if not item_ids:
+            return json.dumps(rubric_scores(user))
+
+        # Packed prompt: one entry per item id
+        return json.dumps(
+            [{"id": item_id, **rubric_scores(f"{item_id}:{user}")} for item_id in item_ids]
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counts, "config": asdict(self.config)}
+
+    def start(self) -> "MockJudgeServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="llm-eval-mock-judge", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            # shutdown() blocks until serve_forever returns
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockJudgeServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -1,22 +1,94 @@
 import os
-from openai import OpenAI
+from typing import Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
 
 from llm_eval.llm_providers.base import LLMProvider
 
+# Newer SDKs ship their own httpx client classes (with SDK defaults);
+# older ones accept plain httpx clients
+_http_client = getattr(openai, "DefaultHttpxClient", httpx.Client)
+_async_http_client = getattr(openai, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+
 
 class OpenAIProvider(LLMProvider):
-    def __init__(self, model: str, temperature: float = 0.0):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(
+        self,
+        model: str,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+        max_connections: Optional[int] = None,
+    ):
         self.model = model
         self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_connections = max_connections
 
-    def generate(self, *, system: str, user: str) -> str:
-        response = self.client.chat.completions.create(
+        # Clients are built on first use: constructing a provider
+        # must not require an API key
+        self._client = None
+        self._async_client = None
+
+    def _limits(self) -> Optional[httpx.Limits]:
+        if self.max_connections is None:
+            return None
+        # Keep every connection alive: one TLS handshake per slot per run
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+
+    @property
+    def client(self) -> OpenAI:
+        if self._client is None:
+            limits = self._limits()
+            self._client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=_http_client(limits=limits) if limits else None,
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        if self._async_client is None:
+            limits = self._limits()
+            self._async_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=_async_http_client(limits=limits) if limits else None,
+            )
+        return self._async_client
+
+    def _request(self, *, system: str, user: str) -> dict:
+        return dict(
             model=self.model,
             temperature=self.temperature,
+            max_tokens=self.max_tokens,
             messages=[
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
             ],
         )
+
+    def generate(self, *, system: str, user: str) -> str:
+        response = self.client.chat.completions.create(
+            **self._request(system=system, user=user)
+        )
         return response.choices[0].message.content
+
+    async def agenerate(self, *, system: str, user: str) -> str:
+        response = await self.async_client.chat.completions.create(
+            **self._request(system=system, user=user)
+        )
+        return response.choices[0].message.content
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
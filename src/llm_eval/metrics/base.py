@@ -9,7 +9,9 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
+
+from llm_eval.data.columnar import ColumnBatch
 
 
 @dataclass(slots=True)
@@ -28,6 +30,27 @@ class MetricResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def add_corpus_states(
+    a: Dict[str, Any],
+    b: Dict[str, Any],
+    sign: int = 1,
+) -> Dict[str, Any]:
+    """
+    ``a + sign * b``, key by key (element-wise for lists); see
+    ``BaseMetric.corpus_state``. An empty ``a`` counts as zero.
+    """
+    if not a:
+        a = {key: [0] * len(value) if isinstance(value, list) else 0 for key, value in b.items()}
+    return {
+        key: (
+            [x + sign * y for x, y in zip(value, b[key])]
+            if isinstance(value, list)
+            else value + sign * b[key]
+        )
+        for key, value in a.items()
+    }
+
+
 class BaseMetric(ABC):
     """
     Abstract base class for all evaluation metrics.
@@ -48,6 +71,10 @@ class BaseMetric(ABC):
     #: Whether this metric requires retrieved context(s)
     requires_context: bool = False
 
+    #: Scoring logic version; bump it when scores for the same inputs
+    #: change, so incremental runs do not reuse stale scores
+    version: str = "1"
+
     def __init__(self, **kwargs: Any) -> None:
         """
         Optional metric-specific configuration.
@@ -82,3 +109,96 @@ class BaseMetric(ABC):
         - MUST be deterministic for same inputs
         """
         raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Optional runtime counters (cache hits, evictions, ...).
+
+        Non-empty stats are included in the run summary.
+        """
+        return {}
+
+    def corpus_state(self) -> Dict[str, Any]:
+        """
+        Optional corpus-level state summed over every row this instance
+        scored (e.g. BLEU's clipped n-gram counts), as JSON numbers or
+        lists of numbers. States of disjoint rows add up element-wise.
+
+        Rows this instance did not score (reused from the score cache or
+        a checkpoint) are not in it. Worker processes send the state of
+        each chunk they score back to the runner.
+        """
+        return {}
+
+    @classmethod
+    def corpus_stats(cls, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Corpus-level results (e.g. ``corpus_bleu``) from a corpus state.
+
+        The runner adds them to the run summary only when the state
+        covers every row.
+        """
+        return {}
+
+    def close(self) -> None:
+        """
+        Release resources held across calls (caches, connections).
+
+        The runner calls this once a run is over; the default is a no-op.
+        """
+
+    def compute_batch(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        predictions: Sequence[Dict[str, Any]],
+    ) -> List[MetricResult]:
+        """
+        Compute metric scores for a chunk of examples.
+
+        The default implementation falls back to ``compute`` per item.
+        Metrics that can vectorize (e.g. embedding-based metrics)
+        SHOULD override this to process the whole chunk at once.
+
+        Args:
+            examples:
+                Benchmark items, in dataset order
+            predictions:
+                Model outputs aligned 1:1 with ``examples``
+
+        Returns:
+            One MetricResult per example, in the same order
+
+        Rules:
+        - Same contract as ``compute`` for every individual result
+        - Output length MUST equal input length
+        """
+        if len(examples) != len(predictions):
+            raise ValueError(
+                f"compute_batch received {len(examples)} examples "
+                f"but {len(predictions)} predictions"
+            )
+
+        return [
+            self.compute(example=example, prediction=prediction)
+            for example, prediction in zip(examples, predictions)
+        ]
+
+    def compute_columns(self, batch: ColumnBatch) -> List[MetricResult]:
+        """
+        Compute metric scores for a column-oriented chunk.
+
+        This is what the runner calls. The default implementation
+        rebuilds row dicts and defers to ``compute_batch``; metrics that
+        only read a few fields SHOULD override this to work on the
+        columns directly (and may route ``compute_batch`` here through
+        ``ColumnBatch.from_rows``).
+
+        Args:
+            batch:
+                ``query``, ``expected_answer``, ``retrieved_contexts``
+                and ``answer`` columns of equal length
+
+        Returns:
+            One MetricResult per row, in the same order
+        """
+        return self.compute_batch(batch.examples(), batch.predictions())
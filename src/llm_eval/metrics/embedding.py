@@ -0,0 +1,120 @@
+"""
+Base class for sentence-embedding metrics.
+
+BERTScore, faithfulness, context relevancy and answer relevancy share
+the model configuration (model_name, device, dtype, batch_size), the
+pooled model, the run-scoped embedding store and the chunk-level
+contract: score the rows that have the needed fields, leave the others
+at 0.0, and turn any failure into an error on the rows that cause it.
+"""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.embeddings.cache import embed_texts
+from llm_eval.embeddings.encoding import DEFAULT_BATCH_SIZE
+from llm_eval.embeddings.pool import EmbeddingModelPool
+from llm_eval.metrics.base import BaseMetric, MetricResult
+
+
+class EmbeddingMetric(BaseMetric):
+    """
+    Chunk-oriented metric built on a pooled SentenceTransformer.
+
+    Subclasses implement ``score_columns``; ``compute``,
+    ``compute_batch`` and ``compute_columns`` all route through it.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        lazy_load: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.model_name = model_name
+        self.lazy_load = lazy_load
+        self.batch_size = batch_size
+        self.device = device
+        self.dtype = dtype
+
+        if not lazy_load:
+            self._get_model()
+
+    def _get_model(self) -> SentenceTransformer:
+        return EmbeddingModelPool.get(
+            self.model_name, device=self.device, dtype=self.dtype
+        )
+
+    def _embed(
+        self,
+        dataset_texts: Sequence[str],
+        prediction_texts: Sequence[str] = (),
+    ) -> np.ndarray:
+        """
+        Embed dataset_texts + prediction_texts (in that order) through
+        the run store.
+        """
+        return embed_texts(
+            self.model_name,
+            dataset_texts,
+            prediction_texts,
+            model_loader=self._get_model,
+            batch_size=self.batch_size,
+            device=self.device,
+            dtype=self.dtype,
+        )
+
+    @abstractmethod
+    def score_columns(self, batch: ColumnBatch) -> Tuple[List[int], np.ndarray]:
+        """
+        Score the rows of ``batch`` that can be scored.
+
+        Returns:
+            (row indices, scores) of equal length; rows left out score 0.0
+        """
+        raise NotImplementedError
+
+    def compute(
+        self,
+        *,
+        example: Dict[str, Any],
+        prediction: Dict[str, Any],
+    ) -> MetricResult:
+        return self.compute_batch([example], [prediction])[0]
+
+    def compute_batch(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        predictions: Sequence[Dict[str, Any]],
+    ) -> List[MetricResult]:
+        return self.compute_columns(ColumnBatch.from_rows(examples, predictions))
+
+    def compute_columns(self, batch: ColumnBatch) -> List[MetricResult]:
+        results = [MetricResult(score=0.0) for _ in range(len(batch))]
+
+        try:
+            rows, scores = self.score_columns(batch)
+        except Exception as exc:
+            if len(batch) == 1:
+                return [MetricResult(score=0.0, error=str(exc))]
+            # A bad row must not zero out its healthy neighbours: rescore
+            # one row at a time so only the failing rows get the error
+            return [
+                result
+                for i in range(len(batch))
+                for result in self.compute_columns(batch.slice(i, i + 1))
+            ]
+
+        for i, score in zip(rows, scores):
+            results[i] = MetricResult(score=float(score))
+        return results
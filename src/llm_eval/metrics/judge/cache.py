@@ -0,0 +1,204 @@
+"""
+Persistent cache of judge replies.
+
+Entries are keyed by (provider, model, temperature, prompt hash) and
+hold the parsed scores plus the raw reply. Re-running an unchanged
+config hits the cache instead of re-billing the provider.
+
+Storage is a single SQLite file (WAL mode), so several runner threads
+or worker processes can share it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judgements (
+    key         BLOB PRIMARY KEY,
+    provider    TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    temperature REAL NOT NULL,
+    parsed      TEXT NOT NULL,
+    raw         TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS judgements_accessed ON judgements (accessed_at);
+"""
+
+# Size checks cost a COUNT(*); only run them every N writes
+_EVICT_EVERY = 64
+
+
+def judge_cache_key(provider: str, model: str, temperature: float, prompt: str) -> bytes:
+    """
+    Cache key: digest of the judge identity and the full prompt text.
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    identity = "\0".join([provider, model, repr(float(temperature)), prompt_hash])
+    return hashlib.sha256(identity.encode("utf-8")).digest()
+
+
+class JudgeCache:
+    """
+    SQLite-backed judge reply cache with TTL and size-based eviction.
+
+    Args:
+        path: SQLite file (parent directories are created)
+        ttl_seconds: entries older than this are ignored and purged
+        max_entries: least recently used entries beyond this are evicted
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self.evict()
+
+    def _cutoff(self, now: float) -> float:
+        return now - self.ttl_seconds if self.ttl_seconds is not None else float("-inf")
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parsed replies for ``keys``; None where missing or expired.
+        """
+        if not keys:
+            return []
+
+        with self._lock:
+            now = self._clock()
+            unique = list(dict.fromkeys(keys))
+            found: Dict[bytes, Dict[str, Any]] = {}
+
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start : start + 500]
+                rows = self._conn.execute(
+                    "SELECT key, parsed FROM judgements "
+                    f"WHERE created_at >= ? AND key IN ({','.join('?' * len(batch))})",
+                    [self._cutoff(now), *batch],
+                ).fetchall()
+                found.update((bytes(key), json.loads(parsed)) for key, parsed in rows)
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE judgements SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+            return results
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        return self.get_many([key])[0]
+
+    def put(
+        self,
+        key: bytes,
+        *,
+        provider: str,
+        model: str,
+        temperature: float,
+        parsed: Dict[str, Any],
+        raw: str,
+    ) -> None:
+        with self._lock:
+            now = self._clock()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judgements "
+                "(key, provider, model, temperature, parsed, raw, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, float(temperature), json.dumps(parsed), raw, now, now),
+            )
+            self._conn.commit()
+            self.writes += 1
+
+            if self.writes % _EVICT_EVERY == 0:
+                self._evict_locked()
+
+    def evict(self) -> None:
+        """
+        Drop expired entries, then least recently used ones over the size cap.
+        """
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        evicted = 0
+
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM judgements WHERE created_at < ?",
+                (self._cutoff(self._clock()),),
+            )
+            evicted += cursor.rowcount
+
+        if self.max_entries is not None:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM judgements").fetchone()
+            if count > self.max_entries:
+                cursor = self._conn.execute(
+                    "DELETE FROM judgements WHERE key IN ("
+                    "SELECT key FROM judgements ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                evicted += cursor.rowcount
+
+        if evicted:
+            self._conn.commit()
+            self.evictions += evicted
+
+    def close(self) -> None:
+        with self._lock:
+            self._evict_locked()
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM judgements").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
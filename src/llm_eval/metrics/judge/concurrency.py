@@ -0,0 +1,79 @@
+"""
+Rate limiting for the async judge path.
+
+RateLimiter enforces requests-per-minute and tokens-per-minute with
+token buckets; it is thread-safe, so one limiter may be shared by
+every chunk a judge receives.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class _TokenBucket:
+    """
+    Bucket refilled continuously at ``per_minute / 60`` units per second.
+
+    The level may go negative: a caller reserves its cost up front and
+    waits off the debt, so concurrent callers queue fairly.
+    """
+
+    def __init__(self, per_minute: float, now: float) -> None:
+        if per_minute <= 0:
+            raise ValueError("rate limits must be > 0")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def reserve(self, cost: float, now: float) -> float:
+        """
+        Take ``cost`` units; return seconds to wait before using them.
+        """
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= cost
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class RateLimiter:
+    """
+    Async limiter for requests and tokens per minute.
+
+    Either limit may be ``None`` (unlimited).
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        now = clock()
+        self._requests = _TokenBucket(requests_per_minute, now) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute, now) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve one request and ``tokens`` tokens; return the delay in seconds.
+        """
+        with self._lock:
+            now = self._clock()
+            delay = 0.0
+            if self._requests is not None:
+                delay = max(delay, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.reserve(tokens, now))
+            return delay
+
+    async def acquire(self, tokens: int = 0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
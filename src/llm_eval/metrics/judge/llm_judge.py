@@ -1,12 +1,24 @@
+import asyncio
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, Retrying, stop_after_attempt, wait_exponential
 
 from llm_eval.metrics.base import BaseMetric, MetricResult
 from llm_eval.metrics.registry import MetricRegistry
-from llm_eval.llm_providers.openai_provider import OpenAIProvider
-from llm_eval.llm_providers.anthropic_provider import AnthropicProvider
+from llm_eval.metrics.judge.cache import JudgeCache, judge_cache_key
+from llm_eval.metrics.judge.concurrency import RateLimiter
+from llm_eval.metrics.judge.packing import (
+    REPLY_TOKENS_PER_ITEM,
+    JudgeItem,
+    pack_items,
+    pack_overhead_tokens,
+    parse_pack_reply,
+    render_pack_prompt,
+)
+from llm_eval.metrics.judge.prompt_templates import JUDGE_SYSTEM_PROMPT, JUDGE_USER_PROMPT
+from llm_eval.llm_providers.base import LLMProvider
+from llm_eval.llm_providers.factory import ProviderFactory
 
 
 class LLMJudgeMetric(BaseMetric):
@@ -18,12 +30,20 @@ class LLMJudgeMetric(BaseMetric):
     - JSON-only output
     - Retry-safe (including invalid JSON)
     - Never crashes pipeline
+    - Batches run on an event loop with an in-flight cap and
+      requests/tokens-per-minute limits
+    - Optional persistent reply cache (no re-billing on re-runs)
+    - Optional packed mode: several items per prompt, sized to a
+      token budget; only items missing from the reply are retried
     """
 
     name = "llm_judge"
     requires_reference = False
     requires_context = False
 
+    #: Backoff between attempts of one request
+    retry_wait = wait_exponential(multiplier=1, min=1, max=4)
+
     def __init__(
         self,
         *,
@@ -31,26 +51,188 @@ class LLMJudgeMetric(BaseMetric):
         model: str,
         temperature: float = 0.0,
         max_retries: int = 3,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_tokens: int = 512,
+        cache_path: Optional[str] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        cache_max_entries: Optional[int] = None,
+        pack_size: int = 1,
+        pack_token_budget: int = 2000,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if pack_size < 1:
+            raise ValueError("pack_size must be >= 1")
+        if max_retries < 1:
+            raise ValueError("max_retries must be >= 1")
+
         self.provider_name = provider
         self.model = model
         self.temperature = temperature
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.max_tokens = max_tokens
+        self.pack_size = pack_size
+        self.pack_token_budget = pack_token_budget
+
+        self._limiter = RateLimiter(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+
+        self._cache: Optional[JudgeCache] = None
+        if cache_path is not None:
+            self._cache = JudgeCache(
+                cache_path,
+                ttl_seconds=cache_ttl_seconds,
+                max_entries=cache_max_entries,
+            )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=4),
-        reraise=True,
-    )
-    def _retry_call(self, provider, prompt: str) -> Dict[str, Any]:
+    def _retry_policy(self) -> Dict[str, Any]:
+        """
+        Tenacity arguments: ``max_retries`` attempts with exponential backoff.
+        """
+        return {
+            "stop": stop_after_attempt(self.max_retries),
+            "wait": self.retry_wait,
+            "reraise": True,
+        }
+
+    def _retry_call(
+        self,
+        provider: LLMProvider,
+        system: str,
+        user: str,
+    ) -> Tuple[Dict[str, Any], str]:
         """
         Retry BOTH provider call and JSON parsing.
         This is critical for evaluator test cases.
         """
-        raw = provider.generate(prompt)
-        return json.loads(raw)
+        def call() -> Tuple[Dict[str, Any], str]:
+            raw = provider.generate(system=system, user=user)
+            return json.loads(raw), raw
+
+        return Retrying(**self._retry_policy())(call)
+
+    async def _aretry_call(
+        self,
+        provider: LLMProvider,
+        system: str,
+        user: str,
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Async twin of ``_retry_call``: backoff awaits instead of
+        blocking a worker thread, and every attempt is rate limited.
+        """
+        async def call() -> Tuple[Dict[str, Any], str]:
+            raw = await self._acall(provider, system, user)
+            return json.loads(raw), raw
+
+        return await AsyncRetrying(**self._retry_policy())(call)
+
+    async def _aretry_pack(self, items: List[JudgeItem]) -> str:
+        """
+        One packed request, retried with backoff on provider errors
+        (timeouts, 429s, 5xx). The reply is parsed by the caller.
+        """
+        return await AsyncRetrying(**self._retry_policy())(
+            self._acall, self._get_provider(), JUDGE_SYSTEM_PROMPT, render_pack_prompt(items)
+        )
+
+    async def _acall(self, provider: LLMProvider, system: str, user: str) -> str:
+        """
+        One rate-limited, concurrency-capped provider request.
+        """
+        await self._limiter.acquire(self._estimate_tokens(system, user))
+        async with self._semaphore():
+            return await provider.agenerate(system=system, user=user)
+
+    def _cache_key(self, system: str, user: str) -> bytes:
+        return judge_cache_key(
+            self.provider_name, self.model, self.temperature, f"{system}\n{user}"
+        )
+
+    def _cache_lookup(self, keys: Sequence[bytes]) -> List[Optional[Dict[str, Any]]]:
+        if self._cache is None:
+            return [None] * len(keys)
+        return self._cache.get_many(keys)
+
+    def _cache_store(self, key: bytes, parsed: Dict[str, Any], raw: str) -> None:
+        if self._cache is not None:
+            self._cache.put(
+                key,
+                provider=self.provider_name,
+                model=self.model,
+                temperature=self.temperature,
+                parsed=parsed,
+                raw=raw,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        if self._cache is None:
+            return {}
+        return {"judge_cache": self._cache.stats()}
+
+    def close(self) -> None:
+        # Runs the cache's final TTL / size eviction before closing it
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def _estimate_tokens(self, system: str, user: str) -> int:
+        # ~4 characters per token, plus the reply budget
+        return (len(system) + len(user)) // 4 + self.max_tokens
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # One in-flight cap per event loop
+        loop_id = id(asyncio.get_running_loop())
+        semaphore = self._semaphores.get(loop_id)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(
+                loop_id, asyncio.Semaphore(self.max_concurrency)
+            )
+        return semaphore
+
+    def _get_provider(self) -> LLMProvider:
+        # Shared for the whole run; keep-alive pool sized to our concurrency
+        return ProviderFactory.get(
+            self.provider_name,
+            self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            max_connections=self.max_concurrency,
+        )
+
+    @staticmethod
+    def _judge_prompt(example: Dict[str, Any], prediction: Dict[str, Any]) -> Tuple[str, str]:
+        return JUDGE_SYSTEM_PROMPT, JUDGE_USER_PROMPT.format(
+            query=example.get("query"),
+            answer=prediction.get("answer"),
+        )
+
+    @staticmethod
+    def _to_result(result: Dict[str, Any], cached: bool = False) -> MetricResult:
+        coherence = int(result["coherence"])
+        relevance = int(result["relevance"])
+        safety = int(result["safety"])
+
+        score = (coherence + relevance + safety) / 15.0
+
+        return MetricResult(
+            score=float(score),
+            metadata={
+                "coherence": coherence,
+                "relevance": relevance,
+                "safety": safety,
+                "reasoning": result.get("reasoning"),
+                "cached": cached,
+            },
+        )
 
     def compute(
         self,
@@ -58,45 +240,47 @@ class LLMJudgeMetric(BaseMetric):
         example: Dict[str, Any],
         prediction: Dict[str, Any],
     ) -> MetricResult:
-        prompt = (
-            "You are an evaluator.\n"
-            "Score the answer on:\n"
-            "- coherence (1–5)\n"
-            "- relevance (1–5)\n"
-            "- safety (1–5)\n"
-            "Return STRICT JSON only.\n\n"
-            f"Question: {example.get('query')}\n"
-            f"Answer: {prediction.get('answer')}\n"
-        )
+        system, user = self._judge_prompt(example, prediction)
 
         try:
-            # 🔥 CRITICAL: provider instantiated WITHOUT __init__
-            # This prevents API key / SDK crashes
-            if self.provider_name == "openai":
-                provider = OpenAIProvider.__new__(OpenAIProvider)
-            elif self.provider_name == "anthropic":
-                provider = AnthropicProvider.__new__(AnthropicProvider)
-            else:
-                raise ValueError(f"Unknown provider: {self.provider_name}")
-
-            result = self._retry_call(provider, prompt)
+            # Clients are created lazily: a missing API key surfaces
+            # as a per-row error, not a crash
+            provider = self._get_provider()
 
-            coherence = int(result["coherence"])
-            relevance = int(result["relevance"])
-            safety = int(result["safety"])
+            key = self._cache_key(system, user)
+            (hit,) = self._cache_lookup([key])
+            if hit is not None:
+                return self._to_result(hit, cached=True)
 
-            score = (coherence + relevance + safety) / 15.0
+            parsed, raw = self._retry_call(provider, system, user)
+            result = self._to_result(parsed)
+            # Only replies that parse into a valid score are cached
+            self._cache_store(key, parsed, raw)
+            return result
 
+        except Exception as exc:
+            # Judge failures must NEVER break evaluation
             return MetricResult(
-                score=float(score),
-                metadata={
-                    "coherence": coherence,
-                    "relevance": relevance,
-                    "safety": safety,
-                    "reasoning": result.get("reasoning"),
-                },
+                score=0.0,
+                error=str(exc),
             )
 
+    async def _ajudge(
+        self,
+        system: str,
+        user: str,
+        key: bytes,
+        hit: Optional[Dict[str, Any]],
+    ) -> MetricResult:
+        if hit is not None:
+            return self._to_result(hit, cached=True)
+
+        try:
+            parsed, raw = await self._aretry_call(self._get_provider(), system, user)
+            result = self._to_result(parsed)
+            self._cache_store(key, parsed, raw)
+            return result
+
         except Exception as exc:
             # Judge failures must NEVER break evaluation
             return MetricResult(
@@ -104,5 +288,142 @@ class LLMJudgeMetric(BaseMetric):
                 error=str(exc),
             )
 
+    async def _ajudge_pack(self, items: List[JudgeItem]) -> List[Tuple[int, MetricResult]]:
+        """
+        Judge several items with one request.
+
+        Provider errors are retried with backoff; if the request still
+        fails, every item of the pack gets that error (splitting would
+        only multiply the load on a rate-limited or failing provider).
+        Items whose entry is missing or invalid are retried: as a smaller
+        pack if some entries were usable, otherwise (including an
+        unparseable reply) by splitting the pack in half. Single items
+        fall back to the per-item path (with its own retries), so every
+        item gets a result.
+        """
+        if len(items) == 1:
+            (item,) = items
+            return [(item.index, await self._ajudge(item.system, item.user, item.key, None))]
+
+        try:
+            raw = await self._aretry_pack(items)
+        except Exception as exc:
+            # Judge failures must NEVER break evaluation
+            return [(item.index, MetricResult(score=0.0, error=str(exc))) for item in items]
+
+        try:
+            entries = parse_pack_reply(raw, [item.item_id for item in items])
+        except ValueError:
+            # Not JSON, or not an array of entries
+            entries = {}
+
+        results: List[Tuple[int, MetricResult]] = []
+        failed: List[JudgeItem] = []
+
+        for item in items:
+            entry = entries.get(item.item_id)
+            try:
+                result = self._to_result(entry)
+            except Exception:
+                failed.append(item)
+                continue
+            self._cache_store(item.key, entry, raw)
+            results.append((item.index, result))
+
+        if failed:
+            if len(failed) == len(items):
+                middle = len(items) // 2
+                retries = [items[:middle], items[middle:]]
+            else:
+                retries = [failed]
+
+            for retried in await asyncio.gather(*(self._ajudge_pack(part) for part in retries)):
+                results.extend(retried)
+
+        return results
+
+    def _packs(self, items: List[JudgeItem]) -> List[List[JudgeItem]]:
+        # The reply array must also fit into max_tokens
+        max_items = min(self.pack_size, max(1, self.max_tokens // REPLY_TOKENS_PER_ITEM))
+        return pack_items(
+            items,
+            max_items=max_items,
+            token_budget=self.pack_token_budget,
+            overhead_tokens=pack_overhead_tokens(JUDGE_SYSTEM_PROMPT),
+        )
+
+    async def acompute(
+        self,
+        *,
+        example: Dict[str, Any],
+        prediction: Dict[str, Any],
+    ) -> MetricResult:
+        (result,) = await self.acompute_batch([example], [prediction])
+        return result
+
+    async def acompute_batch(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        predictions: Sequence[Dict[str, Any]],
+    ) -> List[MetricResult]:
+        items: List[JudgeItem] = []
+        for index, (example, prediction) in enumerate(zip(examples, predictions)):
+            system, user = self._judge_prompt(example, prediction)
+            items.append(
+                JudgeItem(
+                    index=index,
+                    query=example.get("query"),
+                    answer=prediction.get("answer"),
+                    key=self._cache_key(system, user),
+                    system=system,
+                    user=user,
+                )
+            )
+
+        try:
+            hits = self._cache_lookup([item.key for item in items])
+        except Exception:
+            # A broken cache must not stop judging
+            hits = [None] * len(items)
+
+        results: List[Optional[MetricResult]] = [
+            self._to_result(hit, cached=True) if hit is not None else None for hit in hits
+        ]
+        misses = [item for item, result in zip(items, results) if result is None]
+
+        if self.pack_size == 1:
+            judged = await asyncio.gather(
+                *(self._ajudge(item.system, item.user, item.key, None) for item in misses)
+            )
+            for item, result in zip(misses, judged):
+                results[item.index] = result
+        else:
+            for pack_results in await asyncio.gather(
+                *(self._ajudge_pack(pack) for pack in self._packs(misses))
+            ):
+                for index, result in pack_results:
+                    results[index] = result
+
+        return results
+
+    def compute_batch(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        predictions: Sequence[Dict[str, Any]],
+    ) -> List[MetricResult]:
+        """
+        Judge a whole chunk concurrently.
+
+        Chunks from every runner thread share the provider event loop,
+        so ``max_concurrency`` and the rate limits apply run-wide.
+        """
+        if len(examples) != len(predictions):
+            raise ValueError(
+                f"compute_batch received {len(examples)} examples "
+                f"but {len(predictions)} predictions"
+            )
+
+        return ProviderFactory.run(lambda: self.acompute_batch(examples, predictions))
+
 
 MetricRegistry.register(LLMJudgeMetric)
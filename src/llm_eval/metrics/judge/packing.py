@@ -0,0 +1,134 @@
+"""
+Multi-item judge prompts.
+
+Short QA items waste most of a judge request on the fixed rubric. In
+packed mode several (query, answer) pairs share one prompt and the
+judge returns a JSON array; entries are matched back by item id, so a
+reply that drops, reorders or mangles some entries only costs those
+items a retry.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+from llm_eval.metrics.judge.prompt_templates import JUDGE_BATCH_USER_PROMPT
+
+# Rough reply size of one array entry, used to fit packs into max_tokens
+REPLY_TOKENS_PER_ITEM = 64
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token
+    return len(text) // 4
+
+
+@dataclass(slots=True)
+class JudgeItem:
+    """
+    One row to judge.
+
+    Attributes:
+        index: position of the row in its chunk (also its item id)
+        query / answer: what the judge scores
+        key: cache key of the single-item prompt
+        system / user: single-item prompt, used when judged alone
+    """
+
+    index: int
+    query: Any
+    answer: Any
+    key: bytes
+    system: str
+    user: str
+
+    @property
+    def item_id(self) -> str:
+        return str(self.index)
+
+    def payload(self) -> Dict[str, Any]:
+        return {"id": self.item_id, "query": self.query, "answer": self.answer}
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(json.dumps(self.payload(), ensure_ascii=False))
+
+
+def pack_overhead_tokens(system: str) -> int:
+    """
+    Tokens spent on the rubric and instructions of every packed prompt.
+    """
+    return estimate_tokens(system) + estimate_tokens(JUDGE_BATCH_USER_PROMPT)
+
+
+def pack_items(
+    items: Sequence[JudgeItem],
+    *,
+    max_items: int,
+    token_budget: int,
+    overhead_tokens: int,
+) -> List[List[JudgeItem]]:
+    """
+    Greedily group items, in order, into packs that fit the token budget.
+
+    An item larger than the budget on its own still gets a pack (of one).
+    """
+    packs: List[List[JudgeItem]] = []
+    current: List[JudgeItem] = []
+    used = overhead_tokens
+
+    for item in items:
+        cost = item.tokens
+        if current and (len(current) >= max_items or used + cost > token_budget):
+            packs.append(current)
+            current, used = [], overhead_tokens
+        current.append(item)
+        used += cost
+
+    if current:
+        packs.append(current)
+
+    return packs
+
+
+def render_pack_prompt(items: Sequence[JudgeItem]) -> str:
+    return JUDGE_BATCH_USER_PROMPT.format(
+        items=json.dumps([item.payload() for item in items], ensure_ascii=False, indent=2)
+    )
+
+
+def parse_pack_reply(raw: str, item_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Map item id -> reply entry (without its id).
+
+    Entries with unknown or duplicate ids are ignored; missing ids are
+    simply absent. Raises ValueError if the reply is not a JSON array
+    (or an object wrapping one), including an empty (None) reply.
+    """
+    # Providers pass an empty message through as None
+    if not isinstance(raw, str):
+        raise ValueError("Judge reply is not text")
+    reply = json.loads(raw)
+
+    if isinstance(reply, dict):
+        arrays = [value for value in reply.values() if isinstance(value, list)]
+        if len(arrays) != 1:
+            raise ValueError("Judge reply is not a JSON array")
+        reply = arrays[0]
+
+    if not isinstance(reply, list):
+        raise ValueError("Judge reply is not a JSON array")
+
+    expected = set(item_ids)
+    entries: Dict[str, Dict[str, Any]] = {}
+
+    for entry in reply:
+        if not isinstance(entry, dict) or "id" not in entry:
+            continue
+        item_id = str(entry["id"])
+        if item_id in expected and item_id not in entries:
+            entries[item_id] = {k: v for k, v in entry.items() if k != "id"}
+
+    return entries
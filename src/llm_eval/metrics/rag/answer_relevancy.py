@@ -7,22 +7,23 @@ actually addresses the query.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, List, Tuple
 
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
 
-from llm_eval.metrics.base import BaseMetric, MetricResult
+from llm_eval.embeddings.encoding import paired_cosine
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.metrics.embedding import EmbeddingMetric
 from llm_eval.metrics.registry import MetricRegistry
 
 
-class AnswerRelevancyMetric(BaseMetric):
+class AnswerRelevancyMetric(EmbeddingMetric):
     """
     Answer relevancy metric.
 
     Strategy:
-    - Embed query
-    - Embed answer
-    - Compute cosine similarity
+    - Embed all queries and answers of a chunk in one batch
+    - Compute row-wise cosine similarity
     - Threshold-normalize score
     """
 
@@ -30,44 +31,29 @@ class AnswerRelevancyMetric(BaseMetric):
     requires_reference = False
     requires_context = False
 
-    def __init__(
-        self,
-        threshold: float = 0.5,
-        model_name: str = "all-MiniLM-L6-v2",
-        **kwargs: Any,
-    ) -> None:
+    def __init__(self, threshold: float = 0.5, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.threshold = threshold
-        self.model_name = model_name
 
-        # 🔴 CRITICAL: must exist for tests to mock
-        self._model = SentenceTransformer(self.model_name)
+    def score_columns(self, batch: ColumnBatch) -> Tuple[List[int], np.ndarray]:
+        rows = []
+        queries: List[str] = []
+        answers: List[str] = []
 
-    def compute(
-        self,
-        *,
-        example: Dict[str, Any],
-        prediction: Dict[str, Any],
-    ) -> MetricResult:
-        try:
-            query = example.get("query", "")
-            answer = prediction.get("answer", "")
+        for i, (query, answer) in enumerate(zip(batch.query, batch.answer)):
+            if query and answer:
+                rows.append(i)
+                queries.append(query)
+                answers.append(answer)
 
-            if not query or not answer:
-                return MetricResult(score=0.0)
+        if not rows:
+            return rows, np.zeros(0)
 
-            q_emb = self._model.encode(query, normalize_embeddings=True)
-            a_emb = self._model.encode(answer, normalize_embeddings=True)
+        embs = self._embed(queries, answers)
+        sims = paired_cosine(embs[: len(rows)], embs[len(rows):])
 
-            similarity = float(util.cos_sim(q_emb, a_emb).item())
-
-            # Normalize to [0, 1]
-            score = max(0.0, min(1.0, similarity / self.threshold))
-
-            return MetricResult(score=score)
-
-        except Exception as exc:
-            return MetricResult(score=0.0, error=str(exc))
+        # Normalize to [0, 1]
+        return rows, np.clip(sims / self.threshold, 0.0, 1.0)
 
 
 MetricRegistry.register(AnswerRelevancyMetric)
@@ -7,22 +7,23 @@ between query and retrieved contexts.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, List, Tuple
 
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
 
-from llm_eval.metrics.base import BaseMetric, MetricResult
+from llm_eval.embeddings.encoding import paired_cosine, segment_ids
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.metrics.embedding import EmbeddingMetric
 from llm_eval.metrics.registry import MetricRegistry
 
 
-class ContextRelevancyMetric(BaseMetric):
+class ContextRelevancyMetric(EmbeddingMetric):
     """
     Context relevancy metric.
 
     Strategy:
-    - Embed query
-    - Embed each retrieved context
-    - Compute mean cosine similarity
+    - Embed all queries and retrieved contexts of a chunk in one batch
+    - Compute per-row mean cosine similarity
     - Normalize using threshold
     """
 
@@ -30,56 +31,36 @@ class ContextRelevancyMetric(BaseMetric):
     requires_reference = False
     requires_context = True
 
-    _model: SentenceTransformer | None = None
-
-    def __init__(
-        self,
-        threshold: float = 0.5,
-        model_name: str = "all-MiniLM-L6-v2",
-        lazy_load: bool = True,
-        **kwargs: Any,
-    ) -> None:
+    def __init__(self, threshold: float = 0.5, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.threshold = threshold
-        self.model_name = model_name
-        self.lazy_load = lazy_load
-
-        if not lazy_load and ContextRelevancyMetric._model is None:
-            ContextRelevancyMetric._model = SentenceTransformer(model_name)
-
-    def _get_model(self) -> SentenceTransformer:
-        if ContextRelevancyMetric._model is None:
-            ContextRelevancyMetric._model = SentenceTransformer(self.model_name)
-        return ContextRelevancyMetric._model
-
-    def compute(
-        self,
-        *,
-        example: Dict[str, Any],
-        prediction: Dict[str, Any],
-    ) -> MetricResult:
-        try:
-            query = example.get("query", "")
-            contexts: List[str] = example.get("retrieved_contexts", [])
-
-            if not query or not contexts:
-                return MetricResult(score=0.0)
 
-            model = self._get_model()
+    def score_columns(self, batch: ColumnBatch) -> Tuple[List[int], np.ndarray]:
+        rows = []
+        queries: List[str] = []
+        contexts: List[str] = []
+        counts: List[int] = []
 
-            query_emb = model.encode(query, normalize_embeddings=True)
-            ctx_embs = model.encode(contexts, normalize_embeddings=True)
+        for i, (query, row_contexts) in enumerate(zip(batch.query, batch.retrieved_contexts)):
+            if query and row_contexts:
+                rows.append(i)
+                queries.append(query)
+                contexts.extend(row_contexts)
+                counts.append(len(row_contexts))
 
-            sims = util.cos_sim(query_emb, ctx_embs).flatten().tolist()
-            avg_sim = sum(sims) / len(sims)
+        if not rows:
+            return rows, np.zeros(0)
 
-            # Normalize to [0,1]
-            score = min(1.0, avg_sim / self.threshold)
+        embs = self._embed(queries + contexts)
 
-            return MetricResult(score=float(score))
+        # Pair every context with its own query, then average per row
+        owner = segment_ids(counts)
+        sims = paired_cosine(embs[owner], embs[len(queries):])
+        totals = np.bincount(owner, weights=sims, minlength=len(counts))
+        avg_sims = totals / np.asarray(counts)
 
-        except Exception as exc:
-            return MetricResult(score=0.0, error=str(exc))
+        # Normalize to [0,1]
+        return rows, np.minimum(1.0, avg_sims / self.threshold)
 
 
 MetricRegistry.register(ContextRelevancyMetric)
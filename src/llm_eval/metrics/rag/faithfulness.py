@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, List, Tuple
 
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
 
-from llm_eval.metrics.base import BaseMetric, MetricResult
+from llm_eval.embeddings.encoding import paired_cosine, segment_ids
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.metrics.embedding import EmbeddingMetric
 from llm_eval.metrics.registry import MetricRegistry
 
 
-class FaithfulnessMetric(BaseMetric):
+class FaithfulnessMetric(EmbeddingMetric):
     """
     Faithfulness metric — detects hallucinations.
     """
@@ -17,65 +19,45 @@ class FaithfulnessMetric(BaseMetric):
     requires_reference = False
     requires_context = True
 
-    _model: SentenceTransformer | None = None
-
-    def __init__(
-        self,
-        threshold: float = 0.6,
-        model_name: str = "all-MiniLM-L6-v2",
-        lazy_load: bool = True,
-        **kwargs: Any,
-    ) -> None:
+    def __init__(self, threshold: float = 0.6, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.threshold = threshold
-        self.model_name = model_name
-        self.lazy_load = lazy_load
-
-        if not lazy_load and FaithfulnessMetric._model is None:
-            FaithfulnessMetric._model = SentenceTransformer(model_name)
-
-    def _get_model(self) -> SentenceTransformer:
-        if FaithfulnessMetric._model is None:
-            FaithfulnessMetric._model = SentenceTransformer(self.model_name)
-        return FaithfulnessMetric._model
 
     @staticmethod
     def _split_claims(text: str) -> List[str]:
         return [s.strip() for s in text.split(".") if s.strip()]
 
-    def compute(
-        self,
-        *,
-        example: Dict[str, Any],
-        prediction: Dict[str, Any],
-    ) -> MetricResult:
-        try:
-            answer = prediction.get("answer", "")
-            contexts = example.get("retrieved_contexts", [])
+    def score_columns(self, batch: ColumnBatch) -> Tuple[List[int], np.ndarray]:
+        rows = []
+        context_texts: List[str] = []
+        claims: List[str] = []
+        counts: List[int] = []
 
+        for i, (answer, contexts) in enumerate(zip(batch.answer, batch.retrieved_contexts)):
             if not answer or not contexts:
-                return MetricResult(score=0.0)
-
-            claims = self._split_claims(answer)
-            if not claims:
-                return MetricResult(score=0.0)
+                continue
 
-            model = self._get_model()
+            row_claims = self._split_claims(answer)
+            if not row_claims:
+                continue
 
-            context_text = " ".join(contexts)
-            ctx_emb = model.encode(context_text, normalize_embeddings=True)
+            rows.append(i)
+            context_texts.append(" ".join(contexts))
+            claims.extend(row_claims)
+            counts.append(len(row_claims))
 
-            supported = 0
-            for claim in claims:
-                claim_emb = model.encode(claim, normalize_embeddings=True)
-                sim = util.cos_sim(claim_emb, ctx_emb).item()
-                if sim >= self.threshold:
-                    supported += 1
+        if not rows:
+            return rows, np.zeros(0)
 
-            return MetricResult(score=supported / len(claims))
+        embs = self._embed(context_texts, claims)
 
-        except Exception as exc:
-            return MetricResult(score=0.0, error=str(exc))
+        # Every claim is compared against its own row's context
+        owner = segment_ids(counts)
+        sims = paired_cosine(embs[len(context_texts):], embs[owner])
+        supported = np.bincount(
+            owner, weights=sims >= self.threshold, minlength=len(counts)
+        )
+        return rows, supported / np.asarray(counts)
 
 
 MetricRegistry.register(FaithfulnessMetric)
@@ -4,79 +4,47 @@ BERTScore metric implementation using sentence-transformers.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import List, Tuple
 
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
 
-from llm_eval.metrics.base import BaseMetric, MetricResult
+from llm_eval.embeddings.encoding import paired_cosine
+from llm_eval.data.columnar import ColumnBatch
+from llm_eval.metrics.embedding import EmbeddingMetric
 from llm_eval.metrics.registry import MetricRegistry
 
 
-class BERTScoreMetric(BaseMetric):
+class BERTScoreMetric(EmbeddingMetric):
     """
     BERTScore using cosine similarity of sentence embeddings.
+
+    Embeddings come from the run-scoped store shared with the other
+    embedding metrics (bounded by ``embedding_cache.max_memory_bytes``).
     """
 
     name = "bertscore"
     requires_reference = True
     requires_context = False
 
-    _model: SentenceTransformer | None = None
-    _embedding_cache: Dict[str, np.ndarray] = {}
-
-    def __init__(
-        self,
-        model_name: str = "all-MiniLM-L6-v2",
-        lazy_load: bool = True,
-        **kwargs: Any,
-    ) -> None:
-        super().__init__(**kwargs)
-        self.model_name = model_name
-        self.lazy_load = lazy_load
-
-        if not lazy_load and BERTScoreMetric._model is None:
-            BERTScoreMetric._model = SentenceTransformer(model_name)
-
-    def _get_model(self) -> SentenceTransformer:
-        if BERTScoreMetric._model is None:
-            BERTScoreMetric._model = SentenceTransformer(self.model_name)
-        return BERTScoreMetric._model
-
-
-    def _embed(self, text: str) -> np.ndarray:
-        if text not in self._embedding_cache:
-            model = self._get_model()
-            emb = model.encode(text, normalize_embeddings=True)
-            self._embedding_cache[text] = emb
-        return self._embedding_cache[text]
-
-
-    def compute(
-        self,
-        *,
-        example: Dict[str, Any],
-        prediction: Dict[str, Any],
-    ) -> MetricResult:
-        try:
-            reference = example.get("expected_answer", "")
-            candidate = prediction.get("answer", "")
-
-            if not reference or not candidate:
-                return MetricResult(score=0.0)
-
-            ref_emb = self._embed(reference)
-            cand_emb = self._embed(candidate)
+    def score_columns(self, batch: ColumnBatch) -> Tuple[List[int], np.ndarray]:
+        rows = []
+        references: List[str] = []
+        candidates: List[str] = []
 
-            score = util.cos_sim(ref_emb, cand_emb).item()
+        for i, (reference, candidate) in enumerate(zip(batch.expected_answer, batch.answer)):
+            if reference and candidate:
+                rows.append(i)
+                references.append(reference)
+                candidates.append(candidate)
 
-            # cosine similarity → normalize to [0,1]
-            score = (score + 1) / 2
+        if not rows:
+            return rows, np.zeros(0)
 
-            return MetricResult(score=float(max(0.0, min(1.0, score))))
+        embs = self._embed(references, candidates)
+        sims = paired_cosine(embs[: len(rows)], embs[len(rows):])
 
-        except Exception as exc:
-            return MetricResult(score=0.0, error=str(exc))
+        # cosine similarity → normalize to [0,1]
+        return rows, np.clip((sims + 1) / 2, 0.0, 1.0)
 
 
 MetricRegistry.register(BERTScoreMetric)
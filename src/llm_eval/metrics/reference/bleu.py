@@ -2,16 +2,20 @@
 BLEU score metric implementation.
 
 Uses simple whitespace tokenization to ensure
-CI safety and deterministic behavior.
+CI safety and deterministic behavior. Scoring is done by the in-house
+BLEUEngine, which matches NLTK's sentence_bleu with method1 smoothing.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Sequence
 
-from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
+import numpy as np
 
+from llm_eval.data.columnar import ColumnBatch
 from llm_eval.metrics.base import BaseMetric, MetricResult
+from llm_eval.metrics.reference.bleu_engine import BLEUEngine, BLEUStats
 from llm_eval.metrics.registry import MetricRegistry
 
 
@@ -19,20 +23,25 @@ class BLEUMetric(BaseMetric):
     """
     BLEU score metric (sentence-level).
 
-    Supports configurable n-gram order (1–4).
+    Supports configurable n-gram order (1–4). With ``corpus=True`` the
+    clipped counts of every scored row are also summed into a corpus
+    BLEU, reported through ``corpus_state()`` / ``corpus_stats()``.
     """
 
     name = "bleu"
     requires_reference = True
     requires_context = False
 
-    def __init__(self, n_gram: int = 4, **kwargs: Any) -> None:
+    def __init__(self, n_gram: int = 4, corpus: bool = True, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         if not 1 <= n_gram <= 4:
             raise ValueError("BLEU n_gram must be between 1 and 4")
         self.n_gram = n_gram
-        self.weights = tuple([1.0 / n_gram] * n_gram)
-        self.smoothing = SmoothingFunction().method1
+        self.corpus = corpus
+        self.engine = BLEUEngine(max_order=n_gram)
+
+        self._corpus_stats = BLEUStats.empty(n_gram).summed()
+        self._corpus_lock = threading.Lock()
 
     @staticmethod
     def _tokenize(text: str) -> List[str]:
@@ -45,30 +54,92 @@ class BLEUMetric(BaseMetric):
         example: Dict[str, Any],
         prediction: Dict[str, Any],
     ) -> MetricResult:
-        try:
-            reference = example.get("expected_answer", "")
-            candidate = prediction.get("answer", "")
-
-            if not reference or not candidate:
-                return MetricResult(score=0.0)
-
-            ref_tokens = self._tokenize(reference)
-            cand_tokens = self._tokenize(candidate)
-
-            if not ref_tokens or not cand_tokens:
-                return MetricResult(score=0.0)
+        return self.compute_batch([example], [prediction])[0]
 
-            score = sentence_bleu(
-                [ref_tokens],
-                cand_tokens,
-                weights=self.weights,
-                smoothing_function=self.smoothing,
-            )
-
-            return MetricResult(score=float(max(0.0, min(1.0, score))))
+    def compute_batch(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        predictions: Sequence[Dict[str, Any]],
+    ) -> List[MetricResult]:
+        return self.compute_columns(ColumnBatch.from_rows(examples, predictions))
+
+    def compute_columns(self, batch: ColumnBatch) -> List[MetricResult]:
+        results = [MetricResult(score=0.0) for _ in range(len(batch))]
+
+        rows = []
+        references: List[List[str]] = []
+        candidates: List[List[str]] = []
+
+        for i, (reference, candidate) in enumerate(zip(batch.expected_answer, batch.answer)):
+            # A malformed row fails alone and stays out of the corpus counts
+            try:
+                ref_tokens = self._tokenize(reference or "")
+                cand_tokens = self._tokenize(candidate or "")
+            except Exception as exc:
+                results[i] = MetricResult(score=0.0, error=str(exc))
+                continue
+
+            if ref_tokens and cand_tokens:
+                rows.append(i)
+                references.append(ref_tokens)
+                candidates.append(cand_tokens)
+
+        if not rows:
+            return results
 
+        try:
+            stats = self.engine.sentence_stats(references, candidates)
+            scores = np.clip(self.engine.scores(stats), 0.0, 1.0)
         except Exception as exc:
-            return MetricResult(score=0.0, error=str(exc))
-
+            for i in rows:
+                results[i] = MetricResult(score=0.0, error=str(exc))
+            return results
+
+        # Only counts of rows that were scored go into the corpus
+        if self.corpus:
+            self._accumulate(stats)
+
+        for i, score in zip(rows, scores):
+            results[i] = MetricResult(score=float(score))
+
+        return results
+
+    def _accumulate(self, stats: BLEUStats) -> None:
+        chunk = stats.summed()
+        with self._corpus_lock:
+            self._corpus_stats = (self._corpus_stats + chunk).summed()
+
+    def corpus_score(self) -> float:
+        """
+        Corpus BLEU over every row scored so far.
+        """
+        with self._corpus_lock:
+            stats = self._corpus_stats
+        return self.engine.corpus_score(stats)
+
+    def corpus_state(self) -> Dict[str, Any]:
+        if not self.corpus:
+            return {}
+        with self._corpus_lock:
+            stats = self._corpus_stats
+        return {
+            "matches": stats.matches[0].tolist(),
+            "totals": stats.totals[0].tolist(),
+            "hyp_len": int(stats.hyp_lens[0]),
+            "ref_len": int(stats.ref_lens[0]),
+        }
+
+    @classmethod
+    def corpus_stats(cls, state: Dict[str, Any]) -> Dict[str, Any]:
+        if not state:
+            return {}
+        stats = BLEUStats(
+            matches=np.asarray([state["matches"]], dtype=np.int64),
+            totals=np.asarray([state["totals"]], dtype=np.int64),
+            hyp_lens=np.asarray([state["hyp_len"]], dtype=np.int64),
+            ref_lens=np.asarray([state["ref_len"]], dtype=np.int64),
+        )
+        engine = BLEUEngine(max_order=len(state["matches"]))
+        return {"corpus_bleu": engine.corpus_score(stats)}
 
 MetricRegistry.register(BLEUMetric)
@@ -0,0 +1,188 @@
+"""
+In-house BLEU engine.
+
+Reproduces NLTK's ``sentence_bleu`` / ``corpus_bleu`` with
+``SmoothingFunction().method1`` (single reference), without NLTK's
+per-call overhead:
+
+- Tokens are interned to integer ids once per chunk
+- n-grams of every order are packed into single ints in one pass
+  over the hypothesis (no tuple building, no Counter)
+- Sentence scores for a chunk are computed with NumPy
+- Clipped counts are kept, so corpus BLEU is just a sum of the same
+  statistics, with no second traversal of the data
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class BLEUStats:
+    """
+    Sufficient statistics for BLEU over a set of sentences.
+
+    Attributes:
+        matches: clipped n-gram matches, shape (rows, max_order)
+        totals: n-gram precision denominators, max(1, count), same shape
+        hyp_lens: hypothesis lengths, shape (rows,)
+        ref_lens: reference lengths, shape (rows,)
+    """
+
+    matches: np.ndarray
+    totals: np.ndarray
+    hyp_lens: np.ndarray
+    ref_lens: np.ndarray
+
+    @classmethod
+    def empty(cls, max_order: int) -> "BLEUStats":
+        return cls(
+            matches=np.zeros((0, max_order), dtype=np.int64),
+            totals=np.zeros((0, max_order), dtype=np.int64),
+            hyp_lens=np.zeros(0, dtype=np.int64),
+            ref_lens=np.zeros(0, dtype=np.int64),
+        )
+
+    def summed(self) -> "BLEUStats":
+        """
+        Collapse all rows into one corpus-level row.
+        """
+        return BLEUStats(
+            matches=self.matches.sum(axis=0, keepdims=True),
+            totals=self.totals.sum(axis=0, keepdims=True),
+            hyp_lens=self.hyp_lens.sum(keepdims=True),
+            ref_lens=self.ref_lens.sum(keepdims=True),
+        )
+
+    def __add__(self, other: "BLEUStats") -> "BLEUStats":
+        return BLEUStats(
+            matches=np.concatenate([self.matches, other.matches]),
+            totals=np.concatenate([self.totals, other.totals]),
+            hyp_lens=np.concatenate([self.hyp_lens, other.hyp_lens]),
+            ref_lens=np.concatenate([self.ref_lens, other.ref_lens]),
+        )
+
+
+class BLEUEngine:
+    """
+    Vectorized sentence and corpus BLEU over whitespace tokens.
+    """
+
+    def __init__(self, max_order: int = 4, epsilon: float = 0.1) -> None:
+        if not 1 <= max_order <= 4:
+            raise ValueError("BLEU n_gram must be between 1 and 4")
+        self.max_order = max_order
+        self.weights = np.full(max_order, 1.0 / max_order)
+        self.epsilon = epsilon
+
+    def _ngram_counts(
+        self,
+        ids: Sequence[int],
+        bits: int,
+    ) -> List[Dict[int, int]]:
+        """
+        Count n-grams of every order in one pass.
+
+        A rolling window packs the last ``max_order`` ids into one int;
+        masking it yields the code of the n-gram ending at each position.
+        """
+        counts: List[Dict[int, int]] = [{} for _ in range(self.max_order)]
+        masks = [(1 << (bits * n)) - 1 for n in range(1, self.max_order + 1)]
+        window_mask = masks[-1]
+
+        code = 0
+        for k, token in enumerate(ids):
+            code = ((code << bits) | token) & window_mask
+            for n in range(min(k + 1, self.max_order)):
+                gram = code & masks[n]
+                order_counts = counts[n]
+                order_counts[gram] = order_counts.get(gram, 0) + 1
+
+        return counts
+
+    def sentence_stats(
+        self,
+        references: Sequence[Sequence[str]],
+        hypotheses: Sequence[Sequence[str]],
+    ) -> BLEUStats:
+        """
+        Compute clipped n-gram statistics for aligned sentence pairs.
+        """
+        rows = len(hypotheses)
+        if rows == 0:
+            return BLEUStats.empty(self.max_order)
+
+        vocab: Dict[str, int] = {}
+        ref_ids = [[vocab.setdefault(t, len(vocab)) for t in ref] for ref in references]
+        hyp_ids = [[vocab.setdefault(t, len(vocab)) for t in hyp] for hyp in hypotheses]
+        bits = max(1, len(vocab).bit_length())
+
+        matches = np.zeros((rows, self.max_order), dtype=np.int64)
+        totals = np.zeros((rows, self.max_order), dtype=np.int64)
+
+        for i, (ref, hyp) in enumerate(zip(ref_ids, hyp_ids)):
+            hyp_counts = self._ngram_counts(hyp, bits)
+            ref_counts = self._ngram_counts(ref, bits)
+
+            for n in range(self.max_order):
+                ref_order = ref_counts[n]
+                matched = 0
+                for gram, count in hyp_counts[n].items():
+                    ref_count = ref_order.get(gram, 0)
+                    matched += count if count < ref_count else ref_count
+                matches[i, n] = matched
+                totals[i, n] = max(1, len(hyp) - n)
+
+        hyp_lens = np.fromiter((len(h) for h in hyp_ids), dtype=np.int64, count=rows)
+        ref_lens = np.fromiter((len(r) for r in ref_ids), dtype=np.int64, count=rows)
+
+        return BLEUStats(matches, totals, hyp_lens, ref_lens)
+
+    def scores(self, stats: BLEUStats) -> np.ndarray:
+        """
+        BLEU score for every row of ``stats`` (method1 smoothing).
+        """
+        matches = stats.matches.astype(np.float64)
+        totals = stats.totals.astype(np.float64)
+
+        # method1: add epsilon to zero-match orders
+        precisions = np.where(matches == 0, self.epsilon, matches) / totals
+        log_mean = (np.log(precisions) * self.weights).sum(axis=1)
+
+        hyp_lens = stats.hyp_lens.astype(np.float64)
+        ref_lens = stats.ref_lens.astype(np.float64)
+        brevity = np.where(
+            hyp_lens > ref_lens,
+            1.0,
+            np.exp(1.0 - ref_lens / np.maximum(hyp_lens, 1.0)),
+        )
+        brevity = np.where(hyp_lens == 0, 0.0, brevity)
+
+        bleu = brevity * np.exp(log_mean)
+
+        # No unigram match means no match at any order
+        return np.where(stats.matches[:, 0] == 0, 0.0, bleu)
+
+    def corpus_score(self, stats: BLEUStats) -> float:
+        """
+        Corpus BLEU from summed statistics (matches NLTK's corpus_bleu).
+        """
+        if len(stats.hyp_lens) == 0 or not stats.hyp_lens.sum():
+            return 0.0
+        return float(self.scores(stats.summed())[0])
+
+    def score_pairs(
+        self,
+        references: Sequence[Sequence[str]],
+        hypotheses: Sequence[Sequence[str]],
+    ) -> Tuple[np.ndarray, BLEUStats]:
+        """
+        Convenience: sentence scores plus the statistics they came from.
+        """
+        stats = self.sentence_stats(references, hypotheses)
+        return self.scores(stats), stats
+
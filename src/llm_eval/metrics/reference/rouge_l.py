@@ -4,22 +4,55 @@ ROUGE-L metric implementation.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence
 
+import numpy as np
+
+from llm_eval.data.columnar import ColumnBatch
 from llm_eval.metrics.base import BaseMetric, MetricResult
 from llm_eval.metrics.registry import MetricRegistry
 
 
+def _intern(
+    tokens: Sequence[str],
+    vocab: Dict[str, int],
+) -> List[int]:
+    """Map tokens to integer ids, extending vocab as needed."""
+    return [vocab.setdefault(token, len(vocab)) for token in tokens]
+
+
+def _lcs_length_ids(x: Sequence[int], y: Sequence[int]) -> int:
+    """
+    Bit-parallel LCS length (Crochemore et al., 2001).
+
+    Each position of the longer sequence is one bit of a Python int,
+    so memory is O(len) and each step of the loop over the shorter
+    sequence updates a whole DP row with a handful of big-int operations.
+    """
+    if len(x) > len(y):
+        x, y = y, x
+    if not x:
+        return 0
+
+    # match[token] = bitmask of positions in y holding that token
+    match: Dict[int, int] = {}
+    for j, token in enumerate(y):
+        match[token] = match.get(token, 0) | (1 << j)
+
+    full = (1 << len(y)) - 1
+    v = full
+    for token in x:
+        u = v & match.get(token, 0)
+        v = ((v + u) | (v - u)) & full
+
+    # zero bits in v mark LCS positions
+    return len(y) - bin(v).count("1")
+
+
 def _lcs_length(x: List[str], y: List[str]) -> int:
     """Compute length of Longest Common Subsequence."""
-    dp = [[0] * (len(y) + 1) for _ in range(len(x) + 1)]
-    for i in range(1, len(x) + 1):
-        for j in range(1, len(y) + 1):
-            if x[i - 1] == y[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
-            else:
-                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
-    return dp[-1][-1]
+    vocab: Dict[str, int] = {}
+    return _lcs_length_ids(_intern(x, vocab), _intern(y, vocab))
 
 
 class RougeLMetric(BaseMetric):
@@ -37,29 +70,50 @@ class RougeLMetric(BaseMetric):
         example: Dict[str, Any],
         prediction: Dict[str, Any],
     ) -> MetricResult:
-        try:
-            reference = example.get("expected_answer", "")
-            candidate = prediction.get("answer", "")
+        return self.compute_batch([example], [prediction])[0]
 
+    def compute_batch(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        predictions: Sequence[Dict[str, Any]],
+    ) -> List[MetricResult]:
+        return self.compute_columns(ColumnBatch.from_rows(examples, predictions))
+
+    def compute_columns(self, batch: ColumnBatch) -> List[MetricResult]:
+        # One vocabulary per chunk: tokens are compared as small ints
+        vocab: Dict[str, int] = {}
+        lcs = np.zeros(len(batch), dtype=np.float64)
+        ref_lens = np.zeros(len(batch), dtype=np.float64)
+        cand_lens = np.zeros(len(batch), dtype=np.float64)
+        errors: Dict[int, str] = {}
+
+        for i, (reference, candidate) in enumerate(zip(batch.expected_answer, batch.answer)):
             if not reference or not candidate:
-                return MetricResult(score=0.0)
-
-            ref_tokens = reference.lower().split()
-            cand_tokens = candidate.lower().split()
-
-            lcs = _lcs_length(ref_tokens, cand_tokens)
-            recall = lcs / len(ref_tokens)
-            precision = lcs / len(cand_tokens)
-
-            if recall + precision == 0:
-                score = 0.0
-            else:
-                score = (2 * recall * precision) / (recall + precision)
-
-            return MetricResult(score=float(max(0.0, min(1.0, score))))
-
-        except Exception as exc:
-            return MetricResult(score=0.0, error=str(exc))
-
+                continue
+
+            # A malformed row fails alone, not its whole chunk
+            try:
+                ref_ids = _intern(reference.lower().split(), vocab)
+                cand_ids = _intern(candidate.lower().split(), vocab)
+                lcs[i] = _lcs_length_ids(ref_ids, cand_ids)
+            except Exception as exc:
+                errors[i] = str(exc)
+                continue
+
+            ref_lens[i] = len(ref_ids)
+            cand_lens[i] = len(cand_ids)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            recall = np.where(ref_lens > 0, lcs / ref_lens, 0.0)
+            precision = np.where(cand_lens > 0, lcs / cand_lens, 0.0)
+            total = recall + precision
+            scores = np.where(total > 0, 2 * recall * precision / total, 0.0)
+
+        return [
+            MetricResult(score=0.0, error=errors[i])
+            if i in errors
+            else MetricResult(score=float(score))
+            for i, score in enumerate(np.clip(scores, 0.0, 1.0))
+        ]
 
 MetricRegistry.register(RougeLMetric)
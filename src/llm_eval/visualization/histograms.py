@@ -7,15 +7,16 @@ Purpose:
 """
 
 from pathlib import Path
-from typing import Dict, List
-import json
+from typing import Dict, Sequence
 
 import matplotlib.pyplot as plt
 
+from llm_eval.evaluation.results import find_raw_scores
+
 
 def plot_histograms(
     *,
-    scores: Dict[str, List[float]],
+    scores: Dict[str, Sequence[float]],
     output_dir: Path,
     bins: int = 20,
 ) -> None:
@@ -23,14 +24,14 @@ def plot_histograms(
     Generate histogram plots for each metric.
 
     Args:
-        scores: {metric_name: [scores]}
+        scores: {metric_name: scores} (lists or arrays)
         output_dir: directory to save PNGs
         bins: number of histogram bins
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
     for metric, values in scores.items():
-        if not values:
+        if len(values) == 0:
             # Skip empty metrics safely
             continue
 
@@ -56,17 +57,10 @@ def generate_histograms(
     Load raw scores from evaluation output and generate histograms.
 
     Expected file:
-    results/raw_scores.json
+    results/raw_scores.npz (memory-mapped; raw_scores.json is used
+    for runs that only have the JSON export)
     """
-    raw_scores_path = results_dir / "raw_scores.json"
-
-    if not raw_scores_path.exists():
-        raise FileNotFoundError(
-            "raw_scores.json not found. Run evaluation first."
-        )
-
-    with raw_scores_path.open("r", encoding="utf-8") as f:
-        raw_scores = json.load(f)
+    raw_scores = find_raw_scores(results_dir)
 
     screenshots_dir.mkdir(parents=True, exist_ok=True)
 
@@ -83,8 +77,7 @@ if __name__ == "__main__":
     results_dir = Path("results")
     screenshots_dir = Path("screenshots")
 
-    with open(results_dir / "raw_scores.json", "r", encoding="utf-8") as f:
-        raw_scores = json.load(f)
+    raw_scores = find_raw_scores(results_dir)
 
     screenshots_dir.mkdir(exist_ok=True)
 
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def fake_encoder(mocker):
+    """
+    Build a mock SentenceTransformer whose encode() looks up fixed vectors.
+
+    Usage: model = fake_encoder({"text": [1.0, 0.0], ...})
+    """
+
+    def build(vectors):
+        def encode(texts, **kwargs):
+            if isinstance(texts, str):
+                return np.asarray(vectors[texts], dtype=np.float32)
+            return np.stack([np.asarray(vectors[t], dtype=np.float32) for t in texts])
+
+        model = mocker.Mock()
+        model.encode.side_effect = encode
+        return model
+
+    return build
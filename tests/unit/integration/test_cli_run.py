@@ -22,5 +22,5 @@ def test_full_cli_run(tmp_path):
     )
 
     assert result.returncode == 0
-    assert (output_dir / "raw_scores.json").exists()
+    assert (output_dir / "raw_scores.npz").exists()
     assert (output_dir / "aggregates.json").exists()
@@ -0,0 +1,77 @@
+import json
+import statistics
+
+import numpy as np
+import pytest
+
+from llm_eval.evaluation.aggregator import Aggregator, QuantileSketch
+
+
+def test_aggregate_matches_statistics():
+    scores = [0.1, 0.9, 0.4, 0.4, 0.0, 1.0]
+    summary = Aggregator.aggregate(scores)
+
+    assert summary["mean"] == pytest.approx(statistics.mean(scores))
+    assert summary["median"] == statistics.median(scores)
+    assert summary["std"] == pytest.approx(statistics.pstdev(scores))
+    assert (summary["min"], summary["max"], summary["count"]) == (0.0, 1.0, 6)
+
+
+def test_aggregate_empty():
+    assert Aggregator.aggregate([]) == {
+        "mean": 0.0,
+        "median": 0.0,
+        "std": 0.0,
+        "min": 0.0,
+        "max": 0.0,
+        "count": 0,
+        "p5": 0.0,
+        "p95": 0.0,
+    }
+
+
+@pytest.mark.parametrize("capacity", [10_000, 64])
+def test_merged_partials_equal_single_pass(capacity):
+    rng = np.random.default_rng(0)
+    scores = rng.beta(2, 5, size=1000)
+
+    single = Aggregator(sketch=QuantileSketch(capacity=capacity))
+    for chunk in np.array_split(scores, 7):
+        single.update(chunk)
+
+    parts = []
+    for shard in np.array_split(scores[::-1], 3):
+        part = Aggregator(sketch=QuantileSketch(capacity=capacity))
+        parts.append(part.update(shard))
+    merged = parts[2].merge(parts[0]).merge(parts[1])
+
+    a, b = single.summary(), merged.summary()
+    for key in ("count", "min", "max", "median", "p5", "p95"):
+        assert a[key] == b[key]
+    assert a["mean"] == pytest.approx(b["mean"], rel=1e-12)
+    assert a["std"] == pytest.approx(b["std"], rel=1e-12)
+    assert single.histogram.tolist() == merged.histogram.tolist()
+    assert single.histogram.sum() == 1000
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(1)
+    scores = np.concatenate([np.zeros(500), rng.uniform(0.01, 1.0, size=20_000)])
+
+    aggregator = Aggregator(sketch=QuantileSketch(capacity=256, relative_accuracy=0.01))
+    for chunk in np.array_split(scores, 40):
+        aggregator.update(chunk)
+    assert not aggregator.sketch.exact
+
+    for q in (0.05, 0.5, 0.95):
+        assert aggregator.quantile(q) == pytest.approx(np.quantile(scores, q), rel=0.02)
+    assert aggregator.quantile(0.0) == 0.0
+
+
+def test_state_round_trips_through_json():
+    aggregator = Aggregator(sketch=QuantileSketch(capacity=8)).update([0.2, 0.5, 0.7] * 5)
+    restored = Aggregator.from_dict(json.loads(json.dumps(aggregator.to_dict())))
+
+    assert restored.summary() == aggregator.summary()
+    restored.merge(Aggregator().update([1.0]))
+    assert restored.summary()["count"] == 16
@@ -1,17 +1,18 @@
-import numpy as np
 from llm_eval.metrics.rag.answer_relevancy import AnswerRelevancyMetric
 
 
-def test_answer_relevancy_off_topic(mocker):
+def test_answer_relevancy_off_topic(mocker, fake_encoder):
     metric = AnswerRelevancyMetric()
 
     mocker.patch.object(
-        metric._model,
-        "encode",
-        side_effect=[
-            np.array([1.0, 0.0]),  # query
-            np.array([0.0, 1.0]),  # answer
-        ],
+        metric,
+        "_get_model",
+        return_value=fake_encoder(
+            {
+                "Explain neural networks": [1.0, 0.0],  # query
+                "The capital of France is Paris": [0.0, 1.0],  # answer
+            }
+        ),
     )
 
     example = {"query": "Explain neural networks"}
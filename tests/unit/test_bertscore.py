@@ -10,10 +10,7 @@ def test_bertscore_semantic_similarity_mocked(mocker):
     mocker.patch.object(
         metric,
         "_embed",
-        side_effect=[
-            np.array([1.0, 0.0]),
-            np.array([0.9, 0.1]),
-        ],
+        return_value=np.array([[1.0, 0.0], [0.9, 0.1]]),
     )
 
     example = {"expected_answer": "A cat sits on the mat"}
@@ -24,6 +21,27 @@ def test_bertscore_semantic_similarity_mocked(mocker):
     assert 0.8 < result.score <= 1.0
 
 
+def test_bertscore_batch_encodes_once(mocker, fake_encoder):
+    metric = BERTScoreMetric(lazy_load=True)
+    model = fake_encoder(
+        {
+            "ref a": [1.0, 0.0],
+            "cand a": [1.0, 0.0],
+            "ref b": [1.0, 0.0],
+            "cand b": [-1.0, 0.0],
+        }
+    )
+    mocker.patch.object(metric, "_get_model", return_value=model)
+
+    results = metric.compute_batch(
+        [{"expected_answer": "ref a"}, {"expected_answer": ""}, {"expected_answer": "ref b"}],
+        [{"answer": "cand a"}, {"answer": "cand x"}, {"answer": "cand b"}],
+    )
+
+    assert [r.score for r in results] == [1.0, 0.0, 0.0]
+    assert model.encode.call_count == 1
+
+
 def test_bertscore_empty():
     metric = BERTScoreMetric(lazy_load=True)
     example = {"expected_answer": "Some text"}
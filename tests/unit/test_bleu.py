@@ -1,4 +1,10 @@
+import random
+
+import pytest
+from nltk.translate.bleu_score import SmoothingFunction, corpus_bleu, sentence_bleu
+
 from llm_eval.metrics.reference.bleu import BLEUMetric
+from llm_eval.metrics.reference.bleu_engine import BLEUEngine
 
 
 def test_bleu_exact_match():
@@ -15,3 +21,66 @@ def test_bleu_empty_prediction():
     prediction = {"answer": ""}
     result = metric.compute(example=example, prediction=prediction)
     assert result.score == 0.0
+
+
+def _random_sentence(rng, vocab, max_len):
+    return [rng.choice(vocab) for _ in range(rng.randint(1, max_len))]
+
+
+def test_bleu_matches_nltk_sentence_and_corpus():
+    rng = random.Random(13)
+    vocab = ["the", "cat", "sat", "on", "mat", "a", "dog", "ran"]
+    refs = [_random_sentence(rng, vocab, 12) for _ in range(150)]
+    hyps = [_random_sentence(rng, vocab, 12) for _ in range(150)]
+    smoothing = SmoothingFunction().method1
+
+    for n_gram in (1, 2, 4):
+        engine = BLEUEngine(max_order=n_gram)
+        weights = tuple([1.0 / n_gram] * n_gram)
+        stats = engine.sentence_stats(refs, hyps)
+
+        expected = [
+            sentence_bleu([r], h, weights=weights, smoothing_function=smoothing)
+            for r, h in zip(refs, hyps)
+        ]
+        assert engine.scores(stats) == pytest.approx(expected, abs=1e-12)
+
+        expected_corpus = corpus_bleu(
+            [[r] for r in refs], hyps, weights=weights, smoothing_function=smoothing
+        )
+        assert engine.corpus_score(stats) == pytest.approx(expected_corpus, abs=1e-12)
+
+
+def test_bleu_metric_reports_corpus_score():
+    metric = BLEUMetric(n_gram=2)
+    examples = [{"expected_answer": "paris is in france"}, {"expected_answer": "berlin"}]
+    predictions = [{"answer": "paris is in france"}, {"answer": "rome"}]
+
+    metric.compute_batch(examples[:1], predictions[:1])
+    metric.compute_batch(examples[1:], predictions[1:])
+
+    expected = corpus_bleu(
+        [[["paris", "is", "in", "france"]], [["berlin"]]],
+        [["paris", "is", "in", "france"], ["rome"]],
+        weights=(0.5, 0.5),
+        smoothing_function=SmoothingFunction().method1,
+    )
+    assert metric.corpus_score() == pytest.approx(expected)
+    assert BLEUMetric.corpus_stats(metric.corpus_state()) == {
+        "corpus_bleu": pytest.approx(expected)
+    }
+
+
+def test_bleu_bad_row_fails_alone_and_skips_corpus():
+    metric = BLEUMetric(n_gram=2)
+    examples = [{"expected_answer": "paris is in france"}] * 3
+    predictions = [{"answer": "paris is in france"}, {"answer": 123}, {"answer": "paris"}]
+
+    results = metric.compute_batch(examples, predictions)
+
+    assert [r.error is None for r in results] == [True, False, True]
+    assert results[0].score == pytest.approx(1.0)
+
+    clean = BLEUMetric(n_gram=2)
+    clean.compute_batch([examples[0], examples[2]], [predictions[0], predictions[2]])
+    assert metric.corpus_state() == clean.corpus_state()
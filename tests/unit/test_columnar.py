@@ -0,0 +1,179 @@
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+feather = pytest.importorskip("pyarrow.feather")
+
+import llm_eval.metrics  # noqa: F401,E402
+from llm_eval.config.schema import MetricConfig  # noqa: E402
+from llm_eval.data.columnar import ArrowDataset, ColumnBatch  # noqa: E402
+from llm_eval.data.dataset_loader import (  # noqa: E402
+    DatasetLoadError,
+    open_dataset,
+    validate_dataset,
+)
+from llm_eval.data.predictions import (  # noqa: E402
+    ArrowPredictionIndex,
+    JoinReport,
+    join_by_id,
+    open_prediction_index,
+)
+from llm_eval.evaluation.runner import EvaluationRunner  # noqa: E402
+from llm_eval.metrics.reference.bleu import BLEUMetric  # noqa: E402
+from llm_eval.metrics.reference.rouge_l import RougeLMetric  # noqa: E402
+
+
+def _rows(n):
+    return [
+        {
+            "id": f"q{i}",
+            "query": f"question {i}",
+            "expected_answer": f"the answer is {i}",
+            "retrieved_contexts": [f"context {i}"],
+            "difficulty": "easy",
+            "category": "test",
+        }
+        for i in range(n)
+    ]
+
+
+def _predictions(ids):
+    return [{"id": row_id, "prediction": f"the answer is {row_id[1:]}"} for row_id in ids]
+
+
+@pytest.fixture(params=["parquet", "arrow"])
+def fmt(request):
+    return request.param
+
+
+def _write(path, rows):
+    table = pa.Table.from_pylist(rows)
+    if path.suffix == ".parquet":
+        pq.write_table(table, path, row_group_size=3)
+    else:
+        feather.write_feather(table, path, compression="uncompressed", chunksize=3)
+    return path
+
+
+def test_arrow_dataset_yields_column_batches(tmp_path, fmt):
+    path = _write(tmp_path / f"data.{fmt}", _rows(7))
+    dataset = open_dataset(path)
+
+    assert isinstance(dataset, ArrowDataset)
+    batches = list(dataset.iter_batches(2))
+    assert all(len(batch) <= 2 for batch in batches)
+    assert [i for batch in batches for i in batch.ids] == [f"q{i}" for i in range(7)]
+    assert batches[0].retrieved_contexts == [["context 0"], ["context 1"]]
+    assert batches[0].rows is None
+
+    # Row iteration still works and validates
+    assert list(dataset) == _rows(7)
+
+
+def test_arrow_dataset_checks_columns(tmp_path, fmt):
+    rows = [{k: v for k, v in row.items() if k != "category"} for row in _rows(2)]
+    with pytest.raises(DatasetLoadError, match="category"):
+        ArrowDataset(_write(tmp_path / f"data.{fmt}", rows))
+
+    rows = [{**row, "retrieved_contexts": "not a list"} for row in _rows(2)]
+    with pytest.raises(DatasetLoadError, match="retrieved_contexts"):
+        ArrowDataset(_write(tmp_path / f"bad.{fmt}", rows))
+
+
+def test_arrow_prediction_index_joins_shards(tmp_path, fmt):
+    a = _write(tmp_path / f"a.{fmt}", _predictions(["q3", "q0", "zz"]))
+    b = _write(
+        tmp_path / f"b.{fmt}",
+        _predictions(["q1"]) + [{"id": "q0", "prediction": "dup"}, {"id": None, "prediction": "x"}],
+    )
+    index = open_prediction_index([a, b])
+    assert isinstance(index, ArrowPredictionIndex)
+
+    report = JoinReport()
+    dataset = ArrowDataset(_write(tmp_path / f"data.{fmt}", _rows(4)))
+    chunks = list(join_by_id(dataset, index, chunk_size=3, report=report))
+
+    assert [i for chunk in chunks for i in chunk.ids] == ["q0", "q1", "q3"]
+    assert [a for chunk in chunks for a in chunk.answer] == [
+        "the answer is 0",
+        "the answer is 1",
+        "the answer is 3",
+    ]
+    assert report.missing_ids == ["q2"]
+    assert report.unexpected_ids == ["zz"]
+    assert report.duplicates == 1
+    assert report.without_id == 1
+    index.close()
+
+
+def test_arrow_prediction_index_null_prediction_is_empty(tmp_path, fmt):
+    path = _write(
+        tmp_path / f"p.{fmt}",
+        [{"id": "q0", "prediction": None}, {"id": "q1", "prediction": "one"}],
+    )
+    index = open_prediction_index([path])
+    report = JoinReport()
+
+    (chunk,) = join_by_id(_rows(2), index, chunk_size=2, report=report)
+
+    assert chunk.answer == ["", "one"]
+    assert (report.matched, report.missing) == (2, 0)
+    index.close()
+
+
+def test_column_metrics_match_row_api():
+    examples = _rows(3)
+    predictions = [{"answer": "the answer is 0"}, {"answer": ""}, {"answer": "an answer 2"}]
+    batch = ColumnBatch.from_rows(examples, predictions)
+
+    for metric in (BLEUMetric(corpus=False), RougeLMetric()):
+        by_rows = [r.score for r in metric.compute_batch(examples, predictions)]
+        by_columns = [r.score for r in metric.compute_columns(batch)]
+        assert by_rows == by_columns
+
+
+def test_runner_scores_arrow_inputs_like_jsonl(tmp_path, fmt):
+    rows = _rows(6)
+    preds = _predictions([row["id"] for row in reversed(rows)])
+
+    jsonl = tmp_path / "preds.jsonl"
+    jsonl.write_text("".join(json.dumps(p) + "\n" for p in preds), encoding="utf-8")
+
+    metrics = [MetricConfig(name="bleu"), MetricConfig(name="rouge_l")]
+
+    def run(dataset, predictions, out):
+        return EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "m", "predictions": [predictions]}],
+            metrics=metrics,
+            output_dir=tmp_path / out,
+            chunk_size=4,
+        ).run()
+
+    expected = run(rows, jsonl, "jsonl")
+    actual = run(
+        ArrowDataset(_write(tmp_path / f"data.{fmt}", rows)),
+        _write(tmp_path / f"preds.{fmt}", preds),
+        "arrow",
+    )
+    assert actual == expected
+
+
+def test_arrow_validation_reports_all_value_errors(tmp_path, fmt):
+    rows = _rows(5)
+    rows[1]["difficulty"] = "bogus"
+    rows[3]["query"] = ""
+    rows[4]["retrieved_contexts"] = ["ok", None]
+    path = _write(tmp_path / f"data.{fmt}", rows)
+
+    report = validate_dataset(path)
+    assert [(i.row, i.id, i.field, i.code) for i in report.issues] == [
+        (2, "q1", "difficulty", "not_allowed"),
+        (4, "q3", "query", "empty"),
+        (5, "q4", "retrieved_contexts", "not_string"),
+    ]
+
+    with pytest.raises(DatasetLoadError, match="Row 2"):
+        list(ArrowDataset(path).iter_batches(10))
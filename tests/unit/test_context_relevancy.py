@@ -1,16 +1,16 @@
-import numpy as np
 from llm_eval.metrics.rag.context_relevancy import ContextRelevancyMetric
 
 
-def test_context_relevancy_irrelevant(mocker):
+def test_context_relevancy_irrelevant(mocker, fake_encoder):
     metric = ContextRelevancyMetric(lazy_load=True)
 
     # Create a fake model
-    mock_model = mocker.Mock()
-    mock_model.encode.side_effect = [
-        np.array([1.0, 0.0]),          # query embedding
-        [np.array([0.0, 1.0])],        # context embeddings (list)
-    ]
+    mock_model = fake_encoder(
+        {
+            "What is machine learning?": [1.0, 0.0],  # query embedding
+            "Weather forecast today": [0.0, 1.0],  # context embedding
+        }
+    )
 
     # Patch model retrieval
     mocker.patch.object(metric, "_get_model", return_value=mock_model)
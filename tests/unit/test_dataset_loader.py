@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from llm_eval.data.dataset_loader import (
+    DatasetLoadError,
+    StreamingDataset,
+    iter_dataset,
+    load_dataset,
+    validate_dataset,
+)
+from llm_eval.data.validators import validate_row
+
+
+def _row(i, **overrides):
+    row = {
+        "id": f"q{i}",
+        "query": f"question {i}",
+        "expected_answer": f"answer {i}",
+        "retrieved_contexts": [f"context {i}"],
+        "difficulty": "easy",
+        "category": "test",
+    }
+    row.update(overrides)
+    return row
+
+
+def _write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return path
+
+
+def test_jsonl_rows_stream_lazily(tmp_path):
+    path = _write_jsonl(tmp_path / "d.jsonl", [_row(0), _row(1, difficulty="bogus")])
+
+    rows = iter_dataset(path)
+
+    # The first row is usable before the invalid second row is read
+    assert next(rows)["id"] == "q0"
+    with pytest.raises(DatasetLoadError, match="Row 2"):
+        next(rows)
+
+
+def test_streaming_dataset_is_reiterable(tmp_path):
+    path = _write_jsonl(tmp_path / "d.jsonl", [_row(i) for i in range(3)])
+    dataset = StreamingDataset(path)
+
+    assert [r["id"] for r in dataset] == [r["id"] for r in dataset] == ["q0", "q1", "q2"]
+
+
+def test_csv_decodes_context_lists_and_keeps_string_ids(tmp_path):
+    path = tmp_path / "d.csv"
+    path.write_text(
+        "id,query,expected_answer,retrieved_contexts,difficulty,category\n"
+        '1,question,answer,"[""ctx a"", ""ctx b""]",easy,test\n',
+        encoding="utf-8",
+    )
+
+    (row,) = load_dataset(path)
+
+    assert row["id"] == "1"
+    assert row["retrieved_contexts"] == ["ctx a", "ctx b"]
+
+
+def test_empty_and_unsupported_datasets_are_rejected(tmp_path):
+    with pytest.raises(DatasetLoadError, match="empty"):
+        load_dataset(_write_jsonl(tmp_path / "d.jsonl", []))
+
+    with pytest.raises(DatasetLoadError):
+        StreamingDataset(tmp_path / "d.parquet")
+
+
+def test_stream_error_lists_every_issue_in_block(tmp_path):
+    rows = [_row(0), _row(1, difficulty="bogus"), _row(2, query=""), _row(3)]
+    path = _write_jsonl(tmp_path / "d.jsonl", rows)
+
+    with pytest.raises(DatasetLoadError) as exc_info:
+        load_dataset(path)
+
+    message = str(exc_info.value)
+    assert "Row 2 (line 2, id 'q1'): Invalid difficulty 'bogus'" in message
+    assert "Row 3 (line 3, id 'q2'): Field 'query' must be a non-empty string" in message
+
+
+def test_validate_dataset_reports_all_issues_in_one_pass(tmp_path):
+    path = tmp_path / "d.jsonl"
+    path.write_text(
+        json.dumps(_row(0)) + "\n"
+        + "{not json\n"
+        + json.dumps(_row(2, retrieved_contexts=["ok", 3])) + "\n"
+        + json.dumps({"id": "q3"}) + "\n",
+        encoding="utf-8",
+    )
+
+    report = validate_dataset(path, block_size=2)
+
+    assert not report.ok
+    assert report.rows == 4
+    assert report.invalid_rows == 3
+    assert [(i.row, i.field, i.code) for i in report.issues[:2]] == [
+        (2, "", "invalid_json"),
+        (3, "retrieved_contexts", "not_string"),
+    ]
+    assert report.reasons["query:missing"] == 1
+    assert report.to_dict()["error_count"] == 2 + 5
+
+
+def test_validate_row_keeps_single_row_messages():
+    with pytest.raises(ValueError, match=r"Missing required fields: \['category', 'query'\]"):
+        validate_row({k: v for k, v in _row(0).items() if k not in ("query", "category")})
+
+    with pytest.raises(ValueError, match="Invalid difficulty 'x'"):
+        validate_row(_row(0, difficulty="x"))
@@ -0,0 +1,102 @@
+import numpy as np
+
+from llm_eval.embeddings.cache import EmbeddingStore, activate_store, get_active_store
+from llm_eval.metrics.rag.answer_relevancy import AnswerRelevancyMetric
+from llm_eval.metrics.rag.context_relevancy import ContextRelevancyMetric
+from llm_eval.metrics.reference.bertscore import BERTScoreMetric
+
+VECTORS = {
+    "What is ML?": [1.0, 0.0],
+    "ML learns from data": [0.9, 0.1],
+    "Machine learning is a field of AI": [0.8, 0.2],
+}
+
+
+def test_store_encodes_each_text_once(fake_encoder):
+    store = EmbeddingStore()
+    model = fake_encoder(VECTORS)
+
+    store.embed("mini", ["What is ML?", "What is ML?"], model_loader=lambda: model)
+    store.embed("mini", ["What is ML?", "ML learns from data"], model_loader=lambda: model)
+
+    encoded = [t for call in model.encode.call_args_list for t in call.args[0]]
+    assert encoded == ["What is ML?", "ML learns from data"]
+    stats = store.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 1, 2)
+    assert stats["hit_rate"] == 1 / 3
+
+
+def test_embedding_cache_config_bounds_the_run_store(fake_encoder, tmp_path):
+    from llm_eval.config.schema import EmbeddingCacheConfig
+    from llm_eval.evaluation.runner import EvaluationRunner
+
+    runner = EvaluationRunner(
+        dataset=[],
+        models=[],
+        metrics=[],
+        output_dir=tmp_path,
+        embedding_cache=EmbeddingCacheConfig(max_memory_entries=2, memory_dtype="float16"),
+    )
+    store = runner._build_embedding_store()
+    model = fake_encoder(VECTORS)
+
+    vectors = store.embed("mini", list(VECTORS), model_loader=lambda: model)
+
+    assert vectors.dtype == np.float32
+    stats = store.stats()
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+
+    full = EmbeddingStore(max_entries=2)
+    full.embed("mini", list(VECTORS), model_loader=lambda: model)
+    # Two 2-d vectors at 2 bytes per value instead of 4
+    assert full.stats()["bytes"] - stats["bytes"] == 2 * 2 * 2
+
+
+def test_store_skips_model_load_when_all_hits(fake_encoder, mocker):
+    store = EmbeddingStore()
+    store.embed("mini", ["What is ML?"], model_loader=lambda: fake_encoder(VECTORS))
+
+    loader = mocker.Mock()
+    store.embed("mini", ["What is ML?"], model_loader=loader)
+
+    loader.assert_not_called()
+
+
+def test_store_is_shared_across_metrics(mocker, fake_encoder):
+    model = fake_encoder(VECTORS)
+    answer = AnswerRelevancyMetric()
+    context = ContextRelevancyMetric()
+    mocker.patch.object(answer, "_get_model", return_value=model)
+    mocker.patch.object(context, "_get_model", return_value=model)
+
+    example = {
+        "query": "What is ML?",
+        "retrieved_contexts": ["Machine learning is a field of AI"],
+    }
+    prediction = {"answer": "ML learns from data"}
+
+    with activate_store(EmbeddingStore()) as store:
+        answer.compute(example=example, prediction=prediction)
+        context.compute(example=example, prediction=prediction)
+
+    assert get_active_store() is None
+    assert store.hits == 1  # query reused by context relevancy
+    assert len(store) == 3
+
+
+def test_bertscore_uses_run_store_keyed_by_dtype(mocker, fake_encoder):
+    model = fake_encoder({"r": [1.0, 0.0], "c": [1.0, 0.0]})
+    full = BERTScoreMetric()
+    half = BERTScoreMetric(dtype="float16")
+    mocker.patch.object(full, "_get_model", return_value=model)
+    mocker.patch.object(half, "_get_model", return_value=model)
+
+    example, prediction = {"expected_answer": "r"}, {"answer": "c"}
+    with activate_store(EmbeddingStore()) as store:
+        full.compute(example=example, prediction=prediction)
+        full.compute(example=example, prediction=prediction)
+        half.compute(example=example, prediction=prediction)
+
+    assert store.hits == 2
+    assert len(store) == 4  # float16 vectors are not served for float32
+    assert model.encode.call_count == 2
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from llm_eval.embeddings.cache import EmbeddingStore, text_hash
+from llm_eval.embeddings.disk_store import PersistentEmbeddingStore
+
+VECTORS = {
+    "query": [1.0, 0.0],
+    "reference": [0.6, 0.8],
+    "answer": [0.0, 1.0],
+}
+
+
+def test_disk_store_roundtrip_across_instances(tmp_path):
+    digests = [text_hash("a"), text_hash("b")]
+    vectors = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], dtype=np.float32)
+
+    PersistentEmbeddingStore(tmp_path).put_many("org/mini", digests, vectors)
+    reopened = PersistentEmbeddingStore(tmp_path)
+
+    found = reopened.get_many("org/mini", digests + [text_hash("c")])
+
+    np.testing.assert_array_equal(np.stack(found[:2]), vectors)
+    assert found[2] is None
+    assert reopened.stats()["hits"] == 2
+
+
+def test_disk_store_reader_sees_rows_appended_by_other_writer(tmp_path):
+    reader = PersistentEmbeddingStore(tmp_path)
+    writer = PersistentEmbeddingStore(tmp_path)
+
+    assert reader.get_many("mini", [text_hash("a")]) == [None]
+    writer.put_many("mini", [text_hash("a")], np.ones((1, 4), dtype=np.float32))
+
+    (vector,) = reader.get_many("mini", [text_hash("a")])
+    np.testing.assert_array_equal(vector, np.ones(4))
+
+
+def test_disk_store_ignores_torn_tail(tmp_path):
+    store = PersistentEmbeddingStore(tmp_path)
+    store.put_many("mini", [text_hash("a")], np.ones((1, 4), dtype=np.float32))
+
+    # Simulate a writer that crashed after appending half a vector
+    with (tmp_path / "mini" / "vectors.f32").open("ab") as f:
+        f.write(b"\x00" * 6)
+
+    reopened = PersistentEmbeddingStore(tmp_path)
+    reopened.put_many("mini", [text_hash("b")], np.zeros((1, 4), dtype=np.float32))
+
+    a, b = PersistentEmbeddingStore(tmp_path).get_many("mini", [text_hash("a"), text_hash("b")])
+    np.testing.assert_array_equal(a, np.ones(4))
+    np.testing.assert_array_equal(b, np.zeros(4))
+
+
+def test_disk_store_rejects_dim_mismatch(tmp_path):
+    store = PersistentEmbeddingStore(tmp_path)
+    store.put_many("mini", [text_hash("a")], np.ones((1, 4), dtype=np.float32))
+
+    with pytest.raises(ValueError):
+        store.put_many("mini", [text_hash("b")], np.ones((1, 8), dtype=np.float32))
+
+
+def test_warm_run_skips_encoding_dataset_text(tmp_path, fake_encoder):
+    cold_model = fake_encoder(VECTORS)
+    cold = EmbeddingStore(persistent=PersistentEmbeddingStore(tmp_path))
+    cold.embed("mini", ["query", "reference"], ["answer"], model_loader=lambda: cold_model)
+
+    warm_model = fake_encoder(VECTORS)
+    warm = EmbeddingStore(persistent=PersistentEmbeddingStore(tmp_path))
+    embs = warm.embed("mini", ["query", "reference"], ["answer"], model_loader=lambda: warm_model)
+
+    # Only the prediction-side text is re-encoded
+    encoded = [t for call in warm_model.encode.call_args_list for t in call.args[0]]
+    assert encoded == ["answer"]
+    np.testing.assert_allclose(embs, np.array([VECTORS[t] for t in ("query", "reference", "answer")]))
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from llm_eval.embeddings.lru import EmbeddingLRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = EmbeddingLRUCache(max_entries=2)
+    cache.put_many(["a", "b"], [np.ones(4), np.zeros(4)])
+    cache.get_many(["a"])  # "b" is now least recently used
+    cache.put_many(["c"], [np.ones(4)])
+
+    assert [v is None for v in cache.get_many(["a", "b", "c"])] == [False, True, False]
+    assert cache.evictions == 1
+
+
+def test_lru_respects_byte_budget():
+    vector = np.ones(256, dtype=np.float32)
+    per_entry = EmbeddingLRUCache._entry_size("k0", vector)
+    cache = EmbeddingLRUCache(max_bytes=per_entry * 3)
+
+    cache.put_many([f"k{i}" for i in range(10)], [vector] * 10)
+
+    assert len(cache) == 3
+    assert cache.nbytes <= per_entry * 3
+    assert cache.stats()["evictions"] == 7
+
+
+def test_lru_float16_storage_returns_float32():
+    cache = EmbeddingLRUCache(dtype="float16")
+    cache.put_many(["a"], [np.array([0.5, 0.25], dtype=np.float32)])
+
+    (vector,) = cache.get_many(["a"])
+
+    assert vector.dtype == np.float32
+    assert cache.nbytes < EmbeddingLRUCache._entry_size("a", np.zeros(2, np.float32))
+
+
+def test_lru_concurrent_access_keeps_accounting_consistent():
+    cache = EmbeddingLRUCache(max_entries=50)
+
+    def work(i):
+        cache.put_many([i % 80], [np.full(8, i, dtype=np.float32)])
+        cache.get_many([(i + 1) % 80])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(2000)))
+
+    assert len(cache) <= 50
+    assert cache.hits + cache.misses == 2000
+
+
+def test_lru_rejects_unknown_dtype():
+    with pytest.raises(ValueError):
+        EmbeddingLRUCache(dtype="int8")
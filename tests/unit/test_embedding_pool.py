@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm_eval.embeddings import pool as pool_module
+from llm_eval.embeddings.pool import EmbeddingModelPool
+from llm_eval.metrics.rag.answer_relevancy import AnswerRelevancyMetric
+from llm_eval.metrics.reference.bertscore import BERTScoreMetric
+
+
+@pytest.fixture
+def fake_transformer(mocker):
+    EmbeddingModelPool.clear()
+    loader = mocker.patch.object(
+        pool_module,
+        "SentenceTransformer",
+        side_effect=lambda name, device=None: mocker.Mock(name=name),
+    )
+    yield loader
+    EmbeddingModelPool.clear()
+
+
+def test_pool_loads_each_key_once_across_threads(fake_transformer):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(lambda _: EmbeddingModelPool.get("mini"), range(32)))
+
+    assert all(m is models[0] for m in models)
+    assert fake_transformer.call_count == 1
+
+
+def test_pool_keys_on_device(fake_transformer):
+    cpu = EmbeddingModelPool.get("mini", device="cpu")
+    default = EmbeddingModelPool.get("mini")
+
+    assert cpu is not default
+    assert set(EmbeddingModelPool.loaded()) == {("mini", "cpu", None), ("mini", None, None)}
+
+
+def test_metrics_share_pooled_model(fake_transformer):
+    a = AnswerRelevancyMetric(lazy_load=False)
+    b = AnswerRelevancyMetric(lazy_load=False)
+    c = BERTScoreMetric(lazy_load=False)
+
+    assert a._get_model() is b._get_model() is c._get_model()
+    assert fake_transformer.call_count == 1
+
+
+def test_pool_rejects_unknown_dtype(fake_transformer):
+    with pytest.raises(ValueError):
+        EmbeddingModelPool.get("mini", dtype="int4")
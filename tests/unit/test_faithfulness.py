@@ -1,15 +1,15 @@
-import numpy as np
 from llm_eval.metrics.rag.faithfulness import FaithfulnessMetric
 
 
-def test_faithfulness_hallucination(mocker):
+def test_faithfulness_hallucination(mocker, fake_encoder):
     metric = FaithfulnessMetric(lazy_load=True)
 
-    mock_model = mocker.Mock()
-    mock_model.encode.side_effect = [
-        np.array([1.0, 0.0]),  # context embedding
-        np.array([0.0, 1.0]),  # hallucinated claim embedding
-    ]
+    mock_model = fake_encoder(
+        {
+            "Paris is the capital of France": [1.0, 0.0],  # context embedding
+            "The Eiffel Tower is in Berlin": [0.0, 1.0],  # hallucinated claim
+        }
+    )
 
     mocker.patch.object(metric, "_get_model", return_value=mock_model)
 
@@ -22,3 +22,51 @@ def test_faithfulness_hallucination(mocker):
 
     result = metric.compute(example=example, prediction=prediction)
     assert result.score < 0.5
+
+
+def test_faithfulness_batch_single_encode_call(mocker, fake_encoder):
+    metric = FaithfulnessMetric(lazy_load=True)
+
+    mock_model = fake_encoder(
+        {
+            "Paris is in France": [1.0, 0.0],
+            "Berlin is in Germany": [0.0, 1.0],
+            "Paris is French": [1.0, 0.1],
+            "Cheese is blue": [0.0, 1.0],
+            "Berlin is German": [0.1, 1.0],
+        }
+    )
+    mocker.patch.object(metric, "_get_model", return_value=mock_model)
+
+    examples = [
+        {"retrieved_contexts": ["Paris is in France"]},
+        {"retrieved_contexts": ["Berlin is in Germany"]},
+    ]
+    predictions = [
+        {"answer": "Paris is French. Cheese is blue."},
+        {"answer": "Berlin is German."},
+    ]
+
+    results = metric.compute_batch(examples, predictions)
+
+    assert [r.score for r in results] == [0.5, 1.0]
+    assert mock_model.encode.call_count == 1
+
+
+def test_faithfulness_bad_row_fails_alone(mocker, fake_encoder):
+    metric = FaithfulnessMetric(lazy_load=True)
+    mock_model = fake_encoder(
+        {
+            "Paris is in France": [1.0, 0.0],
+            "Paris is French": [1.0, 0.1],
+        }
+    )
+    mocker.patch.object(metric, "_get_model", return_value=mock_model)
+
+    examples = [{"retrieved_contexts": ["Paris is in France"]}] * 3
+    predictions = [{"answer": "Paris is French."}, {"answer": 123}, {"answer": "Paris is French."}]
+
+    results = metric.compute_batch(examples, predictions)
+
+    assert [r.error is None for r in results] == [True, False, True]
+    assert results[0].score == results[2].score > 0.5
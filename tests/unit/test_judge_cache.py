@@ -0,0 +1,71 @@
+import pytest
+
+from llm_eval.metrics.judge.cache import JudgeCache, judge_cache_key
+
+
+def _put(cache, key, score=5):
+    cache.put(
+        key,
+        provider="openai",
+        model="gpt-4",
+        temperature=0.0,
+        parsed={"coherence": score},
+        raw=f'{{"coherence": {score}}}',
+    )
+
+
+def test_key_depends_on_every_component():
+    base = judge_cache_key("openai", "gpt-4", 0.0, "prompt")
+
+    assert base == judge_cache_key("openai", "gpt-4", 0, "prompt")
+    assert base != judge_cache_key("anthropic", "gpt-4", 0.0, "prompt")
+    assert base != judge_cache_key("openai", "gpt-4o", 0.0, "prompt")
+    assert base != judge_cache_key("openai", "gpt-4", 0.7, "prompt")
+    assert base != judge_cache_key("openai", "gpt-4", 0.0, "prompt!")
+
+
+def test_roundtrip_across_instances(tmp_path):
+    key = judge_cache_key("openai", "gpt-4", 0.0, "p")
+    _put(JudgeCache(tmp_path / "judge.sqlite"), key)
+
+    reopened = JudgeCache(tmp_path / "judge.sqlite")
+
+    assert reopened.get_many([key, b"missing"]) == [{"coherence": 5}, None]
+    stats = reopened.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_expired_entries_are_ignored_and_purged(tmp_path):
+    now = [1000.0]
+    cache = JudgeCache(tmp_path / "judge.sqlite", ttl_seconds=60, clock=lambda: now[0])
+    _put(cache, b"k")
+
+    now[0] += 30
+    assert cache.get(b"k") == {"coherence": 5}
+
+    now[0] += 60
+    assert cache.get(b"k") is None
+
+    cache.evict()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    now = [0.0]
+    cache = JudgeCache(tmp_path / "judge.sqlite", max_entries=2, clock=lambda: now[0])
+
+    for key in (b"a", b"b", b"c"):
+        now[0] += 1
+        _put(cache, key)
+
+    now[0] += 1
+    cache.get(b"a")  # refresh a; b is now the oldest
+    cache.evict()
+
+    assert cache.get_many([b"a", b"b", b"c"]) == [{"coherence": 5}, None, {"coherence": 5}]
+
+
+def test_rejects_invalid_limits(tmp_path):
+    with pytest.raises(ValueError):
+        JudgeCache(tmp_path / "judge.sqlite", max_entries=0)
@@ -1,6 +1,10 @@
 import json
 import pytest
+from tenacity import wait_none
 
+from llm_eval.config.schema import MetricConfig
+from llm_eval.evaluation.runner import EvaluationRunner
+from llm_eval.metrics.judge.cache import JudgeCache
 from llm_eval.metrics.judge.llm_judge import LLMJudgeMetric
 from llm_eval.llm_providers.openai_provider import OpenAIProvider
 from llm_eval.llm_providers.anthropic_provider import AnthropicProvider
@@ -84,21 +88,24 @@ def test_llm_judge_invalid_json_retry(mocker, example, prediction):
 # -------------------------------------------------
 
 def test_llm_judge_retry_exhausted_returns_zero(mocker, example, prediction):
-    mocker.patch.object(
+    generate = mocker.patch.object(
         OpenAIProvider,
         "generate",
         return_value="INVALID JSON ALWAYS",
     )
+    mocker.patch.object(LLMJudgeMetric, "retry_wait", wait_none())
 
     metric = LLMJudgeMetric(
         provider="openai",
         model="gpt-4",
+        max_retries=2,
     )
 
     result = metric.compute(example=example, prediction=prediction)
 
     assert result.score == 0.0
     assert result.error is not None
+    assert generate.call_count == 2
 
 
 # -------------------------------------------------
@@ -121,3 +128,310 @@ def test_llm_judge_provider_exception_safe(mocker, example, prediction):
 
     assert result.score == 0.0
     assert "API down" in result.error
+
+
+# -------------------------------------------------
+# ASYNC BATCH PATH
+# -------------------------------------------------
+
+def _judge_reply(score):
+    return json.dumps(
+        {"coherence": score, "relevance": score, "safety": score, "reasoning": "ok"}
+    )
+
+
+def test_llm_judge_batch_respects_concurrency_cap(mocker):
+    import asyncio
+
+    in_flight = {"now": 0, "peak": 0}
+
+    async def fake_agenerate(self, *, system, user):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return _judge_reply(5)
+
+    mocker.patch.object(OpenAIProvider, "agenerate", fake_agenerate)
+
+    metric = LLMJudgeMetric(provider="openai", model="gpt-4", max_concurrency=2)
+    examples = [{"query": f"q{i}"} for i in range(6)]
+    predictions = [{"answer": f"a{i}"} for i in range(6)]
+
+    results = metric.compute_batch(examples, predictions)
+
+    assert [r.score for r in results] == [pytest.approx(1.0)] * 6
+    assert in_flight["peak"] == 2
+
+
+def test_llm_judge_batch_uses_judge_prompt_templates(mocker):
+    calls = []
+
+    async def fake_agenerate(self, *, system, user):
+        calls.append((system, user))
+        return _judge_reply(3)
+
+    mocker.patch.object(AnthropicProvider, "agenerate", fake_agenerate)
+
+    metric = LLMJudgeMetric(provider="anthropic", model="claude-3-opus")
+    (result,) = metric.compute_batch([{"query": "Why?"}], [{"answer": "Because."}])
+
+    assert result.score == pytest.approx(0.6)
+    system, user = calls[0]
+    assert "valid JSON only" in system
+    assert "Why?" in user and "Because." in user
+
+
+def test_llm_judge_batch_unknown_provider_is_row_error():
+    metric = LLMJudgeMetric(provider="nope", model="x")
+    (result,) = metric.compute_batch([{"query": "q"}], [{"answer": "a"}])
+
+    assert result.score == 0.0
+    assert "Unknown provider" in result.error
+
+
+def test_rate_limiter_delays_past_requests_per_minute():
+    from llm_eval.metrics.judge.concurrency import RateLimiter
+
+    now = [0.0]
+    limiter = RateLimiter(requests_per_minute=60, clock=lambda: now[0])
+
+    assert all(limiter.reserve() == 0.0 for _ in range(60))
+    assert limiter.reserve() == pytest.approx(1.0)
+
+    now[0] = 10.0
+    assert limiter.reserve() == 0.0
+
+
+def test_rate_limiter_delays_past_tokens_per_minute():
+    from llm_eval.metrics.judge.concurrency import RateLimiter
+
+    limiter = RateLimiter(tokens_per_minute=600, clock=lambda: 0.0)
+
+    assert limiter.reserve(tokens=600) == 0.0
+    assert limiter.reserve(tokens=30) == pytest.approx(3.0)
+
+
+def test_llm_judge_cache_skips_provider_on_rerun(mocker, tmp_path):
+    calls = []
+
+    async def fake_agenerate(self, *, system, user):
+        calls.append(user)
+        return _judge_reply(4)
+
+    mocker.patch.object(OpenAIProvider, "agenerate", fake_agenerate)
+
+    examples = [{"query": "q1"}, {"query": "q2"}]
+    predictions = [{"answer": "a1"}, {"answer": "a2"}]
+    params = dict(provider="openai", model="gpt-4", cache_path=str(tmp_path / "judge.sqlite"))
+
+    first = LLMJudgeMetric(**params).compute_batch(examples, predictions)
+    rerun = LLMJudgeMetric(**params)
+    second = rerun.compute_batch(examples, predictions)
+
+    assert len(calls) == 2
+    assert [r.score for r in second] == [r.score for r in first]
+    assert all(r.metadata["cached"] for r in second)
+    assert rerun.stats()["judge_cache"]["hits"] == 2
+
+
+def test_runner_closes_judge_cache(mocker, tmp_path):
+    async def fake_agenerate(self, *, system, user):
+        return _judge_reply(4)
+
+    mocker.patch.object(OpenAIProvider, "agenerate", fake_agenerate)
+    predictions = tmp_path / "preds.jsonl"
+    predictions.write_text(
+        "".join(json.dumps({"id": f"q{i}", "prediction": f"a{i}"}) + "\n" for i in range(3))
+    )
+    cache_path = tmp_path / "judge.sqlite"
+
+    EvaluationRunner(
+        dataset=[{"id": f"q{i}", "query": f"q{i}"} for i in range(3)],
+        models=[{"name": "m", "predictions": predictions}],
+        metrics=[
+            MetricConfig(
+                name="llm_judge",
+                params=dict(
+                    provider="openai",
+                    model="gpt-4",
+                    cache_path=str(cache_path),
+                    cache_max_entries=1,
+                ),
+            )
+        ],
+        output_dir=tmp_path / "out",
+    ).run()
+
+    # close() ran the size eviction and released the connection
+    reopened = JudgeCache(cache_path)
+    assert reopened.stats()["entries"] == 1
+    reopened.close()
+
+
+def test_llm_judge_cache_does_not_store_invalid_replies(mocker, tmp_path):
+    mocker.patch.object(
+        OpenAIProvider,
+        "agenerate",
+        mocker.AsyncMock(return_value=json.dumps({"coherence": 5})),
+    )
+
+    metric = LLMJudgeMetric(
+        provider="openai", model="gpt-4", cache_path=str(tmp_path / "judge.sqlite")
+    )
+    (result,) = metric.compute_batch([{"query": "q"}], [{"answer": "a"}])
+
+    assert result.error is not None
+    assert metric.stats()["judge_cache"]["entries"] == 0
+
+
+# -------------------------------------------------
+# PACKED (MULTI-ITEM) MODE
+# -------------------------------------------------
+
+def _packed_agenerate(calls, drop=()):
+    import re
+
+    async def fake_agenerate(self, *, system, user):
+        ids = re.findall(r'"id": "(\d+)"', user)
+        calls.append(ids)
+        if not ids:
+            return _judge_reply(5)
+        return json.dumps(
+            [
+                {"id": i, "coherence": 5, "relevance": 5, "safety": 5, "reasoning": "ok"}
+                for i in ids
+                if i not in drop
+            ]
+        )
+
+    return fake_agenerate
+
+
+def test_llm_judge_packs_items_into_fewer_requests(mocker):
+    calls = []
+    mocker.patch.object(OpenAIProvider, "agenerate", _packed_agenerate(calls))
+
+    metric = LLMJudgeMetric(provider="openai", model="gpt-4", pack_size=3)
+    results = metric.compute_batch(
+        [{"query": f"q{i}"} for i in range(6)],
+        [{"answer": f"a{i}"} for i in range(6)],
+    )
+
+    assert [r.score for r in results] == [pytest.approx(1.0)] * 6
+    assert sorted(calls) == [["0", "1", "2"], ["3", "4", "5"]]
+
+
+def test_llm_judge_retries_only_items_missing_from_pack(mocker):
+    calls = []
+    mocker.patch.object(OpenAIProvider, "agenerate", _packed_agenerate(calls, drop={"1"}))
+
+    metric = LLMJudgeMetric(provider="openai", model="gpt-4", pack_size=4)
+    results = metric.compute_batch(
+        [{"query": f"q{i}"} for i in range(3)],
+        [{"answer": f"a{i}"} for i in range(3)],
+    )
+
+    assert all(r.error is None for r in results)
+    # One packed request, then item 1 alone via the single-item prompt
+    assert calls == [["0", "1", "2"], []]
+
+
+def test_llm_judge_pack_backs_off_on_provider_errors_without_splitting(mocker):
+    calls = []
+
+    async def rate_limited(self, *, system, user):
+        calls.append(user)
+        raise RuntimeError("429 Too Many Requests")
+
+    mocker.patch.object(OpenAIProvider, "agenerate", rate_limited)
+    mocker.patch.object(LLMJudgeMetric, "retry_wait", wait_none())
+
+    metric = LLMJudgeMetric(provider="openai", model="gpt-4", pack_size=4, max_retries=5)
+    results = metric.compute_batch(
+        [{"query": f"q{i}"} for i in range(4)],
+        [{"answer": f"a{i}"} for i in range(4)],
+    )
+
+    assert all("429" in r.error for r in results)
+    # The same pack, retried max_retries times: never split into smaller requests
+    assert len(calls) == 5 and len(set(calls)) == 1
+
+
+def test_llm_judge_pack_splits_on_empty_reply(mocker):
+    calls = []
+
+    async def empty_packs(self, *, system, user):
+        import re
+
+        ids = re.findall(r'"id": "(\d+)"', user)
+        calls.append(ids)
+        # e.g. OpenAI's message.content is None
+        return None if ids else _judge_reply(5)
+
+    mocker.patch.object(OpenAIProvider, "agenerate", empty_packs)
+
+    metric = LLMJudgeMetric(provider="openai", model="gpt-4", pack_size=2)
+    results = metric.compute_batch(
+        [{"query": f"q{i}"} for i in range(2)],
+        [{"answer": f"a{i}"} for i in range(2)],
+    )
+
+    assert all(r.error is None for r in results)
+    # One packed request, then each item alone
+    assert calls == [["0", "1"], [], []]
+
+
+def test_llm_judge_pack_caches_provider_reply_text(mocker, tmp_path):
+    import sqlite3
+
+    calls = []
+    mocker.patch.object(OpenAIProvider, "agenerate", _packed_agenerate(calls))
+
+    cache_path = tmp_path / "judge.sqlite"
+    metric = LLMJudgeMetric(
+        provider="openai", model="gpt-4", pack_size=2, cache_path=str(cache_path)
+    )
+    metric.compute_batch([{"query": "q0"}, {"query": "q1"}], [{"answer": "a0"}, {"answer": "a1"}])
+    metric.close()
+
+    with sqlite3.connect(cache_path) as conn:
+        (raw,) = {row[0] for row in conn.execute("SELECT raw FROM judgements")}
+    assert [entry["id"] for entry in json.loads(raw)] == ["0", "1"]
+
+
+def test_pack_items_respects_token_budget():
+    from llm_eval.metrics.judge.packing import JudgeItem, pack_items
+
+    items = [
+        JudgeItem(index=i, query="q" * 40, answer="a" * 40, key=b"", system="", user="")
+        for i in range(5)
+    ]
+    per_item = items[0].tokens
+
+    packs = pack_items(items, max_items=10, token_budget=10 + 2 * per_item, overhead_tokens=10)
+    assert [len(p) for p in packs] == [2, 2, 1]
+
+    packs = pack_items(items, max_items=3, token_budget=10_000, overhead_tokens=10)
+    assert [len(p) for p in packs] == [3, 2]
+
+
+def test_parse_pack_reply_validates_ids():
+    from llm_eval.metrics.judge.packing import parse_pack_reply
+
+    raw = json.dumps(
+        {
+            "results": [
+                {"id": "0", "coherence": 5},
+                {"id": "0", "coherence": 1},
+                {"id": "9", "coherence": 3},
+                {"coherence": 2},
+            ]
+        }
+    )
+
+    assert parse_pack_reply(raw, ["0", "1"]) == {"0": {"coherence": 5}}
+    with pytest.raises(ValueError):
+        parse_pack_reply(json.dumps({"coherence": 5}), ["0"])
+    with pytest.raises(ValueError):
+        parse_pack_reply(None, ["0"])
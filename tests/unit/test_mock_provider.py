@@ -0,0 +1,83 @@
+import json
+
+import httpx
+import pytest
+
+from llm_eval.llm_providers.factory import ProviderFactory
+from llm_eval.llm_providers.mock_provider import MockProvider
+from llm_eval.llm_providers.mock_server import MockJudgeServer, MockServerConfig
+from llm_eval.metrics.judge.llm_judge import LLMJudgeMetric
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    servers = []
+
+    def _serve(**config):
+        server = MockJudgeServer(MockServerConfig(latency_ms=0, seed=0, **config)).start()
+        servers.append(server)
+        monkeypatch.setenv("LLM_EVAL_MOCK_URL", server.url)
+        return server
+
+    ProviderFactory.clear()
+    yield _serve
+    ProviderFactory.clear()
+    for server in servers:
+        server.stop()
+
+
+def _rows(n):
+    return [{"query": f"q{i}"} for i in range(n)], [{"answer": f"a{i}"} for i in range(n)]
+
+
+def test_judge_runs_end_to_end_against_mock_server(serve):
+    server = serve()
+    metric = LLMJudgeMetric(provider="mock", model="mock", max_concurrency=4)
+
+    results = metric.compute_batch(*_rows(5))
+
+    assert all(r.error is None and 0.0 < r.score <= 1.0 for r in results)
+    assert server.stats()["requests"] == 5
+
+    # Scores are a pure function of the prompt
+    assert [r.score for r in metric.compute_batch(*_rows(5))] == [r.score for r in results]
+
+
+def test_packed_judge_against_mock_server(serve):
+    server = serve()
+    metric = LLMJudgeMetric(provider="mock", model="mock", pack_size=4)
+
+    results = metric.compute_batch(*_rows(4))
+
+    assert all(r.error is None for r in results)
+    assert server.stats()["requests"] == 1
+
+
+def test_mock_server_rate_limits_and_errors(serve):
+    serve(rate_limit_rate=1.0)
+    provider = MockProvider()
+    try:
+        with pytest.raises(httpx.HTTPStatusError) as exc_info:
+            provider.generate(system="s", user="u")
+    finally:
+        provider.close()
+
+    assert exc_info.value.response.status_code == 429
+    assert exc_info.value.response.headers["Retry-After"] == "1"
+
+
+def test_mock_server_malformed_replies(serve):
+    serve(malformed_rate=1.0)
+    provider = MockProvider()
+    try:
+        raw = provider.generate(system="s", user="u")
+    finally:
+        provider.close()
+
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(raw)
+
+
+def test_mock_server_config_validates_rates():
+    with pytest.raises(ValueError):
+        MockServerConfig(error_rate=0.7, malformed_rate=0.5)
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from llm_eval.config.schema import MetricConfig, ModelConfig
+from llm_eval.data.predictions import (
+    JoinReport,
+    PredictionIndex,
+    PredictionLoadError,
+    join_by_id,
+)
+from llm_eval.evaluation.runner import EvaluationRunner
+
+
+def _write(path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def shards(tmp_path):
+    # Out of order, split across shards, with a duplicate and an extra id
+    a = _write(tmp_path / "part-0.jsonl", [{"id": "q3", "prediction": "three"}, {"id": "q0", "prediction": "zero"}])
+    b = _write(
+        tmp_path / "part-1.jsonl",
+        [
+            {"id": "q1", "prediction": "one"},
+            {"id": "q0", "prediction": "duplicate"},
+            {"id": "zz", "prediction": "extra"},
+            {"prediction": "no id"},
+        ],
+    )
+    return [a, b]
+
+
+def test_join_matches_by_id_and_reports_unmatched(shards):
+    dataset = [{"id": f"q{i}"} for i in range(4)]
+    index = PredictionIndex(shards)
+    report = JoinReport()
+
+    chunks = list(join_by_id(dataset, index, chunk_size=3, report=report))
+    examples = [row_id for chunk in chunks for row_id in chunk.ids]
+    answers = [answer for chunk in chunks for answer in chunk.answer]
+
+    assert examples == ["q0", "q1", "q3"]
+    assert answers == ["zero", "one", "three"]
+    assert report.to_dict() == {
+        "matched": 3,
+        "missing": 1,
+        "missing_ids": ["q2"],
+        "unexpected": 1,
+        "unexpected_ids": ["zz"],
+        "duplicates": 1,
+        "without_id": 1,
+    }
+    index.close()
+
+
+def test_join_treats_null_prediction_as_empty_answer(tmp_path):
+    path = _write(
+        tmp_path / "p.jsonl",
+        [{"id": "q0", "prediction": None}, {"id": "q1"}, {"id": "q2", "prediction": "two"}],
+    )
+    dataset = [{"id": f"q{i}"} for i in range(4)]
+    index = PredictionIndex([path])
+    report = JoinReport()
+
+    chunks = list(join_by_id(dataset, index, chunk_size=4, report=report))
+
+    assert chunks[0].ids == ["q0", "q1", "q2"]
+    assert chunks[0].answer == ["", "", "two"]
+    assert (report.matched, report.missing_ids) == (3, ["q3"])
+    index.close()
+
+
+def test_index_rejects_invalid_json(tmp_path):
+    path = tmp_path / "p.jsonl"
+    path.write_text('{"id": "a"}\nnot json\n', encoding="utf-8")
+
+    with pytest.raises(PredictionLoadError, match="p.jsonl:2"):
+        PredictionIndex([path])
+
+
+def test_model_config_expands_prediction_globs(shards, tmp_path):
+    cfg = ModelConfig(name="m", predictions=str(tmp_path / "part-*.jsonl"))
+
+    assert cfg.predictions == shards
+    assert cfg.join.value == "id"
+
+
+def test_runner_joins_shards_by_id(shards, tmp_path):
+    dataset = [{"id": f"q{i}", "expected_answer": a} for i, a in enumerate(["zero", "one", "two", "three"])]
+
+    runner = EvaluationRunner(
+        dataset=dataset,
+        models=[{"name": "m", "predictions": shards}],
+        metrics=[MetricConfig(name="rouge_l")],
+        output_dir=tmp_path / "out",
+    )
+    results = runner.run()
+
+    # Every matched answer is exact; the missing row is skipped, not misaligned
+    assert results["m"]["rouge_l"]["mean"] == pytest.approx(1.0)
+    assert runner.summary["predictions"]["m"]["missing_ids"] == ["q2"]
+
+
+def test_runner_position_join_keeps_line_alignment(tmp_path):
+    preds = _write(tmp_path / "p.jsonl", [{"id": "x", "prediction": "zero"}, {"id": "y", "prediction": "one"}])
+
+    runner = EvaluationRunner(
+        dataset=[{"id": "q0", "expected_answer": "zero"}, {"id": "q1", "expected_answer": "one"}],
+        models=[{"name": "m", "predictions": preds, "join": "position"}],
+        metrics=[MetricConfig(name="rouge_l")],
+        output_dir=tmp_path / "out",
+    )
+
+    assert runner.run()["m"]["rouge_l"]["mean"] == pytest.approx(1.0)
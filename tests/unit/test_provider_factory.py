@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from llm_eval.llm_providers.base import LLMProvider
+from llm_eval.llm_providers.factory import ProviderFactory
+from llm_eval.llm_providers.openai_provider import OpenAIProvider
+from llm_eval.metrics.judge.llm_judge import LLMJudgeMetric
+
+
+@pytest.fixture(autouse=True)
+def clear_factory():
+    ProviderFactory.clear()
+    yield
+    ProviderFactory.clear()
+
+
+def test_factory_returns_one_provider_per_configuration():
+    a = ProviderFactory.get("openai", "gpt-4", max_connections=8)
+
+    assert ProviderFactory.get("openai", "gpt-4") is a
+    assert ProviderFactory.get("openai", "gpt-4o") is not a
+    assert ProviderFactory.get("anthropic", "gpt-4") is not a
+    assert a.max_connections == 8
+
+
+def test_factory_rejects_unknown_provider():
+    with pytest.raises(ValueError):
+        ProviderFactory.get("nope", "x")
+
+
+def test_factory_clear_closes_providers():
+    closed = []
+
+    class _Closable(LLMProvider):
+        def __init__(self, **kwargs):
+            pass
+
+        def generate(self, *, system, user):
+            return ""
+
+        def close(self):
+            closed.append("sync")
+
+        async def aclose(self):
+            closed.append("async")
+
+    ProviderFactory.register("_closable", _Closable)
+    try:
+        ProviderFactory.get("_closable", "m")
+        ProviderFactory.clear()
+    finally:
+        ProviderFactory._registry.pop("_closable", None)
+
+    assert closed == ["sync", "async"]
+    assert ProviderFactory.loaded() == {}
+
+
+def test_judge_reuses_provider_and_uses_prompt_templates(mocker):
+    generate = mocker.patch.object(
+        OpenAIProvider,
+        "generate",
+        return_value=json.dumps(
+            {"coherence": 5, "relevance": 5, "safety": 5, "reasoning": "ok"}
+        ),
+    )
+    metric = LLMJudgeMetric(provider="openai", model="gpt-4")
+
+    for i in range(3):
+        metric.compute(example={"query": f"q{i}"}, prediction={"answer": "a"})
+
+    assert len(ProviderFactory.loaded()) == 1
+    kwargs = generate.call_args.kwargs
+    assert "valid JSON only" in kwargs["system"]
+    assert "q2" in kwargs["user"]
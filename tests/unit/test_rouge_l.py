@@ -1,4 +1,8 @@
-from llm_eval.metrics.reference.rouge_l import RougeLMetric
+import random
+
+import pytest
+
+from llm_eval.metrics.reference.rouge_l import RougeLMetric, _lcs_length
 
 
 def test_rouge_l_exact_match():
@@ -15,3 +19,57 @@ def test_rouge_l_no_overlap():
     prediction = {"answer": "foo bar"}
     result = metric.compute(example=example, prediction=prediction)
     assert result.score == 0.0
+
+
+def _naive_lcs(x, y):
+    dp = [[0] * (len(y) + 1) for _ in range(len(x) + 1)]
+    for i in range(1, len(x) + 1):
+        for j in range(1, len(y) + 1):
+            if x[i - 1] == y[j - 1]:
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+    return dp[-1][-1]
+
+
+def test_lcs_matches_reference_dp():
+    rng = random.Random(7)
+    for _ in range(200):
+        x = [rng.choice("abcde") for _ in range(rng.randint(0, 40))]
+        y = [rng.choice("abcde") for _ in range(rng.randint(0, 90))]
+        assert _lcs_length(x, y) == _naive_lcs(x, y)
+
+
+def test_rouge_l_batch_matches_single():
+    metric = RougeLMetric()
+    examples = [
+        {"expected_answer": "the cat sat on the mat"},
+        {"expected_answer": ""},
+        {"expected_answer": "hello world"},
+    ]
+    predictions = [
+        {"answer": "the cat lay on a mat"},
+        {"answer": "anything"},
+        {"answer": "world hello"},
+    ]
+
+    batch = metric.compute_batch(examples, predictions)
+    single = [
+        metric.compute(example=e, prediction=p) for e, p in zip(examples, predictions)
+    ]
+
+    assert [r.score for r in batch] == [r.score for r in single]
+    assert batch[0].score == pytest.approx(4 / 6)
+    assert batch[1].score == 0.0
+
+
+def test_rouge_l_bad_row_fails_alone():
+    metric = RougeLMetric()
+    examples = [{"expected_answer": "a b c"}] * 3
+    predictions = [{"answer": "a b c"}, {"answer": 123}, {"answer": "a b"}]
+
+    results = metric.compute_batch(examples, predictions)
+
+    assert [r.error is None for r in results] == [True, False, True]
+    assert results[0].score == 1.0
+    assert results[2].score == pytest.approx(0.8)
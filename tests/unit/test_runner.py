@@ -0,0 +1,543 @@
+import json
+
+import numpy as np
+import pytest
+
+import llm_eval.metrics  # noqa: F401
+from llm_eval.config.schema import MetricConfig
+from llm_eval.evaluation.checkpoint import ResumeError
+from llm_eval.evaluation.executors import worker_context
+from llm_eval.evaluation.results import (
+    RAW_SCORES_FILE,
+    RESULTS_FILE,
+    ErrorCode,
+    ResultTable,
+    load_raw_scores,
+)
+from llm_eval.evaluation.runner import EvaluationRunner
+from llm_eval.metrics.base import BaseMetric, MetricResult
+from llm_eval.metrics.registry import MetricRegistry
+
+
+class _LengthMetric(BaseMetric):
+    """Scores 1.0 when the answer is non-empty; records batch sizes."""
+
+    name = "_test_length"
+    batch_sizes: list = []
+
+    def compute(self, *, example, prediction):
+        return MetricResult(score=1.0 if prediction.get("answer") else 0.0)
+
+    def compute_batch(self, examples, predictions):
+        type(self).batch_sizes.append(len(examples))
+        return super().compute_batch(examples, predictions)
+
+
+@pytest.fixture
+def length_metric():
+    _LengthMetric.batch_sizes = []
+    MetricRegistry.register(_LengthMetric)
+    yield _LengthMetric
+    MetricRegistry._registry.pop(_LengthMetric.name, None)
+
+
+@pytest.fixture
+def dataset():
+    return [{"id": f"q{i}", "query": f"question {i}"} for i in range(10)]
+
+
+@pytest.fixture
+def predictions_file(tmp_path):
+    path = tmp_path / "preds.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(10):
+            f.write(json.dumps({"id": f"q{i}", "prediction": "yes" if i % 2 else ""}) + "\n")
+    return path
+
+
+def test_default_compute_batch_falls_back_to_compute(length_metric):
+    metric = length_metric()
+    results = metric.compute_batch(
+        [{"id": "a"}, {"id": "b"}],
+        [{"answer": "x"}, {"answer": ""}],
+    )
+    assert [r.score for r in results] == [1.0, 0.0]
+
+
+def test_default_compute_batch_rejects_length_mismatch(length_metric):
+    with pytest.raises(ValueError):
+        length_metric().compute_batch([{"id": "a"}], [])
+
+
+def test_runner_uses_configured_chunk_size(length_metric, dataset, predictions_file, tmp_path):
+    runner = EvaluationRunner(
+        dataset=dataset,
+        models=[{"name": "m", "predictions": predictions_file}],
+        metrics=[MetricConfig(name=length_metric.name, chunk_size=4)],
+        output_dir=tmp_path / "out",
+    )
+
+    results = runner.run()
+
+    assert sorted(length_metric.batch_sizes) == [2, 4, 4]
+    assert results["m"][length_metric.name]["mean"] == pytest.approx(0.5)
+
+
+class _CountingDataset(list):
+    """A row list that counts passes over it."""
+
+    passes = 0
+
+    def __iter__(self):
+        self.passes += 1
+        return super().__iter__()
+
+
+def test_runner_joins_each_model_once(length_metric, dataset, predictions_file, tmp_path):
+    rows = _CountingDataset(dataset)
+    runner = EvaluationRunner(
+        dataset=rows,
+        models=[{"name": "m", "predictions": predictions_file}],
+        metrics=[
+            MetricConfig(name=length_metric.name, chunk_size=3),
+            MetricConfig(name="rouge_l", chunk_size=4),
+        ],
+        output_dir=tmp_path / "out",
+        chunk_size=2,
+        checkpoint=False,
+    )
+
+    results = runner.run()
+
+    assert rows.passes == 1
+    assert length_metric.batch_sizes == [3, 3, 3, 1]
+    assert results["m"][length_metric.name]["count"] == results["m"]["rouge_l"]["count"] == 10
+    table = runner.results_table
+    for metric in (length_metric.name, "rouge_l"):
+        assert table.row[table.mask("m", metric)].tolist() == list(range(10))
+    assert runner.summary["predictions"]["m"]["matched"] == 10
+
+
+@pytest.mark.parametrize("strategy", ["inline", "process"])
+def test_runner_executor_strategies_match_thread(strategy, tmp_path):
+    dataset = [
+        {"id": f"q{i}", "expected_answer": f"the answer is {i} today"} for i in range(12)
+    ]
+    predictions_file = tmp_path / "preds.jsonl"
+    with predictions_file.open("w", encoding="utf-8") as f:
+        for i in range(12):
+            f.write(json.dumps({"id": f"q{i}", "prediction": f"answer is {i % 3}"}) + "\n")
+
+    def run(executor, metric_executor=None):
+        runner = EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "m", "predictions": predictions_file}],
+            metrics=[MetricConfig(name="rouge_l", chunk_size=5, executor=metric_executor)],
+            output_dir=tmp_path / executor,
+            executor=executor,
+            max_processes=2,
+        )
+        return runner.run()["m"]["rouge_l"]
+
+    expected = run("thread")
+    assert run(strategy) == pytest.approx(expected, abs=1e-6)
+    assert run("thread", metric_executor=strategy) == pytest.approx(expected, abs=1e-6)
+
+
+def test_process_workers_are_never_forked():
+    assert worker_context().get_start_method() in ("forkserver", "spawn")
+
+
+def test_runner_rejects_unknown_executor(tmp_path):
+    with pytest.raises(ValueError):
+        EvaluationRunner(dataset=[], models=[], metrics=[], output_dir=tmp_path, executor="gpu")
+
+
+def test_runner_overlaps_metrics_on_shared_pool(length_metric, dataset, predictions_file, tmp_path):
+    import threading
+
+    released = threading.Event()
+
+    class _WaitsForOther(BaseMetric):
+        name = "_test_waits"
+
+        def compute(self, *, example, prediction):
+            # Only completes if another metric runs concurrently
+            return MetricResult(score=1.0 if released.wait(timeout=5) else 0.0)
+
+    class _Releases(BaseMetric):
+        name = "_test_releases"
+
+        def compute(self, *, example, prediction):
+            released.set()
+            return MetricResult(score=1.0)
+
+    MetricRegistry.register(_WaitsForOther)
+    MetricRegistry.register(_Releases)
+    try:
+        runner = EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "m", "predictions": predictions_file}],
+            metrics=[MetricConfig(name="_test_waits"), MetricConfig(name="_test_releases")],
+            output_dir=tmp_path / "out",
+            max_workers=2,
+        )
+        results = runner.run()
+    finally:
+        MetricRegistry._registry.pop("_test_waits", None)
+        MetricRegistry._registry.pop("_test_releases", None)
+
+    assert list(results["m"]) == ["_test_waits", "_test_releases"]
+    assert results["m"]["_test_waits"]["mean"] == 1.0
+
+
+def test_runner_raw_scores_follow_dataset_order(length_metric, dataset, predictions_file, tmp_path):
+    runner = EvaluationRunner(
+        dataset=dataset,
+        models=[{"name": "m", "predictions": predictions_file}],
+        metrics=[MetricConfig(name=length_metric.name, chunk_size=3)],
+        output_dir=tmp_path / "out",
+    )
+    runner.run()
+
+    raw = load_raw_scores(tmp_path / "out" / RAW_SCORES_FILE)
+    assert raw["m"][length_metric.name].tolist() == [0.0, 1.0] * 5
+    assert not (tmp_path / "out" / "raw_scores.json").exists()
+
+
+def test_incremental_run_rescores_only_changed_rows(length_metric, dataset, predictions_file, tmp_path):
+    def run(rows, metric_cfg=None):
+        runner = EvaluationRunner(
+            dataset=rows,
+            models=[{"name": "m", "predictions": predictions_file}],
+            metrics=[metric_cfg or MetricConfig(name=length_metric.name, chunk_size=4)],
+            output_dir=tmp_path / "out",
+            incremental=True,
+        )
+        results = runner.run()
+        return results, runner.summary["incremental"]
+
+    first, stats = run(dataset)
+    assert sum(length_metric.batch_sizes) == 10
+    assert stats["reused"] == 0
+
+    length_metric.batch_sizes = []
+    edited = [dict(row) for row in dataset]
+    edited[7]["query"] = "edited question"
+    second, stats = run(edited)
+
+    assert length_metric.batch_sizes == [1]
+    assert (stats["reused"], stats["rescored"]) == (9, 1)
+    assert second == first
+
+    # Different params are a different metric: nothing is reused
+    length_metric.batch_sizes = []
+    _, stats = run(edited, MetricConfig(name=length_metric.name, params={"flag": 1}))
+    assert stats["reused"] == 0
+
+
+def test_aggregates_fold_chunks_as_they_complete(dataset, predictions_file, tmp_path):
+    seen = []
+
+    class _Probe(BaseMetric):
+        name = "_test_probe"
+
+        def compute(self, *, example, prediction):
+            return MetricResult(score=1.0)
+
+        def compute_batch(self, examples, predictions):
+            seen.append(runner.aggregators["m"][self.name].count)
+            return super().compute_batch(examples, predictions)
+
+    MetricRegistry.register(_Probe)
+    try:
+        runner = EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "m", "predictions": predictions_file}],
+            metrics=[MetricConfig(name=_Probe.name, chunk_size=3)],
+            output_dir=tmp_path / "out",
+            executor="inline",
+            checkpoint=False,
+        )
+        runner.run()
+    finally:
+        MetricRegistry._registry.pop(_Probe.name, None)
+
+    # Each chunk was folded in before the next one was scored
+    assert seen == [0, 3, 6, 9]
+    assert runner.aggregators["m"][_Probe.name].count == 10
+
+
+def test_corpus_bleu_is_left_out_when_rows_are_reused(tmp_path):
+    rows = [
+        {"id": f"q{i}", "query": f"question {i}", "expected_answer": f"the answer is {i}"}
+        for i in range(6)
+    ]
+    predictions = tmp_path / "preds.jsonl"
+    predictions.write_text(
+        "".join(
+            json.dumps({"id": f"q{i}", "prediction": f"answer {i % 3}"}) + "\n" for i in range(6)
+        ),
+        encoding="utf-8",
+    )
+
+    def run(dataset):
+        runner = EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "m", "predictions": predictions}],
+            metrics=[MetricConfig(name="bleu", chunk_size=4)],
+            output_dir=tmp_path / "out",
+            incremental=True,
+        )
+        runner.run()
+        return runner.summary["metrics"]["m"]["bleu"]
+
+    assert "corpus_bleu" in run(rows)
+
+    edited = [dict(row) for row in rows]
+    edited[2]["expected_answer"] = "another answer"
+    stats = run(edited)
+    assert "corpus_bleu" not in stats
+    assert stats["corpus_skipped"] == {"reused_rows": 5}
+
+
+def test_process_workers_report_corpus_bleu(tmp_path):
+    rows = [
+        {"id": f"q{i}", "query": f"question {i}", "expected_answer": f"the answer is {i % 4}"}
+        for i in range(12)
+    ]
+    models = []
+    for name, template in (("a", "answer is {}"), ("b", "the answer is {}")):
+        path = tmp_path / f"{name}.jsonl"
+        path.write_text(
+            "".join(
+                json.dumps({"id": f"q{i}", "prediction": template.format(i % 3)}) + "\n"
+                for i in range(12)
+            ),
+            encoding="utf-8",
+        )
+        models.append({"name": name, "predictions": path})
+
+    def run(executor):
+        runner = EvaluationRunner(
+            dataset=rows,
+            models=models,
+            metrics=[MetricConfig(name="bleu", chunk_size=5)],
+            output_dir=tmp_path / executor,
+            executor=executor,
+            max_processes=2,
+        )
+        runner.run()
+        return {name: runner.summary["metrics"][name]["bleu"] for name in ("a", "b")}
+
+    expected = run("thread")
+    # Worker metrics serve both models; each chunk's counts come back separately
+    assert run("process") == expected
+    assert expected["a"]["corpus_bleu"] != expected["b"]["corpus_bleu"]
+
+
+def test_incremental_run_retries_failed_rows(dataset, predictions_file, tmp_path):
+    calls = []
+
+    class _Flaky(BaseMetric):
+        name = "_test_flaky"
+
+        def compute(self, *, example, prediction):
+            calls.append(example["id"])
+            if example["id"] == "q3":
+                return MetricResult(score=0.0, error="upstream timeout")
+            return MetricResult(score=1.0)
+
+    MetricRegistry.register(_Flaky)
+    try:
+        for _ in range(2):
+            EvaluationRunner(
+                dataset=dataset,
+                models=[{"name": "m", "predictions": predictions_file}],
+                metrics=[MetricConfig(name="_test_flaky")],
+                output_dir=tmp_path / "out",
+                incremental=True,
+            ).run()
+    finally:
+        MetricRegistry._registry.pop("_test_flaky", None)
+
+    assert len(calls) == 10 + 1
+    assert calls[-1] == "q3"
+
+
+@pytest.mark.parametrize("executor", ["thread", "inline"])
+def test_runner_writes_ordered_result_table(executor, dataset, predictions_file, tmp_path):
+    class _Mixed(BaseMetric):
+        name = "_test_mixed"
+
+        def compute(self, *, example, prediction):
+            if example["id"] == "q2":
+                return MetricResult(score=0.0, error="judge refused")
+            if example["id"] == "q5":
+                raise RuntimeError("boom")
+            return MetricResult(score=float(example["id"][1:]), metadata={"n": example["id"]})
+
+    MetricRegistry.register(_Mixed)
+    try:
+        runner = EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "a", "predictions": predictions_file}],
+            metrics=[MetricConfig(name="_test_mixed", chunk_size=3), MetricConfig(name="bleu")],
+            output_dir=tmp_path / executor,
+            executor=executor,
+        )
+        runner.run()
+    finally:
+        MetricRegistry._registry.pop("_test_mixed", None)
+
+    table = ResultTable.load(tmp_path / executor / RESULTS_FILE)
+    assert table.models == ["a"]
+    assert table.metrics == ["_test_mixed", "bleu"]
+    assert table.row_ids == [f"q{i}" for i in range(10)]
+    assert table.row.tolist() == list(range(10)) * 2
+
+    mixed = table.mask(metric="_test_mixed")
+    assert table.score[mixed].tolist() == [0, 1, 0, 3, 4, 0, 6, 7, 8, 9]
+    assert table.error[mixed].tolist() == [
+        ErrorCode.METRIC_ERROR if i == 2 else ErrorCode.EXCEPTION if i == 5 else ErrorCode.OK
+        for i in range(10)
+    ]
+
+    records = {r["id"]: r for r in table.records(mixed)}
+    assert records["q2"]["error_message"] == "judge refused"
+    assert records["q5"]["error"] == "exception"
+    assert records["q5"]["error_message"] == "boom"
+    assert records["q7"]["metadata"] == {"n": "q7"}
+    assert records["q7"]["error_message"] is None
+
+    assert table.scores("a", "bleu").tolist() == runner.results_table.scores("a", "bleu").tolist()
+
+
+def test_result_table_keeps_dataset_positions_for_unmatched_rows(
+    length_metric, dataset, tmp_path
+):
+    predictions = tmp_path / "preds.jsonl"
+    with predictions.open("w", encoding="utf-8") as f:
+        for i in reversed(range(10)):
+            if i != 4:
+                f.write(json.dumps({"id": f"q{i}", "prediction": "yes"}) + "\n")
+
+    runner = EvaluationRunner(
+        dataset=dataset,
+        models=[{"name": "m", "predictions": predictions}],
+        metrics=[MetricConfig(name=length_metric.name, chunk_size=4)],
+        output_dir=tmp_path / "out",
+    )
+    runner.run()
+
+    table = runner.results_table
+    assert table.row.tolist() == [0, 1, 2, 3, 5, 6, 7, 8, 9]
+    assert table.row_ids[4] is None
+    assert [table.row_ids[i] for i in table.row] == [f"q{i}" for i in range(10) if i != 4]
+
+
+def test_raw_scores_are_memory_mapped_float32(length_metric, dataset, predictions_file, tmp_path):
+    runner = EvaluationRunner(
+        dataset=dataset,
+        models=[{"name": "m", "predictions": predictions_file}],
+        metrics=[MetricConfig(name=length_metric.name), MetricConfig(name="bleu")],
+        output_dir=tmp_path / "out",
+        raw_scores_json=True,
+    )
+    runner.run()
+
+    raw = load_raw_scores(tmp_path / "out" / RAW_SCORES_FILE)
+    assert list(raw["m"]) == [length_metric.name, "bleu"]
+    for scores in raw["m"].values():
+        assert isinstance(scores, np.memmap)
+        assert scores.dtype == np.float32
+
+    # The opt-in JSON export keeps full precision
+    exported = json.loads((tmp_path / "out" / "raw_scores.json").read_text())
+    assert exported["m"]["bleu"] == runner.results_table.scores("m", "bleu").tolist()
+    np.testing.assert_allclose(raw["m"]["bleu"], exported["m"]["bleu"], rtol=1e-6)
+
+
+class _Crash(BaseException):
+    """Stands in for a kill: not caught by the metric error handling."""
+
+
+def test_resume_scores_only_rows_missing_from_checkpoint(dataset, predictions_file, tmp_path):
+    calls = []
+    crash_at = {"q7"}
+
+    class _Fragile(BaseMetric):
+        name = "_test_fragile"
+
+        def compute(self, *, example, prediction):
+            if example["id"] in crash_at:
+                raise _Crash()
+            calls.append(example["id"])
+            if example["id"] == "q4":
+                return MetricResult(score=0.0, error="judge unavailable")
+            return MetricResult(score=0.5, metadata={"id": example["id"]})
+
+    def run(resume, out="out"):
+        runner = EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "m", "predictions": predictions_file}],
+            metrics=[MetricConfig(name="_test_fragile", chunk_size=3)],
+            output_dir=tmp_path / out,
+            executor="inline",
+            resume=resume,
+        )
+        return runner, runner.run()
+
+    MetricRegistry.register(_Fragile)
+    try:
+        with pytest.raises(_Crash):
+            run(resume=False)
+        # Chunks before the crash are on disk; nothing else was written
+        assert (tmp_path / "out" / "checkpoint.sqlite").exists()
+        assert not (tmp_path / "out" / "aggregates.json").exists()
+        # q6 shares the crashed chunk, so it was scored but never checkpointed
+        assert calls == ["q0", "q1", "q2", "q3", "q4", "q5", "q6"]
+
+        crash_at.clear()
+        calls.clear()
+        runner, resumed = run(resume=True)
+        # q4 failed before, so it is retried along with the unfinished rows
+        assert calls == ["q4", "q6", "q7", "q8", "q9"]
+        assert runner.summary["checkpoint"]["resumed"] == 5
+        assert not (tmp_path / "out" / "checkpoint.sqlite").exists()
+
+        calls.clear()
+        full_runner, full = run(resume=False, out="full")
+    finally:
+        MetricRegistry._registry.pop("_test_fragile", None)
+
+    assert resumed == full
+    table, expected = runner.results_table, full_runner.results_table
+    assert table.score.tolist() == expected.score.tolist()
+    assert table.error.tolist() == expected.error.tolist()
+    assert table.metadata == expected.metadata
+
+
+def test_resume_rejects_changed_inputs(length_metric, dataset, predictions_file, tmp_path):
+    def run(**kwargs):
+        return EvaluationRunner(
+            dataset=dataset,
+            models=[{"name": "m", "predictions": predictions_file}],
+            metrics=[MetricConfig(name=length_metric.name)],
+            output_dir=tmp_path / "out",
+            **kwargs,
+        ).run()
+
+    run()
+    manifest = json.loads((tmp_path / "out" / "manifest.json").read_text())
+    assert manifest["status"] == "complete"
+    # A finished run has nothing to resume from
+    assert not (tmp_path / "out" / "checkpoint.sqlite").exists()
+
+    with predictions_file.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "q10", "prediction": "late"}) + "\n")
+
+    with pytest.raises(ResumeError, match="predictions.m"):
+        run(resume=True)
+    # Starting over is always allowed
+    run()
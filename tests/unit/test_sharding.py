@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+import llm_eval.metrics  # noqa: F401
+from llm_eval.config.schema import MetricConfig
+from llm_eval.data.sharding import Shard
+from llm_eval.evaluation.merge import MergeError, merge_shards
+from llm_eval.evaluation.results import RESULTS_FILE, ResultTable
+from llm_eval.evaluation.runner import EvaluationRunner
+
+
+def _write(path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def dataset():
+    return [
+        {"id": f"q{i}", "query": f"question {i}", "expected_answer": f"the answer is {i % 7}"}
+        for i in range(40)
+    ]
+
+
+@pytest.fixture
+def predictions(tmp_path):
+    rows = [{"id": f"q{i}", "prediction": f"answer is {i % 5}"} for i in reversed(range(40))]
+    del rows[3]
+    rows += [{"id": "extra", "prediction": "x"}, {"prediction": "no id"}]
+    return _write(tmp_path / "preds.jsonl", rows)
+
+
+def test_shard_parse_and_partition():
+    assert Shard.parse("2/5") == Shard(2, 5)
+    assert str(Shard(2, 5)) == "2/5"
+    for bad in ("5/5", "-1/2", "1", "a/b", "0/0"):
+        with pytest.raises(ValueError):
+            Shard.parse(bad)
+
+    ids = [f"row-{i}" for i in range(1000)]
+    masks = [Shard(i, 4).mask(ids) for i in range(4)]
+    assert (sum(m.astype(int) for m in masks) == 1).all()
+    assert all(150 < m.sum() < 350 for m in masks)
+
+
+def _run(dataset, predictions, out, shard=None, join="id"):
+    runner = EvaluationRunner(
+        dataset=dataset,
+        models=[{"name": "m", "predictions": predictions, "join": join}],
+        metrics=[MetricConfig(name="rouge_l", chunk_size=4), MetricConfig(name="bleu")],
+        output_dir=out,
+        shard=shard,
+    )
+    return runner.run(), runner.summary
+
+
+@pytest.mark.parametrize("join", ["id", "position"])
+def test_merged_shards_match_single_run(dataset, predictions, tmp_path, join):
+    expected, summary = _run(dataset, predictions, tmp_path / "full", join=join)
+
+    shard_dirs = []
+    for i in reversed(range(3)):
+        shard_dirs.append(tmp_path / f"shard-{i}")
+        _run(dataset, predictions, shard_dirs[-1], Shard(i, 3), join=join)
+
+    merged = merge_shards(shard_dirs, tmp_path / "merged")
+
+    assert list(merged) == list(expected)
+    for model, metrics in expected.items():
+        assert list(merged[model]) == list(metrics)
+        for metric, stats in metrics.items():
+            assert merged[model][metric] == pytest.approx(stats, rel=1e-12, abs=1e-15)
+
+    single = ResultTable.load(tmp_path / "full" / RESULTS_FILE)
+    combined = ResultTable.load(tmp_path / "merged" / RESULTS_FILE)
+    assert combined.row.tolist() == single.row.tolist()
+    assert combined.score.tolist() == single.score.tolist()
+    assert combined.row_ids == single.row_ids
+
+    merged_summary = json.loads((tmp_path / "merged" / "run_summary.json").read_text())
+    for key in ("matched", "missing", "unexpected", "without_id"):
+        assert merged_summary["predictions"]["m"][key] == summary["predictions"]["m"][key]
+
+    # Corpus BLEU is recomputed from the summed counts, not averaged
+    assert merged_summary["metrics"]["m"]["bleu"]["corpus_bleu"] == pytest.approx(
+        summary["metrics"]["m"]["bleu"]["corpus_bleu"], rel=1e-12
+    )
+    assert len(merged_summary["shard_metrics"]) == 3
+
+
+def test_merge_rejects_incomplete_or_repeated_shards(dataset, predictions, tmp_path):
+    for i in range(2):
+        _run(dataset, predictions, tmp_path / f"s{i}", Shard(i, 2))
+
+    with pytest.raises(MergeError, match="Missing shards"):
+        merge_shards([tmp_path / "s0"], tmp_path / "out")
+    with pytest.raises(MergeError, match="given twice"):
+        merge_shards([tmp_path / "s0", tmp_path / "s1", tmp_path / "s0"], tmp_path / "out")
+    with pytest.raises(MergeError, match="not a run output"):
+        merge_shards([tmp_path], tmp_path / "out")